@@ -27,18 +27,24 @@ from .metadata import (
     ANNOTATION,
     CUSTOM_OBJECT,
 )
+from .snapshot import MetadataSnapshot
 from .metadata_loader import (
     get_class_metadata_tool,
+    get_class_metadata_tool_async,
     get_root_class_description_tool,
+    get_root_class_description_tool_async,
 )
 
 __all__ = [
     "MetadataCache",
+    "MetadataSnapshot",
     "ROOT_CLASS_TYPES",
     "DOCUMENT",
     "FOLDER",
     "ANNOTATION",
     "CUSTOM_OBJECT",
     "get_class_metadata_tool",
+    "get_class_metadata_tool_async",
     "get_root_class_description_tool",
+    "get_root_class_description_tool_async",
 ]
@@ -0,0 +1,334 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Inverted index over the classes of a root class, used by determine_class.
+
+The index maps the trigrams of the lowercased symbolic name, display name and
+descriptive text of each class to the classes containing them, and the tokens of
+those fields to their classes. For a list of keywords it returns the candidate
+classes: every class the keyword scoring can give a positive score, so only those
+need to be scored. A class can only score if
+
+- a keyword is contained in one of its fields, so the class contains all the
+  trigrams of the keyword;
+- a keyword or keyword token is similar enough to one of its tokens: it then shares
+  a long enough prefix with the token or is contained in it, so the class contains
+  the trigrams of that prefix;
+- or one of its tokens is similar enough to a keyword or keyword token by being
+  contained in it: the token is then one of its substrings, found in the token map.
+
+Keyword tokens shorter than a trigram can only be similar to short tokens, which are
+indexed by their substrings too. Keywords shorter than a trigram can be contained
+anywhere in a field and cannot be looked up; the index then returns no candidates
+and the caller scores every class.
+
+When scoring tolerates typos, the classes having a token a keyword or keyword token
+may be a misspelling of are candidates too. Those tokens are found with a fuzzy
+index over the tokens, built the first time it is needed.
+
+The property index maps the trigrams of the lowercased property names of the classes
+whose property descriptions are loaded to those names, and each name to the classes
+with properties of that name. It scores the property matches of every class at once:
+a keyword contained in the symbolic name or display name of a property of a class
+adds to the score of the class. Only the names containing the keyword are looked at,
+instead of every property of every class. System properties are left out: every class
+has them, so they say nothing about which class is meant.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from cs_mcp_server.cache.compact import PropertyRecord
+from cs_mcp_server.utils.common import CacheClassDescriptionData
+from cs_mcp_server.utils.constants import (
+    DESCRIPTION_HIGH_SIMILARITY_THRESHOLD,
+    HIGH_SIMILARITY_THRESHOLD,
+    MEDIUM_SIMILARITY_THRESHOLD,
+    PREFIX_SIMILARITY_MULTIPLIER,
+    PROPERTY_DISPLAY_NAME_SCORE,
+    PROPERTY_SYMBOLIC_NAME_SCORE,
+    SUBSTRING_SIMILARITY_MULTIPLIER,
+)
+from cs_mcp_server.utils.fuzzy import FuzzyTokenIndex
+from cs_mcp_server.utils.scoring import tokenize
+
+# Length of the substrings indexed for each class
+TRIGRAM_LENGTH = 3
+
+# Lowest word similarity that adds to a score
+_MIN_SIMILARITY = min(
+    MEDIUM_SIMILARITY_THRESHOLD,
+    HIGH_SIMILARITY_THRESHOLD,
+    DESCRIPTION_HIGH_SIMILARITY_THRESHOLD,
+)
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the distinct trigrams of a text."""
+    return {text[i : i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+
+def _min_length(length: int, multiplier: float) -> int:
+    """
+    Get the shortest match length giving a word of the given length a word similarity
+    above the lowest threshold, for similarities of multiplier * (match / length).
+    """
+    return math.floor(_MIN_SIMILARITY / multiplier * length) + 1
+
+
+# Longest token a word shorter than a trigram can be similar to
+_MAX_SHORT_MATCH_LENGTH = (
+    math.ceil(
+        max(SUBSTRING_SIMILARITY_MULTIPLIER, PREFIX_SIMILARITY_MULTIPLIER)
+        / _MIN_SIMILARITY
+        * (TRIGRAM_LENGTH - 1)
+    )
+    - 1
+)
+
+
+class ClassIndex:
+    """
+    Trigram and token index over the classes of a root class.
+
+    The index holds class names only and is immutable once built: a new catalog of
+    the root class gets a new index.
+    """
+
+    def __init__(self, classes: Dict[str, CacheClassDescriptionData]):
+        """
+        Build the index.
+
+        Args:
+            classes: The catalog of the root class, by symbolic name
+        """
+        # Position of each class in the catalog, to return candidates in catalog order
+        self._order: Dict[str, int] = {}
+        self._trigram_classes: Dict[str, Set[str]] = {}
+        self._token_classes: Dict[str, Set[str]] = {}
+        # Substrings shorter than a trigram of the tokens short words can match
+        self._short_substring_classes: Dict[str, Set[str]] = {}
+        self._fuzzy: Optional[FuzzyTokenIndex] = None
+        self._fuzzy_lock = threading.Lock()
+
+        for position, (class_name, class_data) in enumerate(classes.items()):
+            self._order[class_name] = position
+            class_tokens = class_data.tokens
+            for text in (
+                class_tokens.symbolic_name,
+                class_tokens.display_name,
+                class_tokens.descriptive_text,
+            ):
+                for trigram in _trigrams(text):
+                    self._trigram_classes.setdefault(trigram, set()).add(class_name)
+            for token in class_tokens.token_set:
+                self._token_classes.setdefault(token, set()).add(class_name)
+                if len(token) <= _MAX_SHORT_MATCH_LENGTH:
+                    self._index_short_token(token, class_name)
+
+    def _index_short_token(self, token: str, class_name: str) -> None:
+        """Index the substrings shorter than a trigram of a short token."""
+        for length in range(1, TRIGRAM_LENGTH):
+            for start in range(len(token) - length + 1):
+                self._short_substring_classes.setdefault(
+                    token[start : start + length], set()
+                ).add(class_name)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def fuzzy(self) -> FuzzyTokenIndex:
+        """The fuzzy index over the tokens of the classes, to score with typos."""
+        if self._fuzzy is None:
+            with self._fuzzy_lock:
+                if self._fuzzy is None:
+                    self._fuzzy = FuzzyTokenIndex(self._token_classes)
+        return self._fuzzy
+
+    def candidates(
+        self, keywords: Iterable[str], fuzzy: bool = False
+    ) -> Optional[List[str]]:
+        """
+        Find the classes that can match the keywords.
+
+        Args:
+            keywords: The keywords to match
+            fuzzy: Whether the classes are scored with the fuzzy index, so classes
+                with a token within a few typos of a keyword are candidates too
+
+        Returns:
+            The names of the candidate classes in catalog order, or None if a keyword
+            is too short to be looked up and every class has to be scored
+        """
+        # Lookups repeated for several keywords are done once
+        memo: Dict[str, Set[str]] = {}
+        found: Set[str] = set()
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if len(keyword) < TRIGRAM_LENGTH:
+                return None
+            found |= self._containing(keyword, memo)
+
+            for word in {keyword, *tokenize(keyword)}:
+                # Tokens sharing a long enough prefix with the word or containing it
+                prefix = word[: _min_length(len(word), PREFIX_SIMILARITY_MULTIPLIER)]
+                if len(word) < TRIGRAM_LENGTH:
+                    found |= self._short_substring_classes.get(prefix, set())
+                elif len(prefix) < TRIGRAM_LENGTH:
+                    return None
+                else:
+                    found |= self._containing(prefix, memo)
+
+                # Tokens contained in the word
+                min_token_length = _min_length(
+                    len(word), SUBSTRING_SIMILARITY_MULTIPLIER
+                )
+                for length in range(min_token_length, len(word) + 1):
+                    for start in range(len(word) - length + 1):
+                        found |= self._token_classes.get(
+                            word[start : start + length], set()
+                        )
+
+                # Tokens the word may be a misspelling of
+                if fuzzy:
+                    for token in self.fuzzy.similar_tokens(word):
+                        found |= self._token_classes[token]
+
+        return self.in_catalog_order(found)
+
+    def in_catalog_order(self, class_names: Iterable[str]) -> List[str]:
+        """
+        Sort class names in catalog order.
+
+        Args:
+            class_names: Names of classes, usually of the catalog
+
+        Returns:
+            The names in the order of the catalog, followed by names added to the
+            catalog after the index was built, by name
+        """
+        last = len(self._order)
+        return sorted(class_names, key=lambda name: (self._order.get(name, last), name))
+
+    def _containing(self, text: str, memo: Dict[str, Set[str]]) -> Set[str]:
+        """Get the classes having all trigrams of a text, at least TRIGRAM_LENGTH long."""
+        if text not in memo:
+            class_sets = sorted(
+                (
+                    self._trigram_classes.get(trigram, set())
+                    for trigram in _trigrams(text)
+                ),
+                key=len,
+            )
+            classes = set(class_sets[0])
+            for class_set in class_sets[1:]:
+                if not classes:
+                    break
+                classes &= class_set
+            memo[text] = classes
+        return memo[text]
+
+
+class PropertyIndex:
+    """
+    Trigram index over the property names of the classes of a root class.
+
+    The index is immutable once built: a change to the property descriptions kept for
+    the root class gets a new index.
+    """
+
+    def __init__(self, class_properties: Dict[str, Sequence[PropertyRecord]]):
+        """
+        Build the index.
+
+        Args:
+            class_properties: The property descriptions of the classes whose property
+                descriptions are loaded, by class name
+        """
+        # Classes having properties with each lowercased symbolic or display name,
+        # with the number of such properties in the class
+        self._symbolic_names: Dict[str, Dict[str, int]] = {}
+        self._display_names: Dict[str, Dict[str, int]] = {}
+        self._trigram_names: Dict[str, Set[str]] = {}
+        # All names, scanned for keywords shorter than a trigram
+        self._names: Set[str] = set()
+
+        for class_name, records in class_properties.items():
+            for record in records:
+                if record.is_system_owned:
+                    continue
+                self._add(self._symbolic_names, record.symbolic_name, class_name)
+                self._add(self._display_names, record.display_name, class_name)
+
+    def _add(self, names: Dict[str, Dict[str, int]], name: str, class_name: str):
+        """Count a property name of a class, indexing the name when first seen."""
+        name = name.lower()
+        classes = names.get(name)
+        if classes is None:
+            classes = names[name] = {}
+            if name not in self._names:
+                self._names.add(name)
+                for trigram in _trigrams(name):
+                    self._trigram_names.setdefault(trigram, set()).add(name)
+        classes[class_name] = classes.get(class_name, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def scores(self, keywords: Iterable[str]) -> Dict[str, float]:
+        """
+        Score the property matches of the classes.
+
+        For each keyword, every property of a class whose symbolic name contains the
+        keyword adds PROPERTY_SYMBOLIC_NAME_SCORE to the class, and every property
+        whose display name contains it adds PROPERTY_DISPLAY_NAME_SCORE.
+
+        Args:
+            keywords: The keywords to match
+
+        Returns:
+            The score of each class with a matching property, by class name
+        """
+        scores: Dict[str, float] = {}
+        for keyword in keywords:
+            keyword = keyword.lower()
+            names = self._containing(keyword)
+            for class_names, score in (
+                (self._symbolic_names, PROPERTY_SYMBOLIC_NAME_SCORE),
+                (self._display_names, PROPERTY_DISPLAY_NAME_SCORE),
+            ):
+                for name in names:
+                    for class_name, count in class_names.get(name, {}).items():
+                        scores[class_name] = scores.get(class_name, 0.0) + score * count
+        return scores
+
+    def _containing(self, keyword: str) -> Set[str]:
+        """Get the property names containing a keyword."""
+        if len(keyword) < TRIGRAM_LENGTH:
+            return {name for name in self._names if keyword in name}
+
+        name_sets = sorted(
+            (self._trigram_names.get(trigram, set()) for trigram in _trigrams(keyword)),
+            key=len,
+        )
+        names = set(name_sets[0])
+        for name_set in name_sets[1:]:
+            if not names:
+                break
+            names &= name_set
+        # The trigrams may be found in a name without the whole keyword
+        return {name for name in names if keyword in name}
@@ -0,0 +1,218 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compact in-memory form of cached property descriptions.
+
+A subclass lists every property it inherits, so the property descriptions of a
+catalog repeat the same few hundred properties thousands of times. MetadataCache
+keeps them as PropertyRecord objects instead of pydantic models: small __slots__
+objects with interned strings and the data type and cardinality as enum members.
+A PropertyPool hands out one record per distinct property description, so a
+property inherited by many classes is a single object shared by all of their
+property lists.
+
+Records are read-only. They are turned back into CachePropertyDescription models
+only when class metadata is handed to a tool.
+
+The size of a record is an estimate of the memory it holds; strings interned and
+shared with other records are counted for each record, so the estimate is on the
+high side.
+"""
+
+import sys
+import threading
+import weakref
+from typing import Iterable, List, Optional, Tuple
+
+from cs_mcp_server.utils import CachePropertyDescription
+from cs_mcp_server.utils.common import SearchOperator
+from cs_mcp_server.utils.model.propertyBase import Cardinality, TypeID
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a string, passing None through."""
+    return sys.intern(value) if value is not None else None
+
+
+class PropertyRecord:
+    """The fields of a CachePropertyDescription, without the pydantic model."""
+
+    __slots__ = (
+        "symbolic_name",
+        "display_name",
+        "descriptive_text",
+        "data_type",
+        "cardinality",
+        "is_searchable",
+        "is_system_owned",
+        "is_hidden",
+        "valid_search_operators",
+        "__weakref__",
+    )
+
+    symbolic_name: str
+    display_name: str
+    descriptive_text: str
+    data_type: TypeID
+    cardinality: Cardinality
+    is_searchable: bool
+    is_system_owned: bool
+    is_hidden: bool
+    valid_search_operators: Tuple[SearchOperator, ...]
+
+    def __init__(self, key: tuple):
+        """
+        Create a record.
+
+        Args:
+            key: The field values, as returned by PropertyRecord.key
+        """
+        (
+            self.symbolic_name,
+            self.display_name,
+            self.descriptive_text,
+            self.data_type,
+            self.cardinality,
+            self.is_searchable,
+            self.is_system_owned,
+            self.is_hidden,
+            self.valid_search_operators,
+        ) = key
+
+    @staticmethod
+    def key(property_description: CachePropertyDescription) -> tuple:
+        """
+        Get the field values of a property description, with interned strings.
+
+        Args:
+            property_description: The property description
+
+        Returns:
+            A hashable tuple identifying the property description
+        """
+        return (
+            _intern(property_description.symbolic_name),
+            _intern(property_description.display_name),
+            _intern(property_description.descriptive_text),
+            TypeID(property_description.data_type),
+            Cardinality(property_description.cardinality),
+            property_description.is_searchable,
+            property_description.is_system_owned,
+            property_description.is_hidden,
+            tuple(property_description.valid_search_operators),
+        )
+
+    def to_model(self) -> CachePropertyDescription:
+        """
+        Materialize the record as a pydantic model.
+
+        The fields were validated when the record was made, so the model is built
+        without validating them again.
+
+        Returns:
+            A new CachePropertyDescription
+        """
+        return CachePropertyDescription.model_construct(
+            symbolic_name=self.symbolic_name,
+            display_name=self.display_name,
+            descriptive_text=self.descriptive_text,
+            data_type=self.data_type,
+            cardinality=self.cardinality,
+            is_searchable=self.is_searchable,
+            is_system_owned=self.is_system_owned,
+            is_hidden=self.is_hidden,
+            valid_search_operators=list(self.valid_search_operators),
+        )
+
+    def __repr__(self) -> str:
+        return f"PropertyRecord({self.symbolic_name!r})"
+
+    @property
+    def size(self) -> int:
+        """Estimated size in bytes of the record and its strings."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.symbolic_name)
+            + sys.getsizeof(self.display_name)
+            + sys.getsizeof(self.descriptive_text)
+            + sys.getsizeof(self.valid_search_operators)
+        )
+
+
+class PropertyPool:
+    """
+    Hands out one shared PropertyRecord per distinct property description.
+
+    The pool holds its records weakly: a record is dropped once no cached class
+    lists it anymore. It is safe to use from several threads.
+    """
+
+    def __init__(self):
+        """Create an empty pool."""
+        self._records: "weakref.WeakValueDictionary[tuple, PropertyRecord]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, property_description: CachePropertyDescription) -> PropertyRecord:
+        """
+        Get the shared record of a property description.
+
+        Args:
+            property_description: The property description
+
+        Returns:
+            The record with the same field values, created if there is none yet
+        """
+        key = PropertyRecord.key(property_description)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = PropertyRecord(key)
+                self._records[key] = record
+            return record
+
+    def compact(
+        self, property_descriptions: Iterable[CachePropertyDescription]
+    ) -> Tuple[PropertyRecord, ...]:
+        """
+        Get the shared records of the property descriptions of a class.
+
+        Args:
+            property_descriptions: The property descriptions
+
+        Returns:
+            The records, in the same order
+        """
+        return tuple(
+            self.record(property_description)
+            for property_description in property_descriptions
+        )
+
+
+def materialize(records: Iterable[PropertyRecord]) -> List[CachePropertyDescription]:
+    """
+    Materialize property records as pydantic models.
+
+    Args:
+        records: The records
+
+    Returns:
+        A new list of CachePropertyDescription models, in the same order
+    """
+    return [record.to_model() for record in records]
@@ -12,11 +12,49 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, List, Optional
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import asyncio
 import json
+import logging
+import threading
+import time
 
 # Use absolute imports instead of relative imports
-from cs_mcp_server.utils import CacheClassDescriptionData
+from cs_mcp_server.cache.class_index import ClassIndex, PropertyIndex
+from cs_mcp_server.cache.compact import PropertyPool, PropertyRecord, materialize
+from cs_mcp_server.cache.snapshot import MetadataSnapshot, RestoredCatalog
+from cs_mcp_server.utils import (
+    CacheClassDescriptionData,
+    CachePropertyDescription,
+    ClassDescriptionData,
+    ToolError,
+)
+from cs_mcp_server.utils.metrics import LatencyHistogram
+
+# Logger for this module
+logger = logging.getLogger("MetadataCache")
+
+# Number of threads refreshing stale metadata in the background
+REFRESH_WORKERS = 2
+
+# Number of recorded class uses after which the counts are written to the snapshot
+USAGE_FLUSH_THRESHOLD = 20
+
+T = TypeVar("T")
 
 # Define common class names as constants for convenience
 DOCUMENT = "Document"
@@ -40,11 +78,111 @@ class MetadataCache:
     """
     Class to manage the metadata cache for repository classes and their properties.
     Provides methods to access and manipulate the cache.
+
+    If a snapshot is given, the catalog of each root class is restored from it the
+    first time the root class is accessed, and loaded classes are written back to it.
+
+    If a TTL is given, root class catalogs and property descriptions older than the
+    TTL are stale. Stale entries are still served, and the loaders refresh them in the
+    background (stale-while-revalidate). Refreshed entries replace the cached objects
+    instead of modifying them, so callers holding an entry never see it change.
+
+    The catalog entries of the classes are kept without their property descriptions,
+    which are stored separately as shared PropertyRecord objects (see compact.py).
+    get_class_metadata materializes a class with its property descriptions.
+
+    If a budget is given, the property descriptions of the least recently used
+    classes are evicted once more classes than max_classes have them, or once the
+    distinct records they hold exceed max_bytes. The class catalogs always stay in
+    memory; the loaders load evicted property descriptions again when they are next
+    requested.
     """
 
-    def __init__(self):
-        """Initialize the metadata cache with known root classes."""
+    def __init__(
+        self,
+        snapshot: Optional[MetadataSnapshot] = None,
+        ttl: Optional[float] = None,
+        max_classes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the metadata cache with known root classes.
+
+        Args:
+            snapshot: Optional on-disk snapshot used for warm starts
+            ttl: Time in seconds after which cached metadata is refreshed in the
+                background. None keeps cached metadata forever.
+            max_classes: Maximum number of classes whose property descriptions are
+                kept. None keeps all of them.
+            max_bytes: Maximum estimated size in bytes of the property descriptions
+                kept. None keeps all of them.
+        """
         self._cache = {}
+        # Property descriptions of the classes whose properties are loaded, by
+        # (root class, class name), as records shared through the pool. Least
+        # recently used first
+        self._properties: "OrderedDict[Tuple[str, str], Tuple[PropertyRecord, ...]]" = (
+            OrderedDict()
+        )
+        self._property_pool = PropertyPool()
+        # Budget of the property descriptions, the number of property lists holding
+        # each distinct record and the estimated size of those records
+        self._max_classes = max_classes
+        self._max_bytes = max_bytes
+        self._record_refs: Dict[PropertyRecord, int] = {}
+        self._property_bytes = 0
+        # Classes whose property descriptions were evicted, to count reloads
+        self._evicted: Set[Tuple[str, str]] = set()
+        self.eviction_count = 0
+        self.reload_count = 0
+        self._snapshot = snapshot
+        self._ttl = ttl
+        # Root classes already looked up in the snapshot, and the lock making each
+        # lookup happen once without holding the cache lock during it
+        self._restored_roots: Set[str] = set()
+        self._restore_lock = threading.Lock()
+        # Time each root class catalog and each class's properties were loaded
+        self._root_loaded_at: Dict[str, float] = {}
+        self._class_loaded_at: Dict[Tuple[str, str], float] = {}
+        # Incremented whenever the classes of a root class change, with the keyword
+        # index of each root class and the version it was built from
+        self._root_versions: Dict[str, int] = {}
+        self._class_indexes: Dict[str, Tuple[int, ClassIndex]] = {}
+        # Incremented whenever the property descriptions kept for the classes of a
+        # root class change, with the property index of each root class and the
+        # version it was built from
+        self._property_versions: Dict[str, int] = {}
+        self._property_indexes: Dict[str, Tuple[int, PropertyIndex]] = {}
+        # Classes of each root class sorted by symbolic name, as listed by the
+        # list_all_classes tool, with the version they were built from
+        self._class_lists: Dict[str, Tuple[int, Tuple[ClassDescriptionData, ...]]] = {}
+        # Superclass of every class seen in a response, None for a class without one
+        self._superclasses: Dict[str, Optional[str]] = {}
+        # Background refreshes, keyed by what they refresh
+        self._refreshing: Set[Tuple[str, ...]] = set()
+        self._refresh_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Running refresh tasks, referenced so they aren't garbage collected
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.refresh_count = 0
+        self.refresh_failure_count = 0
+        # Class uses not yet written to the snapshot, and all uses in this process
+        self._pending_usage: Counter = Counter()
+        self._usage: Counter = Counter()
+        self._usage_lock = threading.Lock()
+        # Guards changes to the cached catalogs, which may come from several threads
+        self._lock = threading.RLock()
+        # Loads in progress, keyed by what they load, e.g. ("class", class_name):
+        # tasks shared by async callers, locks serializing synchronous callers
+        self._loads: Dict[Tuple[str, ...], asyncio.Task] = {}
+        self._load_locks: Dict[Tuple[str, ...], threading.RLock] = {}
+        self._loads_lock = threading.Lock()
+        self.coalesced_load_count = 0
+        # Lookups answered from the cache and lookups needing a load, and the
+        # duration of the loads, by what is looked up, e.g. "class"
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._load_latencies: Dict[str, LatencyHistogram] = {}
 
         # Initialize root classes
         for root_class in ROOT_CLASS_TYPES:
@@ -52,8 +190,25 @@ class MetadataCache:
                 self._cache[root_class] = {}
 
     def reset(self):
-        """Reset the cache to its initial state."""
-        self.__init__()
+        """Reset the cache to its initial state, discarding the snapshot too."""
+        if self._snapshot is not None:
+            self._snapshot.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        self.flush_usage()
+        self.__init__(self._snapshot, self._ttl, self._max_classes, self._max_bytes)
+
+    @property
+    def snapshot(self) -> Optional[MetadataSnapshot]:
+        """The on-disk snapshot, if any."""
+        return self._snapshot
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Time in seconds after which cached metadata is stale, None if it never is."""
+        return self._ttl
 
     def ensure_root_class_exists(self, class_name: str) -> None:
         """
@@ -63,7 +218,662 @@ class MetadataCache:
             class_name: The name of the root class to ensure exists
         """
         if class_name not in self._cache:
-            self._cache[class_name] = {}
+            with self._lock:
+                self._cache.setdefault(class_name, {})
+        self._restore_root(class_name)
+
+    def needs_restore(self, root_classes: Optional[Iterable[str]] = None) -> bool:
+        """
+        Check whether a catalog still has to be looked up in the snapshot.
+
+        Args:
+            root_classes: The root class names, all cached ones by default
+
+        Returns:
+            True if restore_snapshot would read the snapshot
+        """
+        if self._snapshot is None:
+            return False
+        roots = list(self._cache) if root_classes is None else root_classes
+        return any(root_class not in self._restored_roots for root_class in roots)
+
+    def restore_snapshot(self, root_classes: Optional[Iterable[str]] = None) -> None:
+        """
+        Restore the catalogs of root classes from the snapshot, if not done yet.
+
+        Catalogs are otherwise restored on first access. Reading the snapshot and
+        validating the classes is blocking work, so the async loaders call this from
+        a worker thread before looking up classes.
+
+        Args:
+            root_classes: The root class names, all cached ones by default
+        """
+        if root_classes is None:
+            for root_class in list(self._cache):
+                self._restore_root(root_class)
+        else:
+            for root_class in root_classes:
+                self.ensure_root_class_exists(root_class)
+
+    def _restore_root(self, root_class: str) -> None:
+        """Restore the catalog of a root class from the snapshot, once."""
+        if self._snapshot is None or root_class in self._restored_roots:
+            return
+        with self._restore_lock:
+            if root_class in self._restored_roots:
+                return
+            # Read outside the cache lock, so other threads keep using the cache
+            catalog = self._snapshot.load_root(root_class)
+            with self._lock:
+                self._restored_roots.add(root_class)
+                if catalog and catalog.classes:
+                    self._merge_catalog(root_class, catalog)
+
+    def _merge_catalog(self, root_class: str, catalog: RestoredCatalog) -> None:
+        """Add a restored catalog to the cache. Caller holds the lock."""
+        classes = catalog.classes
+        for class_name, class_data in classes.items():
+            key = (root_class, class_name)
+            # Properties loaded from the repository in the meantime take precedence
+            if class_data.property_descriptions and key not in self._properties:
+                self._store_properties(
+                    key,
+                    self._property_pool.compact(class_data.property_descriptions),
+                )
+                # Restored properties haven't been used yet, so are evicted first
+                self._properties.move_to_end(key, last=False)
+            class_data.property_descriptions = []
+        # Classes loaded from the repository in the meantime take precedence
+        classes.update(self._cache[root_class])
+        self._cache[root_class] = classes
+        self._catalog_changed(root_class)
+        self._root_loaded_at.setdefault(root_class, catalog.saved_at)
+        for class_name, saved_at in catalog.class_saved_at.items():
+            if (root_class, class_name) in self._properties:
+                self._class_loaded_at.setdefault((root_class, class_name), saved_at)
+        self._evict_properties()
+
+    def _catalog_changed(self, root_class: str) -> None:
+        """Record a change to the classes of a root class. Caller holds the lock."""
+        self._root_versions[root_class] = self._root_versions.get(root_class, 0) + 1
+
+    def root_class_version(self, root_class: str) -> int:
+        """
+        Get the version of the classes of a root class.
+
+        Args:
+            root_class: The root class name
+
+        Returns:
+            A number that changes whenever classes are added, removed or replaced
+        """
+        return self._root_versions.get(root_class, 0)
+
+    def get_class_index(self, root_class: str) -> ClassIndex:
+        """
+        Get the keyword index over the classes of a root class, building it if the
+        classes changed since it was last built.
+
+        Args:
+            root_class: The root class name
+
+        Returns:
+            The index of the current classes of the root class
+        """
+        self.ensure_root_class_exists(root_class)
+        with self._lock:
+            version = self.root_class_version(root_class)
+            built = self._class_indexes.get(root_class)
+            if built is not None and built[0] == version:
+                return built[1]
+            # Copied since classes may be added while the index is built
+            classes = dict(self._cache[root_class])
+
+        index = ClassIndex(classes)
+        with self._lock:
+            if self.root_class_version(root_class) == version:
+                self._class_indexes[root_class] = (version, index)
+        return index
+
+    def get_property_index(self, root_class: str) -> PropertyIndex:
+        """
+        Get the index of the property names of the classes of a root class whose
+        property descriptions are loaded, building it if they changed since it was
+        last built.
+
+        Args:
+            root_class: The root class name
+
+        Returns:
+            The index of the property descriptions currently kept for the root class
+        """
+        self.ensure_root_class_exists(root_class)
+        with self._lock:
+            version = self._property_versions.get(root_class, 0)
+            built = self._property_indexes.get(root_class)
+            if built is not None and built[0] == version:
+                return built[1]
+            class_properties = {
+                class_name: records
+                for (root, class_name), records in self._properties.items()
+                if root == root_class
+            }
+
+        index = PropertyIndex(class_properties)
+        with self._lock:
+            if self._property_versions.get(root_class, 0) == version:
+                self._property_indexes[root_class] = (version, index)
+        return index
+
+    def get_class_list(self, root_class: str) -> List[ClassDescriptionData]:
+        """
+        Get the classes of a root class sorted by symbolic name, building the list if
+        the classes changed since it was last built.
+
+        Args:
+            root_class: The root class name
+
+        Returns:
+            A new list of the names and descriptions of the classes
+        """
+        self.ensure_root_class_exists(root_class)
+        with self._lock:
+            version = self.root_class_version(root_class)
+            built = self._class_lists.get(root_class)
+            if built is not None and built[0] == version:
+                return list(built[1])
+            classes = list(self._cache[root_class].values())
+
+        # The fields were validated when the classes were stored
+        class_list = tuple(
+            ClassDescriptionData.model_construct(
+                symbolic_name=class_data.symbolic_name,
+                display_name=class_data.display_name,
+                descriptive_text=class_data.descriptive_text,
+            )
+            for class_data in sorted(classes, key=lambda c: c.symbolic_name)
+        )
+        with self._lock:
+            if self.root_class_version(root_class) == version:
+                self._class_lists[root_class] = (version, class_list)
+        return list(class_list)
+
+    def persist_root_class(self, root_class: str) -> None:
+        """
+        Write the catalog of a root class to the snapshot.
+
+        Args:
+            root_class: The root class name
+        """
+        if self._snapshot is None or root_class not in self._cache:
+            return
+        # The property descriptions are read directly rather than through
+        # get_class_properties, so writing the snapshot leaves the order of the least
+        # recently used ones as it is
+        with self._lock:
+            class_saved_at = {
+                class_name: loaded_at
+                for (root, class_name), loaded_at in self._class_loaded_at.items()
+                if root == root_class
+            }
+            entries = [
+                (class_name, class_data, self._properties.get((root_class, class_name)))
+                for class_name, class_data in self._cache[root_class].items()
+            ]
+        classes = {
+            class_name: (
+                class_data.model_copy(
+                    update={"property_descriptions": materialize(records)}
+                )
+                if records
+                else class_data
+            )
+            for class_name, class_data, records in entries
+        }
+        self._snapshot.save_root(root_class, classes, class_saved_at)
+
+    def persist_class(self, root_class: str, class_name: str) -> None:
+        """
+        Write a class, typically with newly loaded property descriptions, to the snapshot.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name to write
+        """
+        if self._snapshot is None:
+            return
+        class_data = self.get_class_metadata(root_class, class_name)
+        if class_data is not None:
+            self._snapshot.save_classes(root_class, [class_data])
+
+    def persist_classes(
+        self, classes: Iterable[Tuple[str, CacheClassDescriptionData]]
+    ) -> None:
+        """
+        Write classes with their property descriptions to the snapshot in one transaction.
+
+        Args:
+            classes: (root class name, class data) tuples to write
+        """
+        if self._snapshot is None:
+            return
+        self._snapshot.save_classes_of_roots(classes)
+
+    def _is_expired(self, loaded_at: Optional[float]) -> bool:
+        """Check whether metadata loaded at the given time is older than the TTL."""
+        if self._ttl is None or loaded_at is None:
+            return False
+        return time.time() - loaded_at > self._ttl
+
+    def is_root_class_stale(self, root_class: str) -> bool:
+        """
+        Check whether the catalog of a root class is older than the TTL.
+
+        Args:
+            root_class: The root class name
+
+        Returns:
+            True if the catalog should be refreshed, False otherwise
+        """
+        return self._is_expired(self._root_loaded_at.get(root_class))
+
+    def is_class_stale(self, root_class: str, class_name: str) -> bool:
+        """
+        Check whether the property descriptions of a class are older than the TTL.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name
+
+        Returns:
+            True if the property descriptions should be refreshed, False otherwise
+        """
+        return self._is_expired(self._class_loaded_at.get((root_class, class_name)))
+
+    def replace_root_class(
+        self,
+        root_class: str,
+        classes: Dict[str, CacheClassDescriptionData],
+        persist: bool = True,
+    ) -> None:
+        """
+        Replace the catalog of a root class with a freshly loaded one.
+
+        Classes that are still in the catalog keep the property descriptions already
+        loaded for them; classes that are no longer in it are dropped with their
+        property descriptions. The catalog is swapped in one step, so concurrent readers
+        see either the old or the new one, and property descriptions stored by a
+        concurrent class refresh are not lost.
+
+        Args:
+            root_class: The root class name
+            classes: The loaded class data by symbolic name, without properties
+            persist: Whether to write the catalog to the snapshot; if not, the caller
+                does it with persist_root_class, off the event loop if it runs on one
+        """
+        self.ensure_root_class_exists(root_class)
+        with self._lock:
+            previous = self._cache[root_class]
+            for class_name, class_data in classes.items():
+                old = previous.get(class_name)
+                if old is not None and (root_class, class_name) in self._properties:
+                    class_data.name_property_symbolic_name = (
+                        old.name_property_symbolic_name
+                    )
+            for class_name in previous.keys() - classes.keys():
+                self._class_loaded_at.pop((root_class, class_name), None)
+                self._drop_properties((root_class, class_name))
+                self._evicted.discard((root_class, class_name))
+
+            self._cache[root_class] = classes
+            self._catalog_changed(root_class)
+            self._root_loaded_at[root_class] = time.time()
+        if persist:
+            self.persist_root_class(root_class)
+
+    def update_class_properties(
+        self,
+        root_class: str,
+        class_name: str,
+        property_descriptions: List[CachePropertyDescription],
+        name_property_symbolic_name: Optional[str],
+    ) -> Optional[CacheClassDescriptionData]:
+        """
+        Store freshly loaded property descriptions of a class.
+
+        The property descriptions are stored as shared records. The cached class data
+        is replaced by an updated copy rather than modified.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name
+            property_descriptions: The loaded property descriptions
+            name_property_symbolic_name: The symbolic name of the name property
+
+        Returns:
+            The updated class data with its property descriptions, or None if the
+            class is not cached
+        """
+        (class_data,) = self.update_classes_properties(
+            [
+                (
+                    root_class,
+                    class_name,
+                    property_descriptions,
+                    name_property_symbolic_name,
+                )
+            ]
+        )
+        if class_data is not None:
+            self.persist_classes([(root_class, class_data)])
+        return class_data
+
+    def update_classes_properties(
+        self,
+        updates: Iterable[
+            Tuple[str, str, List[CachePropertyDescription], Optional[str]]
+        ],
+    ) -> List[Optional[CacheClassDescriptionData]]:
+        """
+        Store freshly loaded property descriptions of several classes at once.
+
+        The classes are updated under a single lock acquisition, like
+        update_class_properties does for one class. They are not written to the
+        snapshot: the caller passes the results to persist_classes, off the event
+        loop if it runs on one.
+
+        Args:
+            updates: (root class, class name, property descriptions, symbolic name
+                of the name property) tuples
+
+        Returns:
+            The updated class data with its property descriptions for each update,
+            or None if the class is not cached
+        """
+        compacted = [
+            (root_class, class_name, self._property_pool.compact(descriptions), name)
+            for root_class, class_name, descriptions, name in updates
+        ]
+        updated: List[
+            Tuple[Optional[CacheClassDescriptionData], Tuple[PropertyRecord, ...]]
+        ] = []
+        # Restore the catalogs first: the snapshot is read without the cache lock
+        for root_class in {root_class for root_class, _, _, _ in compacted}:
+            if root_class in self._cache:
+                self._restore_root(root_class)
+        with self._lock:
+            now = time.time()
+            for root_class, class_name, records, name_property in compacted:
+                class_data = self._cache.get(root_class, {}).get(class_name)
+                if class_data is None:
+                    updated.append((None, records))
+                    continue
+                if class_data.name_property_symbolic_name != name_property:
+                    class_data = class_data.model_copy(
+                        update={"name_property_symbolic_name": name_property}
+                    )
+                    self._cache[root_class][class_name] = class_data
+                self._store_properties((root_class, class_name), records)
+                self._class_loaded_at[(root_class, class_name)] = now
+                updated.append((class_data, records))
+            self._evict_properties()
+        return [
+            (
+                class_data.model_copy(
+                    update={"property_descriptions": materialize(records)}
+                )
+                if class_data is not None
+                else None
+            )
+            for class_data, records in updated
+        ]
+
+    def schedule_refresh(
+        self, key: Tuple[str, ...], refresh: Callable[..., Any], *args: Any
+    ) -> bool:
+        """
+        Run a refresh in the background unless the same refresh is already running.
+
+        Args:
+            key: Identifies what is refreshed, e.g. ("class", root_class, class_name)
+            refresh: The function performing the refresh
+            *args: Arguments for the refresh function
+
+        Returns:
+            True if the refresh was scheduled, False if it was already running
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=REFRESH_WORKERS,
+                    thread_name_prefix="metadata-refresh",
+                )
+            executor = self._executor
+
+        logger.debug("Refreshing stale metadata %s in the background", key)
+        future = executor.submit(refresh, *args)
+        future.add_done_callback(lambda f: self._on_refresh_done(key, f))
+        return True
+
+    def schedule_refresh_async(
+        self, key: Tuple[str, ...], refresh: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """
+        Run a refresh in a task on the running event loop unless the same refresh is
+        already running.
+
+        Args:
+            key: Identifies what is refreshed, e.g. ("class", root_class, class_name)
+            refresh: Function returning the refresh coroutine
+
+        Returns:
+            True if the refresh was scheduled, False if it was already running
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        logger.debug("Refreshing stale metadata %s in the background", key)
+        task = asyncio.ensure_future(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+        task.add_done_callback(lambda t: self._on_refresh_done(key, t))
+        return True
+
+    def _on_refresh_done(
+        self, key: Tuple[str, ...], future: Union[Future, asyncio.Future]
+    ) -> None:
+        """Record the outcome of a background refresh."""
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None and not isinstance(future.result(), ToolError):
+            self.refresh_count += 1
+            return
+        self.refresh_failure_count += 1
+        message = error if error is not None else future.result().message
+        logger.warning("Background refresh of %s failed: %s", key, message)
+
+    def record_usage(self, root_class: str, class_name: str) -> None:
+        """
+        Count a request for the metadata of a class.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name
+        """
+        with self._usage_lock:
+            self._usage[(root_class, class_name)] += 1
+            self._pending_usage[(root_class, class_name)] += 1
+            flush = sum(self._pending_usage.values()) >= USAGE_FLUSH_THRESHOLD
+        if flush:
+            self.flush_usage()
+
+    def flush_usage(self) -> None:
+        """Write the class uses counted so far to the snapshot."""
+        with self._usage_lock:
+            pending = self._pending_usage
+            self._pending_usage = Counter()
+        if self._snapshot is not None and pending:
+            self._snapshot.add_usage(pending)
+
+    def most_used_classes(self, limit: int) -> List[Tuple[str, str]]:
+        """
+        Get the classes whose metadata was requested most often.
+
+        Uses counted by earlier server processes are included if there is a snapshot.
+
+        Args:
+            limit: Maximum number of classes to return
+
+        Returns:
+            (root class, class name) tuples, most used first
+        """
+        with self._usage_lock:
+            counts = Counter(self._pending_usage)
+        if self._snapshot is not None:
+            for root_class, class_name, uses in self._snapshot.most_used(limit):
+                counts[(root_class, class_name)] += uses
+        else:
+            counts = Counter(self._usage)
+        return [key for key, _ in counts.most_common(limit)]
+
+    async def load_once(
+        self, key: Tuple[str, ...], load: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Run a load unless the same load is already in progress, sharing its result.
+
+        The first caller starts the load as a task; callers arriving while it runs
+        await the same task. A cancelled caller doesn't cancel the load for the others.
+
+        Args:
+            key: Identifies what is loaded, e.g. ("class", class_name)
+            load: Function returning the load coroutine
+
+        Returns:
+            The result of the load
+        """
+        loop = asyncio.get_running_loop()
+        with self._loads_lock:
+            task = self._loads.get(key)
+            if task is not None and task.get_loop() is loop:
+                self.coalesced_load_count += 1
+            else:
+                task = loop.create_task(load())
+                self._loads[key] = task
+                task.add_done_callback(lambda t: self._forget_load(key, t))
+        return await asyncio.shield(task)
+
+    def _forget_load(self, key: Tuple[str, ...], task: asyncio.Task) -> None:
+        """Remove a finished load, unless a newer one replaced it."""
+        with self._loads_lock:
+            if self._loads.get(key) is task:
+                del self._loads[key]
+
+    def record_lookup(self, kind: str, hit: bool) -> None:
+        """
+        Count a lookup of cached metadata.
+
+        Args:
+            kind: What is looked up, e.g. "class"
+            hit: Whether the metadata was cached
+        """
+        with self._loads_lock:
+            (self._hits if hit else self._misses)[kind] += 1
+
+    def load_latency(self, kind: str) -> LatencyHistogram:
+        """
+        Get the histogram of the durations of loads.
+
+        Args:
+            kind: What is loaded, e.g. "class"
+
+        Returns:
+            The histogram of the loads of that kind
+        """
+        with self._loads_lock:
+            histogram = self._load_latencies.get(kind)
+            if histogram is None:
+                histogram = self._load_latencies[kind] = LatencyHistogram()
+            return histogram
+
+    def load_lock(self, key: Tuple[str, ...]) -> threading.RLock:
+        """
+        Get the lock serializing synchronous loads of the same thing.
+
+        A caller holding the lock checks the cache again before loading, so threads
+        that waited for it find the metadata loaded by the first one.
+
+        Args:
+            key: Identifies what is loaded, e.g. ("class", class_name)
+
+        Returns:
+            The lock for the key
+        """
+        with self._loads_lock:
+            lock = self._load_locks.get(key)
+            if lock is None:
+                lock = self._load_locks[key] = threading.RLock()
+            return lock
+
+    def record_superclasses(self, superclasses: Dict[str, Optional[str]]) -> None:
+        """
+        Add classes to the class hierarchy.
+
+        Args:
+            superclasses: The superclass of each class, None for a class without one
+        """
+        with self._lock:
+            self._superclasses.update(superclasses)
+
+    def resolve_root_class(self, class_name: str) -> Optional[str]:
+        """
+        Find the system root class of a class from the class hierarchy.
+
+        Args:
+            class_name: The class name
+
+        Returns:
+            The system root class, or None if the known superclasses don't lead to one
+        """
+        current: Optional[str] = class_name
+        seen: Set[str] = set()
+        while current is not None and current not in seen:
+            if current in SYSTEM_ROOT_CLASS_TYPES:
+                return current
+            seen.add(current)
+            current = self._superclasses.get(current)
+        return None
+
+    def first_unknown_ancestor(self, class_name: str) -> Optional[str]:
+        """
+        Find where the known superclasses of a class end.
+
+        Args:
+            class_name: The class name
+
+        Returns:
+            The class itself or the ancestor whose superclass is unknown, or None if the
+            chain reaches a system root class or a class without superclass
+        """
+        current = class_name
+        seen: Set[str] = set()
+        while current not in SYSTEM_ROOT_CLASS_TYPES and current not in seen:
+            if current not in self._superclasses:
+                return current
+            seen.add(current)
+            parent = self._superclasses[current]
+            if parent is None:
+                return None
+            current = parent
+        return None
 
     def get_class_cache(self, root_class: str) -> Dict:
         """
@@ -82,7 +892,8 @@ class MetadataCache:
         self, root_class: str, class_name: str
     ) -> Optional[CacheClassDescriptionData]:
         """
-        Get class data from the cache.
+        Get the catalog entry of a class from the cache, without its property
+        descriptions.
 
         Args:
             root_class: The root class name
@@ -91,9 +902,75 @@ class MetadataCache:
         Returns:
             ContentClassData if found, None otherwise
         """
-        if root_class in self._cache and class_name in self._cache[root_class]:
-            return self._cache[root_class][class_name]
-        return None
+        if root_class in self._cache:
+            self._restore_root(root_class)
+        return self._cache.get(root_class, {}).get(class_name)
+
+    def has_class_properties(self, root_class: str, class_name: str) -> bool:
+        """
+        Check whether the property descriptions of a class are loaded.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name
+
+        Returns:
+            True if the class is cached with its property descriptions
+        """
+        if root_class in self._cache:
+            self._restore_root(root_class)
+        return (root_class, class_name) in self._properties
+
+    def get_class_properties(
+        self, root_class: str, class_name: str
+    ) -> Optional[Tuple[PropertyRecord, ...]]:
+        """
+        Get the property descriptions of a class as the shared records.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name
+
+        Returns:
+            The records, or None if the property descriptions are not loaded
+        """
+        if root_class in self._cache:
+            self._restore_root(root_class)
+        with self._lock:
+            records = self._properties.get((root_class, class_name))
+            if records is not None:
+                self._properties.move_to_end((root_class, class_name))
+            return records
+
+    def get_class_metadata(
+        self, root_class: str, class_name: str
+    ) -> Optional[CacheClassDescriptionData]:
+        """
+        Get a class from the cache with its property descriptions, as handed to tools.
+
+        Args:
+            root_class: The root class name
+            class_name: The class name
+
+        Returns:
+            A copy of the class data with its property descriptions materialized
+            (empty if they are not loaded), or None if the class is not cached
+        """
+        class_data = self.get_class_data(root_class, class_name)
+        if class_data is None:
+            return None
+        return self._with_properties(root_class, class_name, class_data)
+
+    def _with_properties(
+        self, root_class: str, class_name: str, class_data: CacheClassDescriptionData
+    ) -> CacheClassDescriptionData:
+        """Copy a catalog entry with its property descriptions materialized."""
+        records = self.get_class_properties(root_class, class_name)
+        if not records:
+            return class_data
+        return class_data.model_copy(
+            update={"property_descriptions": materialize(records)}
+        )
 
     def set_class_data(
         self, root_class: str, class_name: str, class_data: CacheClassDescriptionData
@@ -101,13 +978,175 @@ class MetadataCache:
         """
         Store class data in the cache.
 
+        Property descriptions in the class data are stored as shared records.
+
         Args:
             root_class: The root class name
             class_name: The class name to store
             class_data: The class data to store
         """
         self.ensure_root_class_exists(root_class)
-        self._cache[root_class][class_name] = class_data
+        records = None
+        if class_data.property_descriptions:
+            records = self._property_pool.compact(class_data.property_descriptions)
+            class_data = class_data.model_copy(update={"property_descriptions": []})
+        with self._lock:
+            self._cache[root_class][class_name] = class_data
+            if records is not None:
+                self._store_properties((root_class, class_name), records)
+                self._evict_properties()
+            else:
+                self._drop_properties((root_class, class_name))
+            self._catalog_changed(root_class)
+
+    def _store_properties(
+        self, key: Tuple[str, str], records: Tuple[PropertyRecord, ...]
+    ) -> None:
+        """Keep the property descriptions of a class as most recently used. Caller holds the lock."""
+        if self._properties.get(key) == records:
+            self._properties.move_to_end(key)
+            return
+        self._drop_properties(key)
+        if key in self._evicted:
+            self._evicted.discard(key)
+            self.reload_count += 1
+        self._properties[key] = records
+        self._properties_changed(key[0])
+        for record in records:
+            refs = self._record_refs.get(record, 0)
+            if refs == 0:
+                self._property_bytes += record.size
+            self._record_refs[record] = refs + 1
+
+    def _properties_changed(self, root_class: str) -> None:
+        """Record a change to the property descriptions of a root class. Caller holds the lock."""
+        self._property_versions[root_class] = (
+            self._property_versions.get(root_class, 0) + 1
+        )
+
+    def _drop_properties(self, key: Tuple[str, str]) -> None:
+        """Forget the property descriptions of a class. Caller holds the lock."""
+        records = self._properties.pop(key, None)
+        if records is None:
+            return
+        self._properties_changed(key[0])
+        for record in records:
+            refs = self._record_refs[record] - 1
+            if refs == 0:
+                del self._record_refs[record]
+                self._property_bytes -= record.size
+            else:
+                self._record_refs[record] = refs
+
+    def _evict_properties(self) -> None:
+        """
+        Evict least recently used property descriptions until the budget is met,
+        keeping at least the most recently used class. Caller holds the lock.
+        """
+        while len(self._properties) > 1 and (
+            (
+                self._max_classes is not None
+                and len(self._properties) > self._max_classes
+            )
+            or (self._max_bytes is not None and self._property_bytes > self._max_bytes)
+        ):
+            key = next(iter(self._properties))
+            self._drop_properties(key)
+            self._class_loaded_at.pop(key, None)
+            self._evicted.add(key)
+            self.eviction_count += 1
+            logger.debug("Evicted the property descriptions of %s", key[1])
+
+    def property_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the property descriptions kept in memory.
+
+        Returns:
+            A dictionary with the number of classes whose property descriptions are
+            kept, the distinct property records they share, their estimated size, the
+            budget, and how many were evicted and loaded again
+        """
+        with self._lock:
+            return {
+                "classes": len(self._properties),
+                "records": len(self._record_refs),
+                "bytes": self._property_bytes,
+                "max_classes": self._max_classes,
+                "max_bytes": self._max_bytes,
+                "evictions": self.eviction_count,
+                "reloads": self.reload_count,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the cache.
+
+        Returns:
+            A dictionary with the size of each root class catalog and its index, the
+            lookup hit rates, the load and refresh counters and durations, the
+            property descriptions kept in memory and the snapshot counters
+        """
+        with self._lock:
+            property_classes = Counter(root for root, _ in self._properties)
+            roots = {}
+            for root_class, classes in self._cache.items():
+                version = self.root_class_version(root_class)
+                index = self._class_indexes.get(root_class)
+                property_index = self._property_indexes.get(root_class)
+                roots[root_class] = {
+                    "classes": len(classes),
+                    "classes_with_properties": property_classes[root_class],
+                    "version": version,
+                    "indexed_classes": (
+                        len(index[1])
+                        if index is not None and index[0] == version
+                        else None
+                    ),
+                    "indexed_property_names": (
+                        len(property_index[1])
+                        if property_index is not None
+                        and property_index[0]
+                        == self._property_versions.get(root_class, 0)
+                        else None
+                    ),
+                    "loaded_at": self._root_loaded_at.get(root_class),
+                }
+        with self._loads_lock:
+            lookups = {
+                kind: {
+                    "hits": self._hits[kind],
+                    "misses": self._misses[kind],
+                    "hit_rate": self._hits[kind]
+                    / (self._hits[kind] + self._misses[kind]),
+                }
+                for kind in sorted(set(self._hits) | set(self._misses))
+            }
+            latencies = dict(self._load_latencies)
+            loads_in_progress = len(self._loads)
+        with self._refresh_lock:
+            refreshes_in_progress = len(self._refreshing)
+
+        return {
+            "ttl": self._ttl,
+            "roots": roots,
+            "lookups": lookups,
+            "loads": {
+                "in_progress": loads_in_progress,
+                "coalesced": self.coalesced_load_count,
+                "latency": {
+                    kind: histogram.stats() for kind, histogram in latencies.items()
+                },
+            },
+            "refreshes": {
+                "completed": self.refresh_count,
+                "failed": self.refresh_failure_count,
+                "in_progress": refreshes_in_progress,
+            },
+            "properties": self.property_stats(),
+            "snapshot": (
+                self._snapshot.stats() if self._snapshot is not None else None
+            ),
+        }
 
     def find_root_class_for_class(self, class_name: str) -> Optional[str]:
         """
@@ -119,6 +1158,8 @@ class MetadataCache:
         Returns:
             The root class name if found, None otherwise
         """
+        for root_class in list(self._cache):
+            self._restore_root(root_class)
         for root_class, classes in self._cache.items():
             if class_name in classes:
                 return root_class
@@ -147,8 +1188,14 @@ class MetadataCache:
         return list(self._cache.keys())
 
     def print_structure(self):
-        """Print the structure of the cache for debugging purposes."""
-        print("\n=== CACHE STRUCTURE (JSON) ===")
+        """
+        Log the structure of the cache for debugging purposes.
+
+        The structure is logged rather than printed, since standard output may be
+        the transport of the MCP server.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
 
         # Create a serializable representation of the cache
         cache_json = {}
@@ -158,9 +1205,9 @@ class MetadataCache:
                 cache_json[root_class][class_name] = {
                     "display_name": class_data.display_name,
                     "descriptive_text": class_data.descriptive_text,
-                    "properties_count": len(class_data.properties),
+                    "properties_count": len(
+                        self._properties.get((root_class, class_name), ())
+                    ),
                 }
 
-        # Print as formatted JSON
-        print(json.dumps(cache_json, indent=2))
-        print("============================\n")
+        logger.debug("Cache structure:\n%s", json.dumps(cache_json, indent=2))
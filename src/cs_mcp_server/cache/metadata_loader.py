@@ -15,8 +15,25 @@
 from logging import Logger
 
 
+import asyncio
+import functools
 import logging
-from typing import Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 # Use absolute imports instead of relative imports
 from cs_mcp_server.cache import metadata
@@ -31,6 +48,261 @@ from cs_mcp_server.utils.common import (
 logger: Logger = logging.getLogger(__name__)
 
 
+# Number of subclasses requested per page of subClassDescriptions
+CLASS_PAGE_SIZE = 500
+
+# Query for a following page of the subclasses of a root class
+SUBCLASS_PAGE_QUERY = """
+    query getSubclassPage($object_store_name: String!, $root_class_name: String!, $page_size: Int!, $page_token: String!) {
+        subClassDescriptions(
+            repositoryIdentifier: $object_store_name
+            identifier: $root_class_name
+            pageSize: $page_size
+            pageToken: $page_token
+        ) {
+            classDescriptions {
+                symbolicName
+                displayName
+                descriptiveText
+                superClassDescription {
+                    symbolicName
+                }
+            }
+            pageInfo {
+                token
+            }
+        }
+    }
+    """
+
+# Fields of a classDescription needed to fill the property descriptions of a class
+CLASS_METADATA_FIELDS = """
+        namePropertyIndex
+        propertyDescriptions {
+            symbolicName
+            displayName
+            descriptiveText
+            dataType
+            cardinality
+            isSearchable
+            isSystemOwned
+            isHidden
+        }
+"""
+
+# Query for the property descriptions of a class
+CLASS_METADATA_QUERY = f"""
+    query getClassMetadata($object_store_name: String!, $class_symbolic_name: String!) {{
+    classDescription(
+        repositoryIdentifier: $object_store_name
+        identifier: $class_symbolic_name
+    ) {{{CLASS_METADATA_FIELDS}    }}
+    }}
+    """
+
+# Default number of classes whose property descriptions are requested in one query
+DEFAULT_CLASS_BATCH_SIZE = 25
+
+
+# Coroutine function sending a GraphQL request, with the signature of GraphQLClient.execute_async
+ExecuteFunction = Callable[..., Awaitable[Dict[str, Any]]]
+
+T = TypeVar("T")
+
+
+class _BlockingExecute:
+    """
+    Awaitable adapter over the synchronous GraphQLClient.execute.
+
+    The loaders are written as coroutines. The synchronous loaders run the same
+    coroutines with this adapter as their execute function: awaiting it sends the
+    request right away and never suspends, so _run_blocking can drive the coroutine
+    to completion without an event loop.
+    """
+
+    def __init__(self, graphql_client, cache: bool = True):
+        self._graphql_client = graphql_client
+        # Whether responses may come from the response cache of the client
+        self._cache = cache
+
+    async def __call__(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        if self._cache:
+            return self._graphql_client.execute(query=query, variables=variables)
+        return self._graphql_client.execute(
+            query=query, variables=variables, cache=False
+        )
+
+
+def _run_blocking(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a loader coroutine that uses _BlockingExecute to completion.
+
+    Args:
+        coro: The loader coroutine
+
+    Returns:
+        The result of the coroutine
+
+    Raises:
+        RuntimeError: If the coroutine suspends, i.e. awaits something asynchronous
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Synchronous metadata loading cannot wait for async operations")
+
+
+def _is_blocking(execute: ExecuteFunction) -> bool:
+    """Checks whether an execute function is the synchronous adapter."""
+    return isinstance(execute, _BlockingExecute)
+
+
+def _uncached(graphql_client, execute: ExecuteFunction) -> ExecuteFunction:
+    """
+    Gets an execute function that bypasses the response cache of the client.
+
+    Refreshes of stale metadata use it: no mutation invalidates the cached responses
+    of metadata queries, so with a response cache TTL as long as the metadata TTL a
+    refresh would otherwise get back the response it is meant to replace. A custom
+    execute function is returned as it is.
+
+    Args:
+        graphql_client: The GraphQL client
+        execute: The execute function of the loader
+
+    Returns:
+        The execute function to refresh with
+    """
+    if _is_blocking(execute):
+        return _BlockingExecute(graphql_client, cache=False)
+    if execute == graphql_client.execute_async:
+        return functools.partial(graphql_client.execute_async, cache=False)
+    return execute
+
+
+async def _off_loop(execute: ExecuteFunction, function: Callable[..., T], *args) -> T:
+    """
+    Runs blocking cache work, such as snapshot I/O, in a worker thread.
+
+    Synchronous loaders have no event loop to keep free, so they run it inline.
+    """
+    if _is_blocking(execute):
+        return function(*args)
+    return await asyncio.to_thread(function, *args)
+
+
+async def _restore_snapshot(
+    metadata_cache, execute: ExecuteFunction, *root_classes: str
+) -> None:
+    """Restores cached catalogs from the snapshot, all of them if no root class is given."""
+    roots = root_classes or None
+    if metadata_cache.needs_restore(roots):
+        await _off_loop(execute, metadata_cache.restore_snapshot, roots)
+
+
+def _schedule_refresh(
+    metadata_cache,
+    key: Tuple[str, ...],
+    execute: ExecuteFunction,
+    refresh: Callable[..., Coroutine],
+    *args: Any,
+) -> None:
+    """
+    Refreshes stale metadata in the background with the same kind of execute function.
+
+    Asynchronous loaders refresh in a task on the running event loop; synchronous
+    loaders refresh on the cache's worker threads.
+
+    Args:
+        metadata_cache: The metadata cache instance to use
+        key: Identifies what is refreshed
+        execute: The execute function of the loader serving the stale entry
+        refresh: The refresh coroutine function
+        *args: Arguments for the refresh coroutine function
+    """
+    if _is_blocking(execute):
+        metadata_cache.schedule_refresh(
+            key, lambda: _run_blocking(refresh(*args, execute=execute))
+        )
+    else:
+        metadata_cache.schedule_refresh_async(
+            key, lambda: refresh(*args, execute=execute)
+        )
+
+
+async def _load_once(
+    metadata_cache,
+    key: Tuple[str, ...],
+    execute: ExecuteFunction,
+    load: Callable[[], Coroutine[Any, Any, T]],
+) -> T:
+    """
+    Runs a load unless the same load is already in progress.
+
+    Asynchronous callers share the result of the load in progress. Synchronous callers
+    wait for it to finish, then run their own load, which finds the metadata cached.
+    The duration of each load run is recorded in the cache's load latency histogram
+    for the kind of load, key[0].
+
+    Args:
+        metadata_cache: The metadata cache instance to use
+        key: Identifies what is loaded, e.g. ("class", class_name)
+        execute: The execute function of the calling loader
+        load: Function returning the load coroutine, which checks the cache first
+
+    Returns:
+        The result of the load
+    """
+
+    async def timed_load() -> T:
+        with metadata_cache.load_latency(key[0]).time():
+            return await load()
+
+    if _is_blocking(execute):
+        with metadata_cache.load_lock(key):
+            return await timed_load()
+    return await metadata_cache.load_once(key, timed_load)
+
+
+def _build_property_descriptions(
+    class_gql_data: dict,
+) -> Tuple[List[CachePropertyDescription], Optional[str]]:
+    """
+    Converts the property descriptions of a classDescription response to model objects.
+
+    Args:
+        class_gql_data: The classDescription data from the GraphQL response
+
+    Returns:
+        A tuple of the property descriptions and the symbolic name of the name property
+    """
+    property_descriptions = []
+    name_prop_idx: int | None = class_gql_data.get("namePropertyIndex", None)
+    name_prop_sym_name: str | None = None
+    for idx, prop in enumerate(class_gql_data.get("propertyDescriptions", [])):
+        prop_sym_name: str = prop.get("symbolicName")
+        if name_prop_idx and idx == name_prop_idx:
+            name_prop_sym_name = prop_sym_name
+        property_descriptions.append(
+            CachePropertyDescription(
+                symbolic_name=prop_sym_name,
+                display_name=prop.get("displayName"),
+                descriptive_text=prop.get("descriptiveText", ""),
+                data_type=prop.get("dataType"),
+                cardinality=prop.get("cardinality"),
+                is_searchable=prop.get("isSearchable", False),
+                is_system_owned=prop.get("isSystemOwned", False),
+                is_hidden=prop.get("isHidden", False),
+                valid_search_operators=[],  # This would need to be populated based on data type
+            )
+        )
+    return property_descriptions, name_prop_sym_name
+
+
 def get_root_class_description_tool(
     graphql_client,
     root_class_type: str,
@@ -39,24 +311,141 @@ def get_root_class_description_tool(
     """
     Retrieves all classes of a specific root class type (e.g., "Document", "Folder", "Annotation", "CustomObject).
 
+    Synchronous version of get_root_class_description_tool_async.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class_type: The type of root class to retrieve (e.g., "Document", "Folder", "Annotation", "CustomObject")
+        metadata_cache: The metadata cache instance to use
+
+    Returns:
+        True if the cache exists or was successfully filled, False otherwise, or a ToolError if an error occurs
+    """
+    return _run_blocking(
+        get_root_class_description_tool_async(
+            graphql_client,
+            root_class_type,
+            metadata_cache,
+            execute=_BlockingExecute(graphql_client),
+        )
+    )
+
+
+async def get_root_class_description_tool_async(
+    graphql_client,
+    root_class_type: str,
+    metadata_cache,
+    execute: Optional[ExecuteFunction] = None,
+) -> Union[bool, ToolError]:
+    """
+    Retrieves all classes of a specific root class type (e.g., "Document", "Folder", "Annotation", "CustomObject).
+
+    If the cached classes are stale, they are returned as they are and refreshed in the
+    background.
+
     Args:
         graphql_client: The GraphQL client to use for queries
         root_class_type: The type of root class to retrieve (e.g., "Document", "Folder", "Annotation", "CustomObject")
         metadata_cache: The metadata cache instance to use
+        execute: The function sending GraphQL requests, graphql_client.execute_async by default
 
     Returns:
         True if the cache exists or was successfully filled, False otherwise, or a ToolError if an error occurs
     """
+    execute = execute or graphql_client.execute_async
+
     # Ensure the root class exists in the cache
+    await _restore_snapshot(metadata_cache, execute, root_class_type)
     metadata_cache.ensure_root_class_exists(root_class_type)
 
     # Check if we have any cached classes for this root class type
     class_cache = metadata_cache.get_class_cache(root_class_type)
+    metadata_cache.record_lookup("root", bool(class_cache))
     if class_cache:
-        # Cache exists, return True
+        # Cache exists, refresh it in the background if it is stale and return True
+        if metadata_cache.is_root_class_stale(root_class_type):
+            _schedule_refresh(
+                metadata_cache,
+                ("root", root_class_type),
+                _uncached(graphql_client, execute),
+                refresh_root_class_async,
+                graphql_client,
+                root_class_type,
+                metadata_cache,
+            )
+        return True
+
+    # If no cached classes, fetch all classes of this type, once for all callers
+    return await _load_once(
+        metadata_cache,
+        ("root", root_class_type),
+        execute,
+        lambda: _load_root_class(
+            graphql_client, root_class_type, metadata_cache, execute
+        ),
+    )
+
+
+async def _load_root_class(
+    graphql_client, root_class_type: str, metadata_cache, execute: ExecuteFunction
+) -> Union[bool, ToolError]:
+    """Loads the classes of a root class type unless another caller just did."""
+    if metadata_cache.get_class_cache(root_class_type):
         return True
+    return await refresh_root_class_async(
+        graphql_client, root_class_type, metadata_cache, execute=execute
+    )
+
 
-    # If no cached classes, fetch all classes of this type
+def refresh_root_class(
+    graphql_client,
+    root_class_type: str,
+    metadata_cache,
+) -> Union[bool, ToolError]:
+    """
+    Loads all classes of a root class type from the repository and replaces the cached ones.
+
+    Synchronous version of refresh_root_class_async.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class_type: The type of root class to load (e.g., "Document", "Folder", "Annotation", "CustomObject")
+        metadata_cache: The metadata cache instance to use
+
+    Returns:
+        True if the cache was successfully filled, or a ToolError if an error occurs
+    """
+    return _run_blocking(
+        refresh_root_class_async(
+            graphql_client,
+            root_class_type,
+            metadata_cache,
+            execute=_BlockingExecute(graphql_client, cache=False),
+        )
+    )
+
+
+async def refresh_root_class_async(
+    graphql_client,
+    root_class_type: str,
+    metadata_cache,
+    execute: Optional[ExecuteFunction] = None,
+) -> Union[bool, ToolError]:
+    """
+    Loads all classes of a root class type from the repository and replaces the cached ones.
+
+    Property descriptions already loaded for classes that still exist are kept.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class_type: The type of root class to load (e.g., "Document", "Folder", "Annotation", "CustomObject")
+        metadata_cache: The metadata cache instance to use
+        execute: The function sending GraphQL requests, graphql_client.execute_async bypassing the response cache by default
+
+    Returns:
+        True if the cache was successfully filled, or a ToolError if an error occurs
+    """
+    execute = execute or functools.partial(graphql_client.execute_async, cache=False)
     query = """
     query getClassAndSubclasses($object_store_name: String!, $root_class_name: String!, $page_size: Int!) {
         classDescription(
@@ -76,6 +465,12 @@ def get_root_class_description_tool(
                 symbolicName
                 displayName
                 descriptiveText
+                superClassDescription {
+                    symbolicName
+                }
+            }
+            pageInfo {
+                token
             }
         }
     }
@@ -84,11 +479,11 @@ def get_root_class_description_tool(
     variables = {
         "object_store_name": graphql_client.object_store,
         "root_class_name": root_class_type,
-        "page_size": 500,
+        "page_size": CLASS_PAGE_SIZE,
     }
 
     try:
-        response = graphql_client.execute(query=query, variables=variables)
+        response = await execute(query=query, variables=variables)
 
         # Check for errors in the response
         if "error" in response and response["error"]:
@@ -103,9 +498,9 @@ def get_root_class_description_tool(
         # Process the response
         data = response.get("data", {})
         root_class_info = data.get("classDescription", {})
-        subclasses = data.get("subClassDescriptions", {}).get("classDescriptions", [])
+        first_page = data.get("subClassDescriptions") or {}
 
-        if not root_class_info and not subclasses:
+        if not root_class_info and not first_page.get("classDescriptions"):
             return ToolError(
                 message=f"No classes found for root class type '{root_class_type}'",
                 suggestions=[
@@ -114,6 +509,9 @@ def get_root_class_description_tool(
                 ],
             )
 
+        classes = {}
+        superclasses: Dict[str, Optional[str]] = {}
+
         # Cache the root class with basic information
         if root_class_info:
             root_class_data = CacheClassDescriptionData(
@@ -126,24 +524,40 @@ def get_root_class_description_tool(
 
             # Cache the root class under its own key (e.g., "Document" -> "Document")
             # This ensures the root class itself is included in the cache
-            metadata_cache.set_class_data(
-                root_class_type, root_class_type, root_class_data
-            )
+            classes[root_class_type] = root_class_data
 
-        # Cache the subclasses with basic information
-        for subclass in subclasses:
-            symbolic_name = subclass.get("symbolicName", "")
+        # Cache the subclasses with basic information, page by page. The next page
+        # is already being fetched while the current one is converted.
+        async for page in _subclass_pages(
+            graphql_client, root_class_type, first_page, execute
+        ):
+            for subclass in page.get("classDescriptions") or []:
+                symbolic_name = subclass.get("symbolicName", "")
 
-            # Create a ContentClassData object with empty properties list
-            class_data = CacheClassDescriptionData(
-                display_name=subclass.get("displayName", ""),
-                symbolic_name=symbolic_name,
-                descriptive_text=subclass.get("descriptiveText", ""),
-                property_descriptions=[],  # Empty list for now
-                name_property_symbolic_name=None,  # To be filled in when property descriptions loaded
-            )
+                # Create a ContentClassData object with empty properties list
+                class_data = CacheClassDescriptionData(
+                    display_name=subclass.get("displayName", ""),
+                    symbolic_name=symbolic_name,
+                    descriptive_text=subclass.get("descriptiveText", ""),
+                    property_descriptions=[],  # Empty list for now
+                    name_property_symbolic_name=None,  # To be filled in when property descriptions loaded
+                )
+
+                classes[symbolic_name] = class_data
+                if "superClassDescription" in subclass:
+                    superclasses[symbolic_name] = (
+                        subclass["superClassDescription"] or {}
+                    ).get("symbolicName")
 
-            metadata_cache.set_class_data(root_class_type, symbolic_name, class_data)
+        # Replace the cached classes in one step and save them for the next server
+        # process, off the event loop
+        await _restore_snapshot(metadata_cache, execute, root_class_type)
+        metadata_cache.replace_root_class(root_class_type, classes, persist=False)
+        metadata_cache.record_superclasses(superclasses)
+        await _off_loop(execute, metadata_cache.persist_root_class, root_class_type)
+        # Build the keyword and typo indexes of the new classes ahead of the next
+        # search, off the event loop
+        await _off_loop(execute, _build_class_index, metadata_cache, root_class_type)
 
         # Successfully filled the cache
         return True
@@ -158,9 +572,153 @@ def get_root_class_description_tool(
         )
 
 
+def _build_class_index(metadata_cache, root_class_type: str) -> None:
+    """Builds the keyword index of the classes of a root class, with its typo index."""
+    metadata_cache.get_class_index(root_class_type).fuzzy
+
+
+async def _fetch_subclass_page(
+    graphql_client, root_class_type: str, page_token: str, execute: ExecuteFunction
+) -> dict:
+    """
+    Fetches a following page of the subclasses of a root class.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class_type: The root class whose subclasses are listed
+        page_token: The token of the page, from the pageInfo of the previous page
+        execute: The function sending GraphQL requests
+
+    Returns:
+        The subClassDescriptions data of the page
+
+    Raises:
+        Exception: If the request fails
+    """
+    variables = {
+        "object_store_name": graphql_client.object_store,
+        "root_class_name": root_class_type,
+        "page_size": CLASS_PAGE_SIZE,
+        "page_token": page_token,
+    }
+    response = await execute(query=SUBCLASS_PAGE_QUERY, variables=variables)
+    if "error" in response and response["error"]:
+        raise Exception(response.get("message", "Unknown error"))
+    return response.get("data", {}).get("subClassDescriptions") or {}
+
+
+async def _subclass_pages(
+    graphql_client, root_class_type: str, first_page: dict, execute: ExecuteFunction
+) -> AsyncIterator[dict]:
+    """
+    Yields the pages of the subclasses of a root class, following the page tokens.
+
+    The request for the next page is sent before a page is yielded, so it is in flight
+    while the caller processes the current page: as a task with an asynchronous execute
+    function, on a helper thread with the synchronous one. Paging stops at a page
+    without a token, an empty page, or a token that was already requested, so a server
+    that repeats a token cannot cause an endless loop.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class_type: The root class whose subclasses are listed
+        first_page: The subClassDescriptions data of the first page
+        execute: The function sending GraphQL requests
+
+    Yields:
+        The subClassDescriptions data of each page
+
+    Raises:
+        Exception: If a request for a following page fails
+    """
+    blocking = _is_blocking(execute)
+    executor = (
+        ThreadPoolExecutor(max_workers=1, thread_name_prefix="class-pages")
+        if blocking
+        else None
+    )
+    requested_tokens: Set[str] = set()
+    page: Optional[dict] = first_page
+    next_page: Union[Future, asyncio.Future, None] = None
+    try:
+        while page is not None:
+            token = (page.get("pageInfo") or {}).get("token")
+            next_page = None
+            if token and page.get("classDescriptions"):
+                if token in requested_tokens:
+                    logger.warning(
+                        f"Page token repeated while listing subclasses of {root_class_type}, stopping"
+                    )
+                else:
+                    requested_tokens.add(token)
+                    fetch = _fetch_subclass_page(
+                        graphql_client, root_class_type, token, execute
+                    )
+                    next_page = (
+                        executor.submit(_run_blocking, fetch)
+                        if executor is not None
+                        else asyncio.ensure_future(fetch)
+                    )
+            yield page
+            if next_page is None:
+                page = None
+            elif isinstance(next_page, Future):
+                page = next_page.result()
+            else:
+                page = await next_page
+    finally:
+        if isinstance(next_page, asyncio.Future) and not next_page.done():
+            next_page.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
 def discover_and_load_root_class(
     graphql_client, metadata_cache, class_symbolic_name: str, class_gql_data: dict
 ) -> Union[bool, ToolError]:
+    """
+    Discovers the system root class of a class and loads its catalog.
+
+    Synchronous version of discover_and_load_root_class_async.
+    """
+    return _run_blocking(
+        discover_and_load_root_class_async(
+            graphql_client,
+            metadata_cache,
+            class_symbolic_name,
+            class_gql_data,
+            execute=_BlockingExecute(graphql_client),
+        )
+    )
+
+
+async def discover_and_load_root_class_async(
+    graphql_client,
+    metadata_cache,
+    class_symbolic_name: str,
+    class_gql_data: dict,
+    execute: Optional[ExecuteFunction] = None,
+) -> Union[bool, ToolError]:
+    """
+    Discovers the system root class of a class and loads its catalog.
+
+    The superclasses found in class_gql_data and in every discovery response are added
+    to the class hierarchy kept by the metadata cache, so the root class is resolved
+    locally as far as the hierarchy is known. Discovery queries start at the first
+    ancestor whose superclass is still unknown.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        metadata_cache: The metadata cache instance to use
+        class_symbolic_name: The symbolic name of the class
+        class_gql_data: The classDescription data of the class, with its superclasses
+            if they were requested
+        execute: The function sending GraphQL requests, graphql_client.execute_async by default
+
+    Returns:
+        True if the root class catalog is loaded, or a ToolError if an error occurs
+    """
+    execute = execute or graphql_client.execute_async
     logger.debug(f"Discovering and loading root class for class {class_symbolic_name}")
     query_next_discover_root_class = """
     query getClassMetadata($object_store_name: String!, $class_symbolic_name: String!) {
@@ -181,70 +739,41 @@ def discover_and_load_root_class(
     }
     """
 
-    sys_root_class_name: str | None = None
+    metadata_cache.record_superclasses(
+        _superclass_chain(class_symbolic_name, class_gql_data)
+    )
 
     try:
-        cur_class_name: str | None = class_symbolic_name
-        while True:
-            if cur_class_name in SYSTEM_ROOT_CLASS_TYPES:
-                sys_root_class_name = cur_class_name
+        sys_root_class_name = metadata_cache.resolve_root_class(class_symbolic_name)
+        while sys_root_class_name is None:
+            ancestor = metadata_cache.first_unknown_ancestor(class_symbolic_name)
+            if ancestor is None:
+                # Reached the end of the superclasses without finding a root class
                 break
 
-            super_class: dict = class_gql_data["superClassDescription"]
-            super_class_sym_name: str | None = (
-                super_class["symbolicName"] if super_class is not None else None
-            )
-            if super_class_sym_name is None:
-                break
-            while True:
-                logger.debug(f"Looking at super class sym name {sys_root_class_name }")
-                if super_class_sym_name in SYSTEM_ROOT_CLASS_TYPES:
-                    # Found our root class
-                    sys_root_class_name = super_class_sym_name
-                    break
-                if "superClassDescription" not in super_class:
-                    # Reached the end of the superclasses from this gql query. Break out and do another.
-                    break
-                super_class = super_class["superClassDescription"]
-                super_class_sym_name = (
-                    super_class["symbolicName"] if super_class is not None else None
-                )
-                # Reached the end of the superclasses without finding a root class.
-                if super_class_sym_name is None:
-                    break
-            logger.debug(f"System root class name if any so far {sys_root_class_name}")
-            logger.debug(
-                f"Next super class symbolic name to try if any {super_class_sym_name}"
-            )
-            # We found our root class
-            # Or, we reached the end of superclasses before finding a root class.
-            if sys_root_class_name is not None or super_class_sym_name is None:
-                break
             # Continue with another gql query to discover the root class from more superclasses
-            logger.debug(
-                f"Continuing with another query for super class {super_class_sym_name}"
-            )
+            logger.debug(f"Continuing with another query for super class {ancestor}")
             variables = {
                 "object_store_name": graphql_client.object_store,
-                "class_symbolic_name": super_class_sym_name,
+                "class_symbolic_name": ancestor,
             }
-            response = graphql_client.execute(
+            response = await execute(
                 query=query_next_discover_root_class, variables=variables
             )
 
             # Check for errors in the response
             if "error" in response and response["error"]:
                 return ToolError(
-                    message=f"Failed to retrieve metadata for class {super_class_sym_name}: {response.get('message', 'Unknown error')}",
+                    message=f"Failed to retrieve metadata for class {ancestor}: {response.get('message', 'Unknown error')}",
                     suggestions=[
                         "Verify the class name is correct",
                         "Check your connection to the repository",
                     ],
                 )
 
-            class_gql_data = response.get("data", {}).get("classDescription", {})
+            ancestor_gql_data = response.get("data", {}).get("classDescription", {})
 
-            if not class_gql_data:
+            if not ancestor_gql_data:
                 return ToolError(
                     message=f"Class '{class_symbolic_name}' not found",
                     suggestions=[
@@ -253,11 +782,15 @@ def discover_and_load_root_class(
                     ],
                 )
 
-            cur_class_name = super_class_sym_name
+            # A response without superclasses ends the chain
+            metadata_cache.record_superclasses(
+                _superclass_chain(ancestor, ancestor_gql_data) or {ancestor: None}
+            )
+            sys_root_class_name = metadata_cache.resolve_root_class(class_symbolic_name)
 
         if sys_root_class_name is None:
             return ToolError(
-                message=f"Failed to discover the root class for {initial_class_name}",
+                message=f"Failed to discover the root class for {class_symbolic_name}",
                 suggestions=[
                     "Check that the class name is correct",
                     "Check that the class name is of a supported root type",
@@ -268,8 +801,8 @@ def discover_and_load_root_class(
             f"System root class found to be {sys_root_class_name}. Loading root class cache."
         )
         # Load the root class
-        load_stat = get_root_class_description_tool(
-            graphql_client, sys_root_class_name, metadata_cache
+        load_stat = await get_root_class_description_tool_async(
+            graphql_client, sys_root_class_name, metadata_cache, execute=execute
         )
         if isinstance(load_stat, ToolError):
             return load_stat
@@ -286,6 +819,33 @@ def discover_and_load_root_class(
     return True
 
 
+def _superclass_chain(
+    class_name: str, class_gql_data: dict
+) -> Dict[str, Optional[str]]:
+    """
+    Collects the superclass of each class in the nested superClassDescription data of
+    a classDescription response.
+
+    Args:
+        class_name: The symbolic name of the class described
+        class_gql_data: The classDescription data
+
+    Returns:
+        The superclass of each class in the chain, None for a class without one. The
+        last class of the chain is left out if the response doesn't go further.
+    """
+    superclasses: Dict[str, Optional[str]] = {}
+    current, data = class_name, class_gql_data
+    while data and "superClassDescription" in data:
+        super_class = data["superClassDescription"]
+        super_class_name = super_class.get("symbolicName") if super_class else None
+        superclasses[current] = super_class_name
+        if super_class_name is None:
+            break
+        current, data = super_class_name, super_class
+    return superclasses
+
+
 def get_class_metadata_tool(
     graphql_client,
     class_symbolic_name: str,
@@ -294,6 +854,8 @@ def get_class_metadata_tool(
     """
     Retrieves detailed metadata about a repository class including its properties.
 
+    Synchronous version of get_class_metadata_tool_async.
+
     Args:
         graphql_client: The GraphQL client to use for queries
         class_symbolic_name: The symbolic name of the class
@@ -302,27 +864,96 @@ def get_class_metadata_tool(
     Returns:
         A ContentClassData object containing class metadata or a ToolError if an error occurs
     """
+    return _run_blocking(
+        get_class_metadata_tool_async(
+            graphql_client,
+            class_symbolic_name,
+            metadata_cache,
+            execute=_BlockingExecute(graphql_client),
+        )
+    )
 
-    query = """
-    query getClassMetadata($object_store_name: String!, $class_symbolic_name: String!) {
-    classDescription(
-        repositoryIdentifier: $object_store_name
-        identifier: $class_symbolic_name
-    ) {
-        namePropertyIndex
-        propertyDescriptions {
-            symbolicName
-            displayName
-            descriptiveText
-            dataType
-            cardinality
-            isSearchable
-            isSystemOwned
-            isHidden
-        }
-    }
-    }
+
+async def get_class_metadata_tool_async(
+    graphql_client,
+    class_symbolic_name: str,
+    metadata_cache,
+    execute: Optional[ExecuteFunction] = None,
+) -> Union[CacheClassDescriptionData, ToolError]:
     """
+    Retrieves detailed metadata about a repository class including its properties.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        class_symbolic_name: The symbolic name of the class
+        metadata_cache: The metadata cache instance to use
+        execute: The function sending GraphQL requests, graphql_client.execute_async by default
+
+    Returns:
+        A ContentClassData object containing class metadata or a ToolError if an error occurs
+    """
+    execute = execute or graphql_client.execute_async
+
+    # Serve cached properties, refreshing them in the background if stale
+    await _restore_snapshot(metadata_cache, execute)
+    root_class = metadata_cache.find_root_class_for_class(class_symbolic_name)
+    class_data = (
+        metadata_cache.get_class_data(root_class, class_symbolic_name)
+        if root_class is not None
+        else None
+    )
+    cached = class_data is not None and metadata_cache.has_class_properties(
+        root_class, class_symbolic_name
+    )
+    metadata_cache.record_lookup("class", cached)
+    if cached:
+        class_data = metadata_cache.get_class_metadata(root_class, class_symbolic_name)
+        if metadata_cache.is_class_stale(root_class, class_symbolic_name):
+            _schedule_refresh(
+                metadata_cache,
+                ("class", root_class, class_symbolic_name),
+                _uncached(graphql_client, execute),
+                refresh_class_metadata_async,
+                graphql_client,
+                root_class,
+                class_symbolic_name,
+                metadata_cache,
+            )
+    else:
+        # Load the class once, however many callers are waiting for it
+        class_data = await _load_once(
+            metadata_cache,
+            ("class", class_symbolic_name),
+            execute,
+            lambda: _load_class_metadata(
+                graphql_client, class_symbolic_name, metadata_cache, execute
+            ),
+        )
+        if isinstance(class_data, ToolError):
+            return class_data
+        root_class = metadata_cache.find_root_class_for_class(class_symbolic_name)
+
+    metadata_cache.record_usage(root_class, class_symbolic_name)
+    return class_data
+
+
+async def _load_class_metadata(
+    graphql_client, class_symbolic_name: str, metadata_cache, execute: ExecuteFunction
+) -> Union[CacheClassDescriptionData, ToolError]:
+    """
+    Loads the property descriptions of a class, discovering and loading its root class
+    first if needed.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        class_symbolic_name: The symbolic name of the class
+        metadata_cache: The metadata cache instance to use
+        execute: The function sending GraphQL requests
+
+    Returns:
+        The class data with its property descriptions, or a ToolError if an error occurs
+    """
+    query = CLASS_METADATA_QUERY
 
     query_with_discover_root_class = """
     query getClassMetadata($object_store_name: String!, $class_symbolic_name: String!) {
@@ -362,12 +993,18 @@ def get_class_metadata_tool(
         existing_class_data = metadata_cache.get_class_data(
             root_class, class_symbolic_name
         )
-        if existing_class_data and len(existing_class_data.property_descriptions) > 0:
-            return existing_class_data
+        if existing_class_data and metadata_cache.has_class_properties(
+            root_class, class_symbolic_name
+        ):
+            # Loaded by another caller in the meantime
+            return metadata_cache.get_class_metadata(root_class, class_symbolic_name)
 
-    initial_query: str = (
-        query if existing_class_data else query_with_discover_root_class
+    # Ask for the superclasses only if the class hierarchy doesn't tell the root class
+    root_known = (
+        existing_class_data is not None
+        or metadata_cache.resolve_root_class(class_symbolic_name) is not None
     )
+    initial_query: str = query if root_known else query_with_discover_root_class
     logger.debug(f"initial_query: str = {initial_query}")
 
     variables = {
@@ -376,7 +1013,7 @@ def get_class_metadata_tool(
     }
 
     try:
-        response = graphql_client.execute(query=initial_query, variables=variables)
+        response = await execute(query=initial_query, variables=variables)
 
         # Check for errors in the response
         if "error" in response and response["error"]:
@@ -401,8 +1038,12 @@ def get_class_metadata_tool(
             )
 
         if not existing_class_data:
-            discover_stat = discover_and_load_root_class(
-                graphql_client, metadata_cache, class_symbolic_name, class_gql_data
+            discover_stat = await discover_and_load_root_class_async(
+                graphql_client,
+                metadata_cache,
+                class_symbolic_name,
+                class_gql_data,
+                execute=execute,
             )
             if isinstance(discover_stat, ToolError):
                 return discover_stat
@@ -421,35 +1062,32 @@ def get_class_metadata_tool(
                 existing_class_data
             ), f"Class data not found for class '{class_symbolic_name}'"
             # Property descriptions shouldn't be loaded yet but go ahead and check anyway.
-            if len(existing_class_data.property_descriptions) > 0:
-                return existing_class_data
-
-        # Convert the GraphQL response to our model objects
-        property_descriptions = []
-        name_prop_idx: int | None = class_gql_data.get("namePropertyIndex", None)
-        name_prop_sym_name: str | None = None
-        for idx, prop in enumerate(class_gql_data.get("propertyDescriptions", [])):
-            prop_sym_name: str = prop.get("symbolicName")
-            if name_prop_idx and idx == name_prop_idx:
-                name_prop_sym_name = prop_sym_name
-            property_descriptions.append(
-                CachePropertyDescription(
-                    symbolic_name=prop_sym_name,
-                    display_name=prop.get("displayName"),
-                    descriptive_text=prop.get("descriptiveText", ""),
-                    data_type=prop.get("dataType"),
-                    cardinality=prop.get("cardinality"),
-                    is_searchable=prop.get("isSearchable", False),
-                    is_system_owned=prop.get("isSystemOwned", False),
-                    is_hidden=prop.get("isHidden", False),
-                    valid_search_operators=[],  # This would need to be populated based on data type
+            if metadata_cache.has_class_properties(root_class, class_symbolic_name):
+                return metadata_cache.get_class_metadata(
+                    root_class, class_symbolic_name
                 )
-            )
 
-        # We already have class data, just update the properties
-        existing_class_data.property_descriptions = property_descriptions
-        existing_class_data.name_property_symbolic_name = name_prop_sym_name
-        content_class_data = existing_class_data
+        # Convert the GraphQL response to our model objects and store them
+        property_descriptions, name_prop_sym_name = _build_property_descriptions(
+            class_gql_data
+        )
+        content_class_data = await _store_class_properties(
+            metadata_cache,
+            execute,
+            root_class,
+            class_symbolic_name,
+            property_descriptions,
+            name_prop_sym_name,
+        )
+        if content_class_data is None:
+            # A concurrent refresh of the root class dropped the class
+            return ToolError(
+                message=f"Class '{class_symbolic_name}' not found",
+                suggestions=[
+                    "Check the class name",
+                    "Use get_root_class_description to see available classes",
+                ],
+            )
 
         # Return the ContentClassData object directly
         return content_class_data
@@ -462,3 +1100,288 @@ def get_class_metadata_tool(
                 "Check your connection to the repository",
             ],
         )
+
+
+async def _store_class_properties(
+    metadata_cache,
+    execute: ExecuteFunction,
+    root_class: str,
+    class_symbolic_name: str,
+    property_descriptions: List[CachePropertyDescription],
+    name_prop_sym_name: Optional[str],
+) -> Optional[CacheClassDescriptionData]:
+    """
+    Stores the loaded property descriptions of a class and saves it to the snapshot,
+    off the event loop.
+
+    Returns:
+        The updated class data, or None if the class is no longer cached
+    """
+    await _restore_snapshot(metadata_cache, execute, root_class)
+    (class_data,) = metadata_cache.update_classes_properties(
+        [(root_class, class_symbolic_name, property_descriptions, name_prop_sym_name)]
+    )
+    if class_data is not None:
+        await _off_loop(
+            execute, metadata_cache.persist_classes, [(root_class, class_data)]
+        )
+    return class_data
+
+
+def refresh_class_metadata(
+    graphql_client,
+    root_class: str,
+    class_symbolic_name: str,
+    metadata_cache,
+) -> Union[CacheClassDescriptionData, ToolError]:
+    """
+    Reloads the property descriptions of a cached class from the repository.
+
+    Synchronous version of refresh_class_metadata_async.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class: The root class the class belongs to
+        class_symbolic_name: The symbolic name of the class
+        metadata_cache: The metadata cache instance to use
+
+    Returns:
+        The updated class data, or a ToolError if an error occurs
+    """
+    return _run_blocking(
+        refresh_class_metadata_async(
+            graphql_client,
+            root_class,
+            class_symbolic_name,
+            metadata_cache,
+            execute=_BlockingExecute(graphql_client, cache=False),
+        )
+    )
+
+
+async def refresh_class_metadata_async(
+    graphql_client,
+    root_class: str,
+    class_symbolic_name: str,
+    metadata_cache,
+    execute: Optional[ExecuteFunction] = None,
+) -> Union[CacheClassDescriptionData, ToolError]:
+    """
+    Reloads the property descriptions of a cached class from the repository.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        root_class: The root class the class belongs to
+        class_symbolic_name: The symbolic name of the class
+        metadata_cache: The metadata cache instance to use
+        execute: The function sending GraphQL requests, graphql_client.execute_async bypassing the response cache by default
+
+    Returns:
+        The updated class data, or a ToolError if an error occurs
+    """
+    execute = execute or functools.partial(graphql_client.execute_async, cache=False)
+    variables = {
+        "object_store_name": graphql_client.object_store,
+        "class_symbolic_name": class_symbolic_name,
+    }
+
+    try:
+        response = await execute(query=CLASS_METADATA_QUERY, variables=variables)
+
+        # Check for errors in the response
+        if "error" in response and response["error"]:
+            return ToolError(
+                message=f"Failed to retrieve metadata for class {class_symbolic_name}: {response.get('message', 'Unknown error')}",
+                suggestions=[
+                    "Verify the class name is correct",
+                    "Check your connection to the repository",
+                ],
+            )
+
+        class_gql_data = response.get("data", {}).get("classDescription", {})
+        if not class_gql_data:
+            return ToolError(
+                message=f"Class '{class_symbolic_name}' not found",
+                suggestions=[
+                    "Check the class name",
+                    "Use get_root_class_description to see available classes",
+                ],
+            )
+
+        property_descriptions, name_prop_sym_name = _build_property_descriptions(
+            class_gql_data
+        )
+        class_data = await _store_class_properties(
+            metadata_cache,
+            execute,
+            root_class,
+            class_symbolic_name,
+            property_descriptions,
+            name_prop_sym_name,
+        )
+        if class_data is None:
+            return ToolError(
+                message=f"Class '{class_symbolic_name}' is no longer cached",
+                suggestions=["Load the class metadata again"],
+            )
+        return class_data
+
+    except Exception as e:
+        return ToolError(
+            message=f"Failed to retrieve metadata for class {class_symbolic_name}: {str(e)}",
+            suggestions=[
+                "Verify the class name is correct",
+                "Check your connection to the repository",
+            ],
+        )
+
+
+def _build_bulk_class_metadata_query(count: int) -> str:
+    """
+    Builds a query requesting the property descriptions of several classes.
+
+    Each class is requested through its own aliased classDescription field, c0 to
+    c<count-1>, with the class name in the variable of the same name.
+
+    Args:
+        count: Number of classes in the query
+
+    Returns:
+        The GraphQL query string
+    """
+    variables = "".join(f", $c{i}: String!" for i in range(count))
+    fields = "".join(f"""
+    c{i}: classDescription(
+        repositoryIdentifier: $object_store_name
+        identifier: $c{i}
+    ) {{{CLASS_METADATA_FIELDS}    }}""" for i in range(count))
+    return f"""
+    query getClassMetadataBulk($object_store_name: String!{variables}) {{{fields}
+    }}
+    """
+
+
+async def _load_class_metadata_batch(
+    graphql_client,
+    metadata_cache,
+    batch: List[Tuple[str, str]],
+) -> Dict[str, Union[CacheClassDescriptionData, ToolError]]:
+    """
+    Loads the property descriptions of a batch of classes with a single query.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        metadata_cache: The metadata cache instance to use
+        batch: (root class, class name) tuples of cached classes
+
+    Returns:
+        The updated class data or a ToolError for each class name
+    """
+    variables = {"object_store_name": graphql_client.object_store}
+    for i, (_, class_name) in enumerate(batch):
+        variables[f"c{i}"] = class_name
+
+    try:
+        response = await graphql_client.execute_async(
+            query=_build_bulk_class_metadata_query(len(batch)), variables=variables
+        )
+    except Exception as e:
+        response = {"error": True, "message": str(e)}
+
+    if "error" in response and response["error"]:
+        error = ToolError(
+            message=f"Failed to retrieve metadata for classes: {response.get('message', 'Unknown error')}",
+            suggestions=["Check your connection to the repository"],
+        )
+        return {class_name: error for _, class_name in batch}
+
+    # Errors of individual classes carry the alias of their field in the path
+    error_messages = {}
+    for error in response.get("errors") or []:
+        path = error.get("path") or []
+        if path:
+            error_messages[path[0]] = error.get("message", "Unknown error")
+
+    data = response.get("data") or {}
+    results: Dict[str, Union[CacheClassDescriptionData, ToolError]] = {}
+    updates = []
+    for i, (root_class, class_name) in enumerate(batch):
+        class_gql_data = data.get(f"c{i}")
+        if not class_gql_data:
+            results[class_name] = ToolError(
+                message=error_messages.get(f"c{i}", f"Class '{class_name}' not found"),
+                suggestions=[
+                    "Check the class name",
+                    "Use get_root_class_description to see available classes",
+                ],
+            )
+            continue
+
+        property_descriptions, name_prop_sym_name = _build_property_descriptions(
+            class_gql_data
+        )
+        updates.append(
+            (root_class, class_name, property_descriptions, name_prop_sym_name)
+        )
+
+    # Store the whole batch at once and save it in a single snapshot transaction,
+    # off the event loop
+    await _restore_snapshot(
+        metadata_cache,
+        graphql_client.execute_async,
+        *{root_class for root_class, _, _, _ in updates},
+    )
+    saved = []
+    for (root_class, class_name, _, _), class_data in zip(
+        updates, metadata_cache.update_classes_properties(updates)
+    ):
+        if class_data is None:
+            results[class_name] = ToolError(
+                message=f"Class '{class_name}' is no longer cached",
+                suggestions=["Load the class metadata again"],
+            )
+        else:
+            results[class_name] = class_data
+            saved.append((root_class, class_data))
+    if saved:
+        await asyncio.to_thread(metadata_cache.persist_classes, saved)
+    return results
+
+
+async def load_class_metadata_bulk(
+    graphql_client,
+    metadata_cache,
+    classes: Iterable[Tuple[str, str]],
+    batch_size: int = DEFAULT_CLASS_BATCH_SIZE,
+) -> Dict[str, Union[CacheClassDescriptionData, ToolError]]:
+    """
+    Loads the property descriptions of many cached classes with few requests.
+
+    The classes are split into batches of batch_size classes. Each batch is a single
+    query with one aliased classDescription field per class, and all batches are sent
+    concurrently, so the number of round trips is the number of batches.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        metadata_cache: The metadata cache instance to use
+        classes: (root class, class name) tuples of classes whose catalog is cached
+        batch_size: Maximum number of classes per query
+
+    Returns:
+        The updated class data or a ToolError for each class name
+    """
+    classes = list(classes)
+    batch_size = max(1, batch_size)
+    batches = [
+        classes[start : start + batch_size]
+        for start in range(0, len(classes), batch_size)
+    ]
+    results: Dict[str, Union[CacheClassDescriptionData, ToolError]] = {}
+    for batch_results in await asyncio.gather(
+        *(
+            _load_class_metadata_batch(graphql_client, metadata_cache, batch)
+            for batch in batches
+        )
+    ):
+        results.update(batch_results)
+    return results
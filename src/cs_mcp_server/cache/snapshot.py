@@ -0,0 +1,470 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+On-disk snapshot of the metadata cache.
+
+MetadataCache starts empty in every process, and stdio servers are started once per
+client session. The snapshot keeps the class catalogs and property descriptions in a
+SQLite database, so a new process can read them locally instead of querying the
+repository again.
+
+Entries are keyed by server URL and object store, so several servers can share one
+database file. Each root class catalog is read lazily the first time it is needed and
+written incrementally: a catalog when it is loaded from the repository, a class when
+its property descriptions are loaded.
+
+Freshness is checked with the time each row was written. A catalog older than the
+maximum age is ignored as a whole; a class whose property descriptions are older than
+the maximum age is restored without them, so they are reloaded on first use. A change
+of the schema version discards the whole database.
+
+The snapshot also counts how often the metadata of each class is requested, so the
+most used classes can be prefetched when a server starts.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from pydantic import ValidationError
+
+# Use absolute imports instead of relative imports
+from cs_mcp_server.utils import CacheClassDescriptionData
+
+# Logger for this module
+logger = logging.getLogger("MetadataSnapshot")
+
+# Version of the snapshot layout. Snapshots written with another version are discarded.
+SCHEMA_VERSION = 1
+
+# Default maximum age in seconds of snapshot entries (one day)
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS root_classes (
+    scope TEXT NOT NULL,
+    root_class TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (scope, root_class)
+);
+CREATE TABLE IF NOT EXISTS classes (
+    scope TEXT NOT NULL,
+    root_class TEXT NOT NULL,
+    symbolic_name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (scope, root_class, symbolic_name)
+);
+CREATE TABLE IF NOT EXISTS class_usage (
+    scope TEXT NOT NULL,
+    root_class TEXT NOT NULL,
+    symbolic_name TEXT NOT NULL,
+    uses INTEGER NOT NULL,
+    PRIMARY KEY (scope, root_class, symbolic_name)
+);
+"""
+
+
+class RestoredCatalog(NamedTuple):
+    """A root class catalog read from the snapshot."""
+
+    saved_at: float
+    classes: Dict[str, CacheClassDescriptionData]
+    # Time the property descriptions of each class were loaded, for classes restored with them
+    class_saved_at: Dict[str, float]
+
+
+class MetadataSnapshot:
+    """
+    SQLite store for the class catalogs and property descriptions of one object store.
+
+    All methods are safe to call from several threads. Database errors are logged and
+    otherwise ignored: the snapshot only ever saves round trips, so a failure to read
+    or write it must not fail a tool call.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        server_url: str,
+        object_store: str,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        """
+        Open or create the snapshot database.
+
+        Args:
+            path: Path of the SQLite database file
+            server_url: The GraphQL server URL the metadata belongs to
+            object_store: The object store the metadata belongs to
+            max_age: Maximum age in seconds of entries that are restored
+        """
+        self.path = os.path.expanduser(path)
+        self.scope = f"{server_url}|{object_store}"
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.roots_loaded = 0
+        self.roots_stale = 0
+        self.classes_loaded = 0
+        self.write_count = 0
+        self.error_count = 0
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._initialize_schema()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(
+                "Metadata cache snapshot %s is unavailable: %s", self.path, str(e)
+            )
+            self._close_connection()
+
+    @property
+    def available(self) -> bool:
+        """Whether the database could be opened."""
+        return self._conn is not None
+
+    def _initialize_schema(self) -> None:
+        """Create the tables, discarding a snapshot written with another schema version."""
+        assert self._conn is not None
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is not None and row[0] == str(SCHEMA_VERSION):
+                return
+            if row is not None:
+                logger.info(
+                    "Discarding metadata cache snapshot with schema version %s",
+                    row[0],
+                )
+            self._conn.execute("DELETE FROM root_classes")
+            self._conn.execute("DELETE FROM classes")
+            self._conn.execute("DELETE FROM class_usage")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+
+    def _close_connection(self) -> None:
+        """Close the database connection, if open."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+
+    def _is_fresh(self, saved_at: float, now: float) -> bool:
+        """Check whether an entry written at saved_at may still be used."""
+        return self.max_age <= 0 or now - saved_at <= self.max_age
+
+    def load_root(self, root_class: str) -> Optional[RestoredCatalog]:
+        """
+        Read the catalog of a root class.
+
+        Args:
+            root_class: The root class name
+
+        Returns:
+            The catalog with the time it was saved, or None if there is no fresh catalog
+        """
+        if self._conn is None:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT saved_at FROM root_classes WHERE scope = ? AND root_class = ?",
+                    (self.scope, root_class),
+                ).fetchone()
+                if row is None:
+                    return None
+                if not self._is_fresh(row[0], now):
+                    self.roots_stale += 1
+                    logger.debug("Metadata cache snapshot of %s is stale", root_class)
+                    return None
+                rows = self._conn.execute(
+                    "SELECT symbolic_name, data, saved_at FROM classes "
+                    "WHERE scope = ? AND root_class = ?",
+                    (self.scope, root_class),
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.error_count += 1
+            logger.warning("Failed to read metadata cache snapshot: %s", str(e))
+            return None
+
+        classes: Dict[str, CacheClassDescriptionData] = {}
+        class_saved_at: Dict[str, float] = {}
+        for symbolic_name, data, saved_at in rows:
+            try:
+                class_data = CacheClassDescriptionData.model_validate_json(data)
+            except ValidationError:
+                continue
+            if not self._is_fresh(saved_at, now):
+                # Keep the catalog entry but reload the properties on first use
+                class_data.property_descriptions = []
+                class_data.name_property_symbolic_name = None
+            elif class_data.property_descriptions:
+                class_saved_at[symbolic_name] = saved_at
+            classes[symbolic_name] = class_data
+
+        self.roots_loaded += 1
+        self.classes_loaded += len(classes)
+        logger.info(
+            "Restored %d classes of %s from the metadata cache snapshot",
+            len(classes),
+            root_class,
+        )
+        return RestoredCatalog(row[0], classes, class_saved_at)
+
+    def save_root(
+        self,
+        root_class: str,
+        classes: Dict[str, CacheClassDescriptionData],
+        class_saved_at: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """
+        Replace the catalog of a root class.
+
+        Classes given without property descriptions keep the property descriptions
+        already saved for them, such as classes whose property descriptions were
+        evicted from memory; only their catalog fields are updated.
+
+        Args:
+            root_class: The root class name
+            classes: The class data by symbolic name
+            class_saved_at: Time the property descriptions of each class were loaded,
+                for classes whose properties are older than the catalog
+        """
+        if self._conn is None:
+            return
+        now = time.time()
+        class_saved_at = class_saved_at or {}
+        try:
+            with self._lock, self._conn:
+                saved = {
+                    name: (data, saved_at)
+                    for name, data, saved_at in self._conn.execute(
+                        "SELECT symbolic_name, data, saved_at FROM classes "
+                        "WHERE scope = ? AND root_class = ?",
+                        (self.scope, root_class),
+                    )
+                }
+                rows = [
+                    self._catalog_row(
+                        root_class,
+                        name,
+                        class_data,
+                        saved.get(name),
+                        class_saved_at,
+                        now,
+                    )
+                    for name, class_data in classes.items()
+                ]
+                self._conn.execute(
+                    "DELETE FROM classes WHERE scope = ? AND root_class = ?",
+                    (self.scope, root_class),
+                )
+                self._conn.executemany(
+                    "INSERT INTO classes (scope, root_class, symbolic_name, data, saved_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO root_classes (scope, root_class, saved_at) "
+                    "VALUES (?, ?, ?)",
+                    (self.scope, root_class, now),
+                )
+            self.write_count += 1
+        except sqlite3.Error as e:
+            self.error_count += 1
+            logger.warning("Failed to write metadata cache snapshot: %s", str(e))
+
+    def _catalog_row(
+        self,
+        root_class: str,
+        name: str,
+        class_data: CacheClassDescriptionData,
+        saved: Optional[Tuple[str, float]],
+        class_saved_at: Mapping[str, float],
+        now: float,
+    ) -> Tuple[str, str, str, str, float]:
+        """Build the row of a class, keeping the saved property descriptions if it has none."""
+        if not class_data.property_descriptions and saved is not None:
+            data = json.loads(saved[0])
+            if data.get("property_descriptions"):
+                data.update(
+                    class_data.model_dump(
+                        include={"symbolic_name", "display_name", "descriptive_text"}
+                    )
+                )
+                return (self.scope, root_class, name, json.dumps(data), saved[1])
+        return (
+            self.scope,
+            root_class,
+            name,
+            class_data.model_dump_json(),
+            class_saved_at.get(name, now),
+        )
+
+    def save_classes(
+        self, root_class: str, classes: Iterable[CacheClassDescriptionData]
+    ) -> None:
+        """
+        Insert or update classes of a root class catalog.
+
+        Args:
+            root_class: The root class name
+            classes: The class data to write
+        """
+        self.save_classes_of_roots((root_class, class_data) for class_data in classes)
+
+    def save_classes_of_roots(
+        self, classes: Iterable[Tuple[str, CacheClassDescriptionData]]
+    ) -> None:
+        """
+        Insert or update classes of any root class catalogs in one transaction.
+
+        Args:
+            classes: (root class name, class data) tuples to write
+        """
+        if self._conn is None:
+            return
+        now = time.time()
+        rows = [
+            (
+                self.scope,
+                root_class,
+                class_data.symbolic_name,
+                class_data.model_dump_json(),
+                now,
+            )
+            for root_class, class_data in classes
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO classes "
+                    "(scope, root_class, symbolic_name, data, saved_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self.write_count += 1
+        except sqlite3.Error as e:
+            self.error_count += 1
+            logger.warning("Failed to write metadata cache snapshot: %s", str(e))
+
+    def add_usage(self, counts: Mapping[Tuple[str, str], int]) -> None:
+        """
+        Add to the number of times the metadata of classes was requested.
+
+        Args:
+            counts: Number of new requests by (root class, class name)
+        """
+        if self._conn is None or not counts:
+            return
+        rows = [
+            (self.scope, root_class, class_name, uses)
+            for (root_class, class_name), uses in counts.items()
+        ]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO class_usage (scope, root_class, symbolic_name, uses) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (scope, root_class, symbolic_name) "
+                    "DO UPDATE SET uses = uses + excluded.uses",
+                    rows,
+                )
+            self.write_count += 1
+        except sqlite3.Error as e:
+            self.error_count += 1
+            logger.warning("Failed to write metadata cache snapshot: %s", str(e))
+
+    def most_used(self, limit: int) -> List[Tuple[str, str, int]]:
+        """
+        Get the classes whose metadata was requested most often.
+
+        Args:
+            limit: Maximum number of classes to return
+
+        Returns:
+            (root class, class name, uses) tuples, most used first
+        """
+        if self._conn is None or limit <= 0:
+            return []
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT root_class, symbolic_name, uses FROM class_usage "
+                    "WHERE scope = ? ORDER BY uses DESC, symbolic_name LIMIT ?",
+                    (self.scope, limit),
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.error_count += 1
+            logger.warning("Failed to read metadata cache snapshot: %s", str(e))
+            return []
+
+    def clear(self) -> None:
+        """Remove every entry of this server and object store."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM classes WHERE scope = ?", (self.scope,))
+                self._conn.execute(
+                    "DELETE FROM root_classes WHERE scope = ?", (self.scope,)
+                )
+        except sqlite3.Error as e:
+            self.error_count += 1
+            logger.warning("Failed to clear metadata cache snapshot: %s", str(e))
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._close_connection()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get snapshot statistics.
+
+        Returns:
+            A dictionary with load and write counters
+        """
+        return {
+            "path": self.path,
+            "available": self.available,
+            "roots_loaded": self.roots_loaded,
+            "roots_stale": self.roots_stale,
+            "classes_loaded": self.classes_loaded,
+            "writes": self.write_count,
+            "errors": self.error_count,
+        }
@@ -0,0 +1,120 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Startup warm-up of the metadata cache.
+
+The warm-up loads the class catalogs of all root classes concurrently, then
+optionally prefetches the property descriptions of the classes whose metadata was
+requested most often. It runs in the background once the server has started; tools
+needing a root class that is still loading wait for the warm-up's load of it instead
+of loading it a second time.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+from cs_mcp_server.cache.metadata import ROOT_CLASS_TYPES, MetadataCache
+from cs_mcp_server.cache.metadata_loader import (
+    DEFAULT_CLASS_BATCH_SIZE,
+    get_root_class_description_tool_async,
+    load_class_metadata_bulk,
+)
+from cs_mcp_server.utils.common import ToolError
+
+# Logger for this module
+logger = logging.getLogger("MetadataWarmup")
+
+
+async def warm_up_metadata(
+    graphql_client,
+    metadata_cache: MetadataCache,
+    prefetch_classes: int = 0,
+    root_classes: Iterable[str] = ROOT_CLASS_TYPES,
+    batch_size: int = DEFAULT_CLASS_BATCH_SIZE,
+) -> None:
+    """
+    Load the class catalogs of all root classes, then prefetch the most used classes.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        metadata_cache: The metadata cache to fill
+        prefetch_classes: Number of most used classes whose property descriptions
+            are prefetched (0 disables prefetching)
+        root_classes: The root classes to load
+        batch_size: Number of classes whose property descriptions are requested in
+            one query when prefetching
+    """
+    start = time.monotonic()
+    loads = {}
+    for root_class in root_classes:
+        load = asyncio.ensure_future(
+            get_root_class_description_tool_async(
+                graphql_client, root_class, metadata_cache
+            )
+        )
+        loads[root_class] = load
+
+    results = await asyncio.gather(*loads.values(), return_exceptions=True)
+    for root_class, result in zip(loads, results):
+        if isinstance(result, (ToolError, Exception)):
+            message = result.message if isinstance(result, ToolError) else result
+            logger.warning("Warm-up of root class %s failed: %s", root_class, message)
+    logger.info("Loaded %d root classes in %.2fs", len(loads), time.monotonic() - start)
+
+    if prefetch_classes > 0:
+        await prefetch_class_metadata(
+            graphql_client, metadata_cache, prefetch_classes, batch_size
+        )
+
+
+async def prefetch_class_metadata(
+    graphql_client,
+    metadata_cache: MetadataCache,
+    limit: int,
+    batch_size: int = DEFAULT_CLASS_BATCH_SIZE,
+) -> None:
+    """
+    Load the property descriptions of the most used classes that don't have them yet.
+
+    Args:
+        graphql_client: The GraphQL client to use for queries
+        metadata_cache: The metadata cache to fill
+        limit: Number of most used classes to consider
+        batch_size: Number of classes whose property descriptions are requested in
+            one query
+    """
+    start = time.monotonic()
+    classes = [
+        (root_class, class_name)
+        for root_class, class_name in metadata_cache.most_used_classes(limit)
+        if metadata_cache.get_class_data(root_class, class_name) is not None
+        and not metadata_cache.has_class_properties(root_class, class_name)
+    ]
+    if not classes:
+        return
+
+    results = await load_class_metadata_bulk(
+        graphql_client, metadata_cache, classes, batch_size
+    )
+    for class_name, result in results.items():
+        if isinstance(result, ToolError):
+            logger.warning(
+                "Prefetch of class %s failed: %s", class_name, result.message
+            )
+    logger.info(
+        "Prefetched %d classes in %.2fs", len(classes), time.monotonic() - start
+    )
@@ -0,0 +1,740 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parallel ranged downloads for the GraphQL client.
+
+A download starts with a probe request for the first part of the content
+(``Range: bytes=0-<part_size - 1>``). If the server answers 206 Partial Content,
+the total size is taken from the Content-Range header, the target file is
+preallocated, and the remaining parts are fetched by several concurrent range
+requests. If the server answers 200 it doesn't support ranges, and the content
+is streamed over the probe connection instead. Empty content has no byte to
+satisfy the range, so a 416 answer to the probe is followed by a plain request.
+
+Downloads are resumable. Content is written to ``<file>.part`` and the bytes
+received for every range are recorded in a ``<file>.part.json`` sidecar. A retry,
+or a later download of the same content, only requests the missing bytes
+(``Range: bytes=N-<end>``). The part file is renamed to its final name once
+complete, so a partially downloaded file never appears under the target name.
+
+All file I/O runs in worker threads so large downloads never block the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from urllib.parse import unquote
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from .graphql_client import GraphQLClient
+
+# Logger for this module
+logger = logging.getLogger("RangedDownloader")
+
+# Default number of concurrent range requests per download
+DEFAULT_DOWNLOAD_PARTS = 4
+
+# Default size in bytes of each range request (8 MiB)
+DEFAULT_DOWNLOAD_PART_SIZE = 8 * 1024 * 1024
+
+# Default size in bytes of the chunks read from the response stream (64 KiB)
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Amount of data buffered before handing a write to a worker thread (1 MiB)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Suffix of the file content is written to until the download completes
+PART_SUFFIX = ".part"
+
+# Suffix (added to the part file name) of the sidecar recording download progress
+PROGRESS_SUFFIX = ".json"
+
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+def filename_from_content_disposition(content_disposition: str) -> str:
+    """
+    Extract the file name from a content-disposition header.
+
+    Args:
+        content_disposition: The header value, for example
+            attachment; filename="Patient%20282142%20report.pdf";filename*=utf-8''Patient%20282142%20report.pdf
+
+    Returns:
+        The URL decoded file name
+
+    Raises:
+        Exception: If the header is missing or doesn't contain a file name
+    """
+    match = (
+        re.search(r'filename="([^"]+)"', content_disposition)
+        if content_disposition
+        else None
+    )
+    if not match:
+        raise Exception(
+            f"Content-disposition header missing or invalid: {content_disposition}"
+        )
+    return unquote(match.group(1))
+
+
+def parse_content_range(content_range: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a Content-Range header.
+
+    Args:
+        content_range: The header value, for example "bytes 0-1023/4096"
+
+    Returns:
+        A tuple of first byte, last byte and total size, or None if the header is
+        missing or doesn't include the total size
+    """
+    match = _CONTENT_RANGE_PATTERN.match(content_range or "")
+    if not match or match.group(3) == "*":
+        return None
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+
+class ContentChangedError(aiohttp.ClientPayloadError):
+    """Raised when the content changes on the server while it is being downloaded."""
+
+
+def content_validator(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Get the value identifying the version of the content from response headers.
+
+    Args:
+        headers: The response headers
+
+    Returns:
+        The ETag, or the Last-Modified date if there is no ETag, or None
+    """
+    return headers.get("ETag") or headers.get("Last-Modified")
+
+
+def _open_at(file_path: str, mode: str, offset: int) -> BinaryIO:
+    """Open a file and position it at an offset."""
+    f = open(file_path, mode)
+    f.seek(offset)
+    return f
+
+
+class DownloadProgress:
+    """
+    Progress of a resumable download, persisted next to its part file.
+
+    The content is divided into segments. Each segment is a list of its first byte,
+    its last byte (None if the total size is unknown) and the next byte to
+    download, so the bytes from the first byte up to the next byte are on disk.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        url: str,
+        total: Optional[int],
+        validator: Optional[str],
+        segments: List[List[Optional[int]]],
+    ):
+        """
+        Initialize the download progress.
+
+        Args:
+            file_path: The final path of the downloaded file
+            url: The download URL
+            total: The total size of the content, if known
+            validator: The ETag or Last-Modified value of the content, if any
+            segments: The segments as [first byte, last byte, next byte] lists
+        """
+        self.file_path = file_path
+        self.url = url
+        self.total = total
+        self.validator = validator
+        self.segments = segments
+        self._lock = threading.Lock()
+
+    @property
+    def part_path(self) -> str:
+        """The path content is written to until the download completes."""
+        return self.file_path + PART_SUFFIX
+
+    @property
+    def progress_path(self) -> str:
+        """The path of the sidecar recording the progress."""
+        return self.part_path + PROGRESS_SUFFIX
+
+    @classmethod
+    def create(
+        cls,
+        file_path: str,
+        url: str,
+        total: Optional[int],
+        validator: Optional[str],
+        part_size: Optional[int] = None,
+    ) -> "DownloadProgress":
+        """
+        Create the progress of a new download.
+
+        Args:
+            file_path: The final path of the downloaded file
+            url: The download URL
+            total: The total size of the content, if known
+            validator: The ETag or Last-Modified value of the content, if any
+            part_size: Size of each segment, or None for a single segment
+
+        Returns:
+            The download progress
+        """
+        if total is None or not part_size:
+            segments = [[0, total - 1 if total is not None else None, 0]]
+        else:
+            segments = [
+                [start, min(start + part_size, total) - 1, start]
+                for start in range(0, total, part_size)
+            ] or [[0, -1, 0]]
+        return cls(file_path, url, total, validator, segments)
+
+    @classmethod
+    def load(
+        cls,
+        file_path: str,
+        url: str,
+        total: Optional[int],
+        validator: Optional[str],
+    ) -> Optional["DownloadProgress"]:
+        """
+        Load the progress of an earlier attempt to download the same content.
+
+        The progress is only reused if it was recorded for the same URL, size and
+        validator (ETag or Last-Modified), and the part file still exists.
+
+        Returns:
+            The recorded progress, or None if there is nothing to resume
+        """
+        progress_path = file_path + PART_SUFFIX + PROGRESS_SUFFIX
+        try:
+            with open(progress_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            validator is None
+            or data.get("url") != url
+            or data.get("total") != total
+            or data.get("validator") != validator
+            or not os.path.exists(file_path + PART_SUFFIX)
+        ):
+            return None
+        segments = data.get("segments")
+        if not isinstance(segments, list) or not segments:
+            return None
+        return cls(file_path, url, total, validator, segments)
+
+    @property
+    def received(self) -> int:
+        """The number of bytes on disk."""
+        return sum(next_byte - start for start, _, next_byte in self.segments)
+
+    @property
+    def resumable(self) -> bool:
+        """Whether part of the content is on disk and a validator identifies it."""
+        return self.received > 0 and self.validator is not None
+
+    def missing(self) -> List[Tuple[int, int, Optional[int]]]:
+        """
+        Get the byte ranges that still need to be downloaded.
+
+        Returns:
+            A list of (segment index, next byte, last byte) tuples
+        """
+        return [
+            (index, next_byte, end)
+            for index, (start, end, next_byte) in enumerate(self.segments)
+            if end is None or next_byte <= end
+        ]
+
+    def advance(self, index: int, count: int) -> None:
+        """
+        Record bytes written to a segment and persist the progress.
+
+        Args:
+            index: The segment index
+            count: The number of bytes written after the segment's next byte
+        """
+        with self._lock:
+            self.segments[index][2] += count
+            self._save()
+
+    def save(self) -> None:
+        """Persist the progress to the sidecar file."""
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        """Write the sidecar atomically. Caller holds the lock."""
+        data = {
+            "url": self.url,
+            "total": self.total,
+            "validator": self.validator,
+            "segments": self.segments,
+        }
+        temporary_path = self.progress_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, self.progress_path)
+
+    def complete(self) -> None:
+        """Move the part file to its final name and remove the sidecar."""
+        os.replace(self.part_path, self.file_path)
+        self._remove(self.progress_path)
+
+    def discard(self) -> None:
+        """Remove the part file and the sidecar."""
+        self._remove(self.part_path)
+        self._remove(self.progress_path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _prepare_part_file(progress: DownloadProgress, resume: bool) -> None:
+    """Create (or keep, when resuming) the part file and persist the progress."""
+    if not resume:
+        with open(progress.part_path, "wb") as f:
+            if progress.total is not None:
+                f.truncate(progress.total)
+    progress.save()
+
+
+def _write_and_record(
+    f: BinaryIO, data: bytes, progress: DownloadProgress, index: int
+) -> None:
+    """Write data to the part file, then record it in the download progress."""
+    f.write(data)
+    f.flush()
+    progress.advance(index, len(data))
+
+
+def write_stream(
+    chunks: Iterable[bytes], f: BinaryIO, progress: DownloadProgress, index: int
+) -> int:
+    """
+    Write a stream of chunks to the part file, recording progress as it goes.
+
+    Chunks are buffered so the progress sidecar is only updated about once per
+    megabyte. Data received before the stream fails is still written and recorded.
+
+    Args:
+        chunks: The chunks to write
+        f: The part file, positioned at the segment's next byte
+        progress: The download progress
+        index: The segment the chunks belong to
+
+    Returns:
+        The number of bytes written
+    """
+    written = 0
+    buffer = bytearray()
+    try:
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                _write_and_record(f, bytes(buffer), progress, index)
+                written += len(buffer)
+                buffer.clear()
+    finally:
+        if buffer:
+            _write_and_record(f, bytes(buffer), progress, index)
+            written += len(buffer)
+    return written
+
+
+class DownloadJob:
+    """
+    State of a download kept across retry attempts.
+
+    Once the first response has been received, the job knows the target file and
+    which bytes are on disk, so a retry only requests the missing bytes.
+    """
+
+    def __init__(self, url: str, download_folder_path: str):
+        """
+        Initialize the job.
+
+        Args:
+            url: The download URL
+            download_folder_path: The folder where the file is saved
+        """
+        self.url = url
+        self.download_folder_path = download_folder_path
+        self.progress: Optional[DownloadProgress] = None
+
+
+class RangedDownloader:
+    """
+    Downloads content with concurrent range requests, writing from worker threads.
+    """
+
+    def __init__(
+        self,
+        client: "GraphQLClient",
+        parts: int = DEFAULT_DOWNLOAD_PARTS,
+        part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ):
+        """
+        Initialize the downloader.
+
+        Args:
+            client: The GraphQL client whose session, limiter and settings are used
+            parts: Number of concurrent range requests per download
+            part_size: Size in bytes of each range request
+            chunk_size: Size in bytes of the chunks read from the response stream
+        """
+        self._client = client
+        self.parts = max(1, parts)
+        self.part_size = max(1, part_size)
+        self.chunk_size = max(1, chunk_size)
+
+    def _request_kwargs(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the aiohttp request arguments shared by all requests of a download."""
+        return {
+            "cookies": request.get("cookies"),
+            "auth": request.get("auth"),
+            "timeout": aiohttp.ClientTimeout(total=self._client.timeout),
+            "ssl": False if self._client.ssl_enabled == False else None,
+        }
+
+    async def download(
+        self,
+        session: aiohttp.ClientSession,
+        job: DownloadJob,
+        request: Dict[str, Any],
+    ) -> str:
+        """
+        Download content into a folder, using parallel range requests when possible.
+
+        Calling this again with the same job after a failure resumes the download.
+
+        Args:
+            session: The aiohttp session
+            job: The download job
+            request: The headers, cookies and auth of the request
+
+        Returns:
+            The path of the downloaded file
+
+        Raises:
+            Exception: If the download fails
+        """
+        if job.progress is None or not job.progress.resumable:
+            await self._probe(session, job, request)
+
+        progress = job.progress
+        missing = progress.missing()
+        if missing:
+            logger.debug(
+                "Downloading %d missing ranges of %s with %d workers",
+                len(missing),
+                progress.file_path,
+                min(self.parts, len(missing)),
+            )
+            try:
+                await self._download_ranges(session, request, progress, missing)
+            except ContentChangedError:
+                # The bytes on disk belong to another version; start over on retry
+                await asyncio.to_thread(progress.discard)
+                job.progress = None
+                raise
+
+        await asyncio.to_thread(progress.complete)
+        job.progress = None
+        return progress.file_path
+
+    async def _probe(
+        self,
+        session: aiohttp.ClientSession,
+        job: DownloadJob,
+        request: Dict[str, Any],
+    ) -> None:
+        """
+        Request the first part of the content and set up the progress of the job.
+
+        If the server ignores the range, the whole content is downloaded here.
+        """
+        headers = dict(request.get("headers") or {})
+        headers["Range"] = f"bytes=0-{self.part_size - 1}"
+        if await self._probe_with(session, job, request, headers):
+            return
+
+        # Range Not Satisfiable: the content is empty (Content-Range: bytes */0),
+        # so request it whole
+        logger.debug("Range not satisfiable, downloading %s without range", job.url)
+        del headers["Range"]
+        await self._probe_with(session, job, request, headers)
+
+    async def _probe_with(
+        self,
+        session: aiohttp.ClientSession,
+        job: DownloadJob,
+        request: Dict[str, Any],
+        headers: Dict[str, str],
+    ) -> bool:
+        """
+        Send the probe request and set up the progress of the job from its response.
+
+        Returns:
+            False if the server answered a range request with 416 Range Not
+            Satisfiable, True otherwise
+        """
+        async with (
+            self._client.limiter.limit_async() as permit,
+            session.get(
+                url=job.url, headers=headers, **self._request_kwargs(request)
+            ) as response,
+        ):
+            permit.record(response.status)
+            if response.status == 416 and "Range" in headers:
+                return False
+            await self._check_status(response, (200, 206))
+
+            filename = filename_from_content_disposition(
+                response.headers.get("content-disposition", "")
+            )
+            file_path = os.path.join(job.download_folder_path, filename)
+            validator = content_validator(response.headers)
+
+            if response.status == 200:
+                # Ranges not supported: stream the whole content over this connection.
+                # A compressed body is decompressed as it is read, so its
+                # Content-Length is not the size of the content.
+                logger.debug("Server does not support ranges, downloading %s", job.url)
+                total = (
+                    None
+                    if response.headers.get("Content-Encoding")
+                    else response.content_length
+                )
+                progress = DownloadProgress.create(file_path, job.url, total, None)
+                job.progress = progress
+                await asyncio.to_thread(_prepare_part_file, progress, False)
+                written = await self._write_stream(response, progress, 0, 0)
+                if progress.total is not None:
+                    self._check_length(written, progress.total)
+                # Mark the single segment as complete now that its size is known
+                progress.segments[0][1] = written - 1
+                return True
+
+            content_range = parse_content_range(response.headers.get("Content-Range"))
+            if content_range is None:
+                raise Exception(
+                    f"Invalid Content-Range header: {response.headers.get('Content-Range')}"
+                )
+            total = content_range[2]
+
+            progress = await asyncio.to_thread(
+                DownloadProgress.load, file_path, job.url, total, validator
+            )
+            resume = progress is not None
+            if resume:
+                logger.info(
+                    "Resuming download of %s at %d of %d bytes",
+                    file_path,
+                    progress.received,
+                    total,
+                )
+            else:
+                progress = DownloadProgress.create(
+                    file_path, job.url, total, validator, self.part_size
+                )
+            job.progress = progress
+            await asyncio.to_thread(_prepare_part_file, progress, resume)
+
+            # The probe body is the start of the first segment. Skip the bytes
+            # already on disk from an earlier attempt, and write only what belongs to
+            # the first segment: a resumed download may have been divided with
+            # another part size. The rest of the segment is fetched with the others.
+            start, end, next_byte = progress.segments[0]
+            last = min(content_range[1], end)
+            if next_byte <= last:
+                try:
+                    await response.content.readexactly(next_byte - start)
+                except asyncio.IncompleteReadError as e:
+                    raise aiohttp.ClientPayloadError(
+                        f"Received {len(e.partial)} bytes, expected {e.expected}"
+                    ) from e
+                written = await self._write_stream(
+                    response, progress, 0, next_byte, last + 1 - next_byte
+                )
+                self._check_length(written, last + 1 - next_byte)
+        return True
+
+    async def _download_ranges(
+        self,
+        session: aiohttp.ClientSession,
+        request: Dict[str, Any],
+        progress: DownloadProgress,
+        missing: List[Tuple[int, int, Optional[int]]],
+    ) -> None:
+        """Fetch missing byte ranges concurrently, cancelling the others if one fails."""
+        queue = list(reversed(missing))
+
+        async def worker():
+            while queue:
+                index, start, end = queue.pop()
+                await self._download_range(
+                    session, request, progress, index, start, end
+                )
+
+        tasks = [
+            asyncio.create_task(worker()) for _ in range(min(self.parts, len(missing)))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _download_range(
+        self,
+        session: aiohttp.ClientSession,
+        request: Dict[str, Any],
+        progress: DownloadProgress,
+        index: int,
+        start: int,
+        end: Optional[int],
+    ) -> None:
+        """Fetch one byte range and write it at its offset in the part file."""
+        headers = dict(request.get("headers") or {})
+        headers["Range"] = f"bytes={start}-{end if end is not None else ''}"
+        async with (
+            self._client.limiter.limit_async() as permit,
+            session.get(
+                url=progress.url, headers=headers, **self._request_kwargs(request)
+            ) as response,
+        ):
+            permit.record(response.status)
+            await self._check_status(response, (206,))
+
+            validator = content_validator(response.headers)
+            content_range = parse_content_range(response.headers.get("Content-Range"))
+            if (validator and validator != progress.validator) or (
+                content_range is None or content_range[0] != start
+            ):
+                raise ContentChangedError(
+                    f"Content changed during download of {progress.file_path}"
+                )
+
+            written = await self._write_stream(response, progress, index, start)
+            self._check_length(written, content_range[1] + 1 - start)
+
+    async def _check_status(
+        self, response: aiohttp.ClientResponse, expected: Tuple[int, ...]
+    ) -> None:
+        """Raise if the response status is not one of the expected ones."""
+        if response.status in expected:
+            return
+        error_text = await response.text()
+        self._client._raise_for_overload(response, error_text)
+        raise Exception(
+            f"Request failed with status code: {response.status}. Response: {error_text}"
+        )
+
+    @staticmethod
+    def _check_length(written: int, expected: int) -> None:
+        """Raise a retryable error if a response body ended early."""
+        if written != expected:
+            raise aiohttp.ClientPayloadError(
+                f"Received {written} bytes, expected {expected}"
+            )
+
+    async def _write_stream(
+        self,
+        response: aiohttp.ClientResponse,
+        progress: DownloadProgress,
+        index: int,
+        offset: int,
+        length: Optional[int] = None,
+    ) -> int:
+        """
+        Write a response body into the part file from a worker thread.
+
+        Progress is recorded after every write, so the bytes received before a
+        failure are kept for the next attempt.
+
+        Args:
+            response: The response to read
+            progress: The download progress
+            index: The segment the body belongs to
+            offset: The position of the first byte of the body in the file
+            length: Maximum number of bytes to write; the rest of the body is left
+                unread
+
+        Returns:
+            The number of bytes written
+        """
+        f = await asyncio.to_thread(_open_at, progress.part_path, "r+b", offset)
+        written = 0
+        buffer = bytearray()
+        try:
+            try:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    if length is not None:
+                        chunk = chunk[: length - written - len(buffer)]
+                    buffer += chunk
+                    if length is not None and written + len(buffer) >= length:
+                        break
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        await asyncio.to_thread(
+                            _write_and_record, f, bytes(buffer), progress, index
+                        )
+                        written += len(buffer)
+                        buffer.clear()
+            except Exception:
+                # Keep what was received before the connection failed
+                if buffer:
+                    await asyncio.to_thread(
+                        _write_and_record, f, bytes(buffer), progress, index
+                    )
+                raise
+            if buffer:
+                await asyncio.to_thread(
+                    _write_and_record, f, bytes(buffer), progress, index
+                )
+                written += len(buffer)
+        finally:
+            await asyncio.to_thread(f.close)
+        return written
@@ -13,28 +13,50 @@
 # limitations under the License.
 
 import asyncio
+import contextlib
 from enum import verify
 import json
 import logging
 import mimetypes
 import os
 import os.path
-import re
 import ssl
 import time
 import truststore
 import urllib3
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Mapping, Optional, Union
-from urllib.parse import unquote
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple, Union
 
 import aiohttp
 import requests
 from aiohttp.helpers import BasicAuth
 
 from .csdeploy.gqlinvoke import GraphqlConnection, GraphqlRequest
+from .rate_limiter import OVERLOAD_STATUS_CODES, RequestLimiter
+from .download import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    DEFAULT_DOWNLOAD_PART_SIZE,
+    DEFAULT_DOWNLOAD_PARTS,
+    DownloadJob,
+    DownloadProgress,
+    RangedDownloader,
+    content_validator,
+    filename_from_content_disposition,
+    parse_content_range,
+    write_stream,
+)
+from .graphql_parser import is_read_only
+from .request_batcher import DEFAULT_MAX_BATCH_SIZE, RequestBatcher
+from .response_cache import (
+    DEFAULT_MAX_BYTES,
+    InMemoryResponseCache,
+    ResponseCache,
+    ResponseCachePolicy,
+)
+from .singleflight import SingleFlight
 from .ssl_adapter import SSLAdapter
+from .token_manager import TokenManager
 
 # Logger for this module
 logger = logging.getLogger("GraphQLClient")
@@ -67,6 +89,39 @@ class GraphQLClient(GraphqlConnection):
         retry_delay: float = 1.0,  # Initial delay between retries in seconds
         keepalive_timeout: float = 1800.0,  # Default to 30 minutes
         force_close: bool = False,  # Whether to force close connections
+        max_requests_per_second: Optional[
+            float
+        ] = None,  # Sustained request rate limit (None = unlimited)
+        request_burst: Optional[
+            int
+        ] = None,  # Maximum burst size allowed by the rate limit
+        max_concurrent_requests: Optional[
+            int
+        ] = None,  # Upper bound of the adaptive concurrency window (defaults to pool_connections)
+        min_concurrent_requests: int = 1,  # Lower bound of the adaptive concurrency window
+        initial_concurrent_requests: int = 10,  # Starting size of the adaptive concurrency window
+        target_latency: Optional[
+            float
+        ] = 5.0,  # Smoothed latency in seconds above which the concurrency window shrinks
+        batch_window_ms: Optional[
+            float
+        ] = None,  # Window in milliseconds for coalescing async queries (None = no batching)
+        batch_max_size: int = DEFAULT_MAX_BATCH_SIZE,  # Maximum number of queries merged into one request
+        download_parts: int = DEFAULT_DOWNLOAD_PARTS,  # Number of concurrent range requests per async download
+        download_part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,  # Size in bytes of each range request
+        download_chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,  # Size in bytes of chunks read from download streams
+        max_concurrent_uploads: int = 4,  # Maximum number of file uploads sent at the same time
+        deduplicate_requests: bool = True,  # Whether identical in-flight async queries share one request
+        response_cache_ttl: Optional[
+            float
+        ] = None,  # Default TTL in seconds of cached query responses (None = no response cache)
+        response_cache_max_bytes: int = DEFAULT_MAX_BYTES,  # Memory budget of the response cache
+        response_cache_operation_ttls: Optional[
+            Dict[str, float]
+        ] = None,  # TTL in seconds per operation name, overriding response_cache_ttl
+        response_cache: Optional[
+            ResponseCache
+        ] = None,  # Custom response cache backend (defaults to an in-memory LRU cache)
         # ZEN/IAM specific parameters: optional, configure only if GraphQLClient needs to talk to CPE in Cloud Pak.
         # ZEN is an IBM CP4BA front door where all IBM CloudPak services are secured. Zen frontdoor can use IAM for backend
         # authentication. To accomplish this, the front door would redirect the login to IAM. Once the IAM token is retrieved, one would
@@ -133,6 +188,23 @@ class GraphQLClient(GraphqlConnection):
             retry_delay: Initial delay between retries in seconds
             keepalive_timeout: Time in seconds to keep idle connections alive (None = keep forever)
             force_close: Whether to force close connections after each request
+            max_requests_per_second: Sustained request rate limit shared by all requests (None = unlimited)
+            request_burst: Maximum number of requests allowed in a burst by the rate limit
+            max_concurrent_requests: Upper bound of the adaptive concurrency window (defaults to pool_connections)
+            min_concurrent_requests: Lower bound of the adaptive concurrency window
+            initial_concurrent_requests: Starting size of the adaptive concurrency window
+            target_latency: Smoothed latency in seconds above which the concurrency window shrinks (None = ignore latency)
+            batch_window_ms: Window in milliseconds during which async queries are collected and merged into one request (None = no batching)
+            batch_max_size: Maximum number of queries merged into one request
+            download_parts: Number of concurrent range requests used by async downloads
+            download_part_size: Size in bytes of each range request used by async downloads
+            download_chunk_size: Size in bytes of the chunks read from download response streams
+            max_concurrent_uploads: Maximum number of async multipart file uploads sent at the same time
+            deduplicate_requests: Whether identical read-only async queries already in flight share one request
+            response_cache_ttl: Default TTL in seconds of cached read-only query responses (None = no response cache)
+            response_cache_max_bytes: Maximum total size in bytes of the responses kept by the in-memory response cache
+            response_cache_operation_ttls: TTL in seconds per operation name (0 disables caching for that operation)
+            response_cache: Custom response cache backend used instead of the in-memory LRU cache
             ZenIAM_iam_url: Optional[str] = None,  # IAM url to send user/pwd or client_id/client_secret to IAM to get back IAM token, for example: <iam_host_route>/idprovider/v1/auth/identitytoken
             ZenIAM_iam_ssl_enabled: Union[bool, str] = True,  # enforce SSL checking of server cert on IAM route or path to certificate file
             ZenIAM_iam_grant_type: Optional[str] = None,  # value passed to IAM url to get back an IAM token. Supported values: 'password'
@@ -161,9 +233,47 @@ class GraphQLClient(GraphqlConnection):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
 
-        # Track last request time for rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms minimum between requests
+        # Shared rate and adaptive concurrency limiter for all requests
+        self.limiter = RequestLimiter(
+            rate=max_requests_per_second,
+            burst=request_burst,
+            initial_concurrency=initial_concurrent_requests,
+            min_concurrency=min_concurrent_requests,
+            max_concurrency=max_concurrent_requests or pool_connections,
+            target_latency=target_latency,
+        )
+
+        # Single-flight async token refresh with proactive background renewal
+        self.token_manager = TokenManager(self)
+
+        # Parallel ranged downloads for async content downloads
+        self.downloader = RangedDownloader(
+            self,
+            parts=download_parts,
+            part_size=download_part_size,
+            chunk_size=download_chunk_size,
+        )
+
+        # Bound the number of concurrent async file uploads
+        self._upload_semaphore = asyncio.Semaphore(max(1, max_concurrent_uploads))
+
+        # Opt-in coalescing of async queries sent close together
+        self.batcher = (
+            RequestBatcher(
+                send=self._execute_async_request,
+                window=batch_window_ms / 1000,
+                max_batch_size=batch_max_size,
+            )
+            if batch_window_ms
+            else None
+        )
+
+        # Deduplication of identical read-only queries already in flight
+        self.singleflight = (
+            SingleFlight(send=self._execute_async_batched)
+            if deduplicate_requests
+            else None
+        )
 
         # Initialize parent class with required parameters
         kwargs = {
@@ -179,6 +289,19 @@ class GraphQLClient(GraphqlConnection):
 
         self.object_store = object_store
 
+        # Opt-in TTL cache of read-only query responses, invalidated by mutations
+        self.response_cache = (
+            ResponseCachePolicy(
+                cache=response_cache
+                or InMemoryResponseCache(max_bytes=response_cache_max_bytes),
+                default_ttl=response_cache_ttl or 0,
+                operation_ttls=response_cache_operation_ttls,
+                object_store=object_store,
+            )
+            if response_cache_ttl or response_cache_operation_ttls or response_cache
+            else None
+        )
+
         # Initialize with OAuth if OAuth parameters are provided
         if ZenIAM_zen_url:
             zeniam_params = {
@@ -402,10 +525,49 @@ class GraphQLClient(GraphqlConnection):
         query: str,
         variables: Optional[Dict[str, Any]] = None,
         file_paths: Optional[Dict[str, str]] = None,
+        cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Execute a GraphQL query synchronously with retry logic.
 
+        If the response cache is enabled, read-only queries are answered from the
+        cache when possible and mutations evict the cached responses they affect.
+
+        Args:
+            query: The GraphQL query string
+            variables: Optional variables for the query
+            file_paths: Optional dictionary mapping variable names to file paths for file uploads
+            cache: Whether a read-only query may be answered from the response cache; if False it is sent to the server, and its response still cached
+
+        Returns:
+            The query result as a dictionary
+        """
+        if self.response_cache is None:
+            return self._execute_request(query, variables, file_paths)
+
+        read_only = not file_paths and is_read_only(query)
+        generation = self.response_cache.generation
+        if read_only and cache:
+            cached = self.response_cache.lookup(query, variables)
+            if cached is not None:
+                return cached
+
+        result = self._execute_request(query, variables, file_paths)
+        if read_only:
+            self.response_cache.store(query, variables, result, generation)
+        else:
+            self._invalidate_for_mutation(variables, result)
+        return result
+
+    def _execute_request(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        file_paths: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a single GraphQL request synchronously with retry logic.
+
         Args:
             query: The GraphQL query string
             variables: Optional variables for the query
@@ -421,9 +583,6 @@ class GraphQLClient(GraphqlConnection):
             "timestamp": datetime.now().isoformat(),
         }
 
-        # Apply rate limiting
-        self._apply_rate_limiting(is_async=False)
-
         # Check if token needs to be refreshed
         token_refreshed = self._check_sync_token_refresh()
         if token_refreshed:
@@ -475,16 +634,20 @@ class GraphQLClient(GraphqlConnection):
                     # Determine whether to use secure or insecure session based on ssl_enabled flag
                     use_secure = self.ssl_enabled is not False
                     session = self._get_sync_session(use_secure=use_secure)
-                    response = session.post(
-                        url=self.url,
-                        headers=headers,
-                        cookies=cookies,
-                        auth=auth,  # pyright: ignore
-                        data=payload,
-                        files=files,
-                        timeout=self.timeout,
-                        verify=self.ssl_enabled if self.ssl_enabled else False,
-                    )
+                    with self.limiter.limit(
+                        timeout_exceptions=(requests.exceptions.Timeout,)
+                    ) as permit:
+                        response = session.post(
+                            url=self.url,
+                            headers=headers,
+                            cookies=cookies,
+                            auth=auth,  # pyright: ignore
+                            data=payload,
+                            files=files,
+                            timeout=self.timeout,
+                            verify=self.ssl_enabled if self.ssl_enabled else False,
+                        )
+                        permit.record(response.status_code)
 
                     # Close all file handles
                     for _, file_tuple in files:
@@ -519,15 +682,19 @@ class GraphQLClient(GraphqlConnection):
                     }
 
                     # Execute the request using the session with custom SSL adapter
-                    response = session.post(
-                        url=self.url,
-                        headers=headers,
-                        cookies=cookies,
-                        auth=auth,  # pyright: ignore
-                        json=json_payload,
-                        timeout=self.timeout,
-                        verify=self.ssl_enabled if self.ssl_enabled else False,
-                    )
+                    with self.limiter.limit(
+                        timeout_exceptions=(requests.exceptions.Timeout,)
+                    ) as permit:
+                        response = session.post(
+                            url=self.url,
+                            headers=headers,
+                            cookies=cookies,
+                            auth=auth,  # pyright: ignore
+                            json=json_payload,
+                            timeout=self.timeout,
+                            verify=self.ssl_enabled if self.ssl_enabled else False,
+                        )
+                        permit.record(response.status_code)
 
                     if response.status_code != 200:
                         raise Exception(
@@ -599,33 +766,134 @@ class GraphQLClient(GraphqlConnection):
         """
         Check if token needs to be refreshed and refresh it if necessary (async version).
 
+        The refresh is delegated to the token manager, which fetches the token with
+        aiohttp so the event loop is never blocked, and shares a single in-flight
+        refresh between all concurrent callers.
+
         Returns:
             bool: True if token was refreshed, False otherwise
         """
-        # Add a safety margin (10% of token_refresh time) to refresh tokens earlier
-        # This helps prevent 401 errors by refreshing tokens before they expire
-        safety_margin = self.token_refresh * 0.1 if self.token_refresh else 0
-
-        if (
-            self.token
-            and self.token_refresh
-            and self.token_fetched_time
-            and int((datetime.now() - self.token_fetched_time).total_seconds())
-            > (self.token_refresh - safety_margin)
-        ):
-            self.get_token()
-            return True
-        return False
+        return await self.token_manager.ensure_fresh()
 
     async def execute_async(
-        self, query: str, variables: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        file_paths: Optional[Dict[str, str]] = None,
+        cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Execute a GraphQL query asynchronously with improved error handling and retry logic.
 
+        If the response cache is enabled, read-only queries are answered from the
+        cache when possible and mutations evict the cached responses they affect.
+        Identical read-only queries already in flight share one request. If
+        batching is enabled, queries sent within the batch window are merged
+        into one request and the response is split back for each caller.
+
+        Requests with file uploads are sent directly as a streamed multipart body.
+
+        Args:
+            query: The GraphQL query string
+            variables: Optional variables for the query
+            file_paths: Optional dictionary mapping variable names to file paths for file uploads
+            cache: Whether a read-only query may be answered from the response cache; if False it is sent to the server, and its response still cached
+
+        Returns:
+            The query result as a dictionary
+        """
+        if file_paths:
+            result = await self._execute_async_request(query, variables, file_paths)
+            if self.response_cache is not None:
+                self._invalidate_for_mutation(variables, result)
+            return result
+
+        if self.response_cache is None:
+            return await self._execute_async_deduplicated(query, variables)
+
+        read_only = is_read_only(query)
+        generation = self.response_cache.generation
+        if read_only and cache:
+            cached = self.response_cache.lookup(query, variables)
+            if cached is not None:
+                return cached
+
+        result = await self._execute_async_deduplicated(query, variables)
+        if read_only:
+            self.response_cache.store(query, variables, result, generation)
+        else:
+            self._invalidate_for_mutation(variables, result)
+        return result
+
+    def _invalidate_for_mutation(
+        self, variables: Optional[Dict[str, Any]], result: Dict[str, Any]
+    ) -> None:
+        """
+        Evict the cached responses affected by a mutation.
+
+        Identical queries sent afterwards don't join those already in flight, whose
+        responses may not show the mutation.
+
+        Args:
+            variables: The mutation variables
+            result: The mutation result
+        """
+        self.response_cache.invalidate_for_mutation(variables, result)
+        if self.singleflight is not None:
+            self.singleflight.forget()
+
+    async def _execute_async_deduplicated(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a GraphQL request asynchronously, sharing identical in-flight queries.
+
+        Args:
+            query: The GraphQL query string
+            variables: Optional variables for the query
+
+        Returns:
+            The query result as a dictionary
+        """
+        if self.singleflight is not None:
+            return await self.singleflight.execute(query, variables)
+        return await self._execute_async_batched(query, variables)
+
+    async def _execute_async_batched(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a GraphQL request asynchronously, through the batcher if batching is enabled.
+
+        Args:
+            query: The GraphQL query string
+            variables: Optional variables for the query
+
+        Returns:
+            The query result as a dictionary
+        """
+        if self.batcher is not None:
+            return await self.batcher.submit(query, variables)
+        return await self._execute_async_request(query, variables)
+
+    async def _execute_async_request(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        file_paths: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a single GraphQL request asynchronously with retry logic.
+
+        File uploads are sent as multipart form data that aiohttp streams from the
+        open file handles, so files are never read into memory as a whole. The
+        files are reopened for every attempt and the number of concurrent uploads
+        is bounded by the upload semaphore.
+
         Args:
             query: The GraphQL query string
             variables: Optional variables for the query
+            file_paths: Optional dictionary mapping variable names to file paths for file uploads
 
         Returns:
             The query result as a dictionary
@@ -647,8 +915,11 @@ class GraphQLClient(GraphqlConnection):
             error_response["message"] = f"Failed to refresh token: {str(e)}"
             return error_response
 
-        # Prepare headers, cookies, and auth
-        headers = self._prepare_headers()
+        # Determine if this is a file upload request
+        is_file_upload = file_paths is not None and len(file_paths) > 0
+
+        # Prepare headers (without Content-Type for uploads, as it will be set by aiohttp), cookies, and auth
+        headers = self._prepare_headers(include_content_type=not is_file_upload)
         cookies = self._prepare_cookies()
         auth = self._prepare_auth(is_async=True)
 
@@ -668,26 +939,40 @@ class GraphQLClient(GraphqlConnection):
         last_exception = None
 
         while retries <= self.max_retries:
+            files = []
             try:
-                # Apply rate limiting
-                rate_limit_coro = self._apply_rate_limiting(is_async=True)
-                if rate_limit_coro:
-                    await rate_limit_coro
-
-                # Execute request with timeout
-                async with session.post(
-                    url=self.url,
-                    headers=headers,
-                    json=json_payload,
-                    cookies=cookies,
-                    auth=auth,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    ssl=False if self.ssl_enabled == False else None,
-                ) as response:
+                if is_file_upload:
+                    # Reopen the files for every attempt, since a failed attempt
+                    # may have consumed part of the previous handles
+                    body, files = self._prepare_upload_form(json_payload, file_paths)
+                    request_body = {"data": body}
+                else:
+                    request_body = {"json": json_payload}
+
+                # Execute request with timeout while holding a limiter slot
+                async with (
+                    (
+                        self._upload_semaphore
+                        if is_file_upload
+                        else contextlib.nullcontext()
+                    ),
+                    self.limiter.limit_async() as permit,
+                    session.post(
+                        url=self.url,
+                        headers=headers,
+                        cookies=cookies,
+                        auth=auth,
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        ssl=False if self.ssl_enabled == False else None,
+                        **request_body,
+                    ) as response,
+                ):
+                    permit.record(response.status)
                     # We no longer need to check for 401 and refresh token here
                     # since we proactively refresh tokens before sending requests
                     if response.status != 200:
                         error_text = await response.text()
+                        self._raise_for_overload(response, error_text)
                         raise Exception(
                             f"Request failed with status code: {response.status}. Response: {error_text}"
                         )
@@ -754,6 +1039,10 @@ class GraphQLClient(GraphqlConnection):
                 error_response["error_type"] = error_type
                 error_response["message"] = error_message
                 return error_response
+            finally:
+                # Close the file handles opened for this attempt
+                for file in files:
+                    file.close()
 
         # This should never be reached due to the return statements in the exception handlers,
         # but we include it to satisfy the type checker
@@ -767,6 +1056,7 @@ class GraphQLClient(GraphqlConnection):
 
     async def close(self):
         """Close the aiohttp session and connector, and the synchronous sessions"""
+        await self.token_manager.close()
         if self._session and not self._session.closed:
             await self._session.close()
         if self._connector and not self._connector.closed:
@@ -790,27 +1080,59 @@ class GraphQLClient(GraphqlConnection):
         """Async context manager exit"""
         await self.close()
 
-    def _apply_rate_limiting(self, is_async=False):
+    def _raise_for_overload(self, response: aiohttp.ClientResponse, error_text: str):
         """
-        Apply rate limiting to prevent too many requests in a short period.
+        Raise a retryable aiohttp error if the server reported that it is overloaded.
+
+        The limiter has already shrunk its concurrency window for this response, so
+        the request is retried with backoff instead of failing immediately.
 
         Args:
-            is_async: Whether this is being called from an async method
+            response: The aiohttp response
+            error_text: The body of the response
+        """
+        if response.status in OVERLOAD_STATUS_CODES:
+            raise aiohttp.ClientResponseError(
+                request_info=response.request_info,
+                history=response.history,
+                status=response.status,
+                message=f"Server overloaded. Response: {error_text}",
+                headers=response.headers,
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get runtime statistics for the client.
 
         Returns:
-            None for sync calls, coroutine for async calls (must be awaited)
+            A dictionary with the request limiter, connection pool, token refresh,
+            batching, deduplication and response cache state
         """
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            logger.debug("Rate limiting: sleeping for %.3fs", sleep_time)
-            if is_async:
-                return asyncio.sleep(sleep_time)
-            else:
-                time.sleep(sleep_time)
-        self.last_request_time = time.time()
-        return None
+        stats = {
+            "limiter": self.limiter.stats(),
+            "pool": self._pool_stats(),
+            "token": self.token_manager.stats(),
+        }
+        if self.batcher is not None:
+            stats["batching"] = self.batcher.stats()
+        if self.singleflight is not None:
+            stats["deduplication"] = self.singleflight.stats()
+        if self.response_cache is not None:
+            stats["response_cache"] = self.response_cache.stats()
+        return stats
+
+    def _pool_stats(self) -> Dict[str, Any]:
+        """Get the connection pool settings and which sessions are open."""
+        return {
+            "connections": self.pool_connections,
+            "max_size": self.pool_maxsize,
+            "keepalive_timeout": self.keepalive_timeout,
+            "force_close": self.force_close,
+            "async_session_open": self._session is not None
+            and not self._session.closed,
+            "sync_sessions_open": (self._sync_session_secure is not None)
+            + (self._sync_session_insecure is not None),
+        }
 
     def _prepare_headers(self, include_content_type=True) -> Mapping[str, str | None]:
         """
@@ -838,6 +1160,43 @@ class GraphQLClient(GraphqlConnection):
         """
         return {"ECM-CS-XSRF-Token": str(self.xsrf_token)}
 
+    def _prepare_upload_form(
+        self, operations: Dict[str, Any], file_paths: Dict[str, str]
+    ) -> Tuple[aiohttp.FormData, List[BinaryIO]]:
+        """
+        Prepare a multipart form for an async file upload.
+
+        The form mirrors the synchronous upload: the query and variables are sent
+        in the "graphql" field and each file in a field named after its variable.
+        Files are added as open handles so aiohttp streams them in chunks.
+
+        Args:
+            operations: The query and variables of the request
+            file_paths: Dictionary mapping variable names to file paths
+
+        Returns:
+            A tuple of the form and the opened file handles, which the caller must close
+        """
+        form = aiohttp.FormData()
+        form.add_field("graphql", json.dumps(operations))
+        files = []
+        try:
+            for var_name, file_path in file_paths.items():
+                file = open(file_path, "rb")
+                files.append(file)
+                form.add_field(
+                    var_name,
+                    file,
+                    filename=os.path.basename(file_path),
+                    content_type=mimetypes.guess_type(file_path)[0]
+                    or "application/octet-stream",
+                )
+        except Exception:
+            for file in files:
+                file.close()
+            raise
+        return form, files
+
     def _prepare_auth(self, is_async=False) -> BasicAuth | tuple[str, str] | None:
         """
         Prepare authentication for requests.
@@ -1053,9 +1412,6 @@ class GraphQLClient(GraphqlConnection):
         # Default error response in case of failure
         error_text = "Error: Failed to download text content"
 
-        # Apply rate limiting
-        self._apply_rate_limiting(is_async=False)
-
         # Prepare URL
         url = self._prepare_download_url(download_url)
 
@@ -1082,14 +1438,18 @@ class GraphQLClient(GraphqlConnection):
                 # Get the session with appropriate SSL settings based on ssl_enabled flag
                 use_secure = self.ssl_enabled is not False
                 session = self._get_sync_session(use_secure=use_secure)
-                response = session.get(
-                    url=url,
-                    headers=headers,
-                    cookies=cookies,
-                    auth=auth,  # type: ignore
-                    timeout=self.timeout,
-                    verify=self.ssl_enabled if self.ssl_enabled else False,
-                )
+                with self.limiter.limit(
+                    timeout_exceptions=(requests.exceptions.Timeout,)
+                ) as permit:
+                    response = session.get(
+                        url=url,
+                        headers=headers,
+                        cookies=cookies,
+                        auth=auth,  # type: ignore
+                        timeout=self.timeout,
+                        verify=self.ssl_enabled if self.ssl_enabled else False,
+                    )
+                    permit.record(response.status_code)
 
                 # We no longer need to check for 401 and refresh token here
                 # since we proactively refresh tokens before sending requests
@@ -1172,24 +1532,24 @@ class GraphQLClient(GraphqlConnection):
 
         while retries <= self.max_retries:
             try:
-                # Apply rate limiting
-                rate_limit_coro = self._apply_rate_limiting(is_async=True)
-                if rate_limit_coro:
-                    await rate_limit_coro
-
-                # Execute request with timeout
-                async with session.get(
-                    url=url,
-                    headers=headers,
-                    cookies=cookies,
-                    auth=auth,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    ssl=False if self.ssl_enabled == False else None,
-                ) as response:
+                # Execute request with timeout while holding a limiter slot
+                async with (
+                    self.limiter.limit_async() as permit,
+                    session.get(
+                        url=url,
+                        headers=headers,
+                        cookies=cookies,
+                        auth=auth,
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        ssl=False if self.ssl_enabled == False else None,
+                    ) as response,
+                ):
+                    permit.record(response.status)
                     # We no longer need to check for 401 and refresh token here
                     # since we proactively refresh tokens before sending requests
                     if response.status != 200:
                         error_text = await response.text()
+                        self._raise_for_overload(response, error_text)
                         raise Exception(
                             f"Request failed with status code: {response.status}. Response: {error_text}"
                         )
@@ -1274,9 +1634,6 @@ class GraphQLClient(GraphqlConnection):
             )
             return result
 
-        # Apply rate limiting
-        self._apply_rate_limiting(is_async=False)
-
         # Prepare URL
         url = self._prepare_download_url(download_url)
 
@@ -1294,55 +1651,117 @@ class GraphQLClient(GraphqlConnection):
         # Prepare authentication
         auth = self._prepare_auth(is_async=False)
 
-        # Implement retry logic
+        # Implement retry logic. The progress of the download is kept across
+        # attempts, so a retry only requests the bytes that are still missing.
         retries = 0
         last_exception = None
+        progress = None
 
         while retries <= self.max_retries:
             try:
+                # Resume from the first missing byte if part of the content is on disk
+                request_headers = dict(headers)
+                if progress is not None and progress.resumable:
+                    request_headers["Range"] = f"bytes={progress.segments[0][2]}-"
+
                 # Get the session with appropriate SSL settings based on ssl_enabled flag
                 use_secure = self.ssl_enabled is not False
                 session = self._get_sync_session(use_secure=use_secure)
-                response = session.get(
-                    url=url,
-                    headers=headers,
-                    cookies=cookies,
-                    auth=auth,  # type: ignore
-                    timeout=self.timeout,
-                    stream=True,  # Use streaming to handle large files
-                    verify=self.ssl_enabled
-                    is not False,  # Disable verification if ssl_enabled is False
-                )
-
-                if response.status_code != 200:
-                    raise Exception(
-                        f"Request failed with status code: {response.status_code}. Response: {response.text}"
-                    )
-
-                # Extract filename from content-disposition header
-                content_disposition = response.headers.get("content-disposition", "")
-                if not content_disposition or "filename=" not in content_disposition:
-                    raise Exception(
-                        f"Content-disposition header missing or invalid: {content_disposition}"
+                with self.limiter.limit(
+                    timeout_exceptions=(requests.exceptions.Timeout,)
+                ) as permit:
+                    response = session.get(
+                        url=url,
+                        headers=request_headers,
+                        cookies=cookies,
+                        auth=auth,  # type: ignore
+                        timeout=self.timeout,
+                        stream=True,  # Use streaming to handle large files
+                        verify=self.ssl_enabled
+                        is not False,  # Disable verification if ssl_enabled is False
                     )
+                    permit.record(response.status_code)
 
-                # Parse the filename from the header
-                # Format example: attachment; filename="Patient%20282142%20report%2021%20(1).pdf";filename*=utf-8''Patient%20282142%20report%2021%20(1).pdf
-                # Search is guaranteed to succeed
-                file_path = re.search(r'filename="([^"]+)"', content_disposition)
-                filename = file_path.group(1)  # pyright: ignore
+                    if response.status_code not in (200, 206):
+                        raise Exception(
+                            f"Request failed with status code: {response.status_code}. Response: {response.text}"
+                        )
 
-                # URL decode the filename if needed
-                filename = unquote(filename)
+                    validator = content_validator(response.headers)
+                    if response.status_code == 206 and "Range" in request_headers:
+                        # Resumed download: the body continues the part file
+                        content_range = parse_content_range(
+                            response.headers.get("Content-Range")
+                        )
+                        if (
+                            content_range is None
+                            or content_range[0] != progress.segments[0][2]
+                            or (validator and validator != progress.validator)
+                        ):
+                            # The content changed since the download started; start over
+                            response.close()
+                            progress.discard()
+                            progress = None
+                            raise Exception(
+                                "Content changed during download, restarting"
+                            )
+                    else:
+                        # Extract filename from content-disposition header
+                        filename = filename_from_content_disposition(
+                            response.headers.get("content-disposition", "")
+                        )
+                        file_path = os.path.join(download_folder_path, filename)
+                        content_length = response.headers.get("Content-Length")
+                        total = int(content_length) if content_length else None
+
+                        # Resume an earlier download of the same content if the
+                        # server supports ranges
+                        earlier = (
+                            DownloadProgress.load(file_path, url, total, validator)
+                            if progress is None
+                            else None
+                        )
+                        if (
+                            earlier is not None
+                            and earlier.resumable
+                            and response.headers.get("Accept-Ranges", "").lower()
+                            == "bytes"
+                        ):
+                            logger.info(
+                                "Resuming download of %s at %d bytes",
+                                file_path,
+                                earlier.received,
+                            )
+                            response.close()
+                            progress = earlier
+                            continue
 
-                # Create full file path
-                file_path = os.path.join(download_folder_path, filename)
+                        progress = DownloadProgress.create(
+                            file_path, url, total, validator
+                        )
+                        with open(progress.part_path, "wb"):
+                            pass
+                        progress.save()
+
+                    # Write content to the part file
+                    with open(progress.part_path, "r+b") as f:
+                        f.seek(progress.segments[0][2])
+                        write_stream(
+                            (
+                                chunk
+                                for chunk in response.iter_content(
+                                    chunk_size=self.downloader.chunk_size
+                                )
+                                if chunk
+                            ),
+                            f,
+                            progress,
+                            0,
+                        )
 
-                # Write content to file
-                with open(file_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+                    # Move the complete file to its final name
+                    file_path = progress.file_path
+                    progress.complete()
 
                 result["success"] = True
                 result["message"] = f"File downloaded successfully to {file_path}"
@@ -1447,65 +1866,25 @@ class GraphQLClient(GraphqlConnection):
             result["error"] = f"Failed to create session: {str(e)}"
             return result
 
-        # Implement retry logic
+        # Implement retry logic. The job keeps the download progress across
+        # attempts, so a retry only requests the bytes that are still missing.
         retries = 0
         last_exception = None
+        job = DownloadJob(url, download_folder_path)
 
         while retries <= self.max_retries:
             try:
-                # Apply rate limiting
-                rate_limit_coro = self._apply_rate_limiting(is_async=True)
-                if rate_limit_coro:
-                    await rate_limit_coro
-
-                # Execute request with timeout
-                async with session.get(
-                    url=url,
-                    headers=headers,
-                    cookies=cookies,
-                    auth=auth,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    ssl=False if self.ssl_enabled == False else None,
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(
-                            f"Request failed with status code: {response.status}. Response: {error_text}"
-                        )
-
-                    # Extract filename from content-disposition header
-                    content_disposition = response.headers.get(
-                        "content-disposition", ""
-                    )
-                    if (
-                        not content_disposition
-                        or "filename=" not in content_disposition
-                    ):
-                        raise Exception(
-                            f"Content-disposition header missing or invalid: {content_disposition}"
-                        )
-
-                    # Parse the filename from the header
-                    # Format example: attachment; filename="Patient%20282142%20report%2021%20(1).pdf";filename*=utf-8''Patient%20282142%20report%2021%20(1).pdf
-                    # Search is guaranteed to succeed
-                    file_path = re.search(r'filename="([^"]+)"', content_disposition)
-                    filename = file_path.group(1)  # pyright: ignore
-
-                    filename = unquote(filename)
-
-                    # Create full file path
-                    file_path = os.path.join(download_folder_path, filename)
-
-                    # Write content to file
-                    with open(file_path, "wb") as f:
-                        async for chunk in response.content.iter_chunked(8192):
-                            if chunk:
-                                f.write(chunk)
+                # Download with parallel range requests, each holding a limiter slot
+                file_path = await self.downloader.download(
+                    session,
+                    job,
+                    {"headers": headers, "cookies": cookies, "auth": auth},
+                )
 
-                    result["success"] = True
-                    result["message"] = f"File downloaded successfully to {file_path}"
-                    result["file_path"] = file_path
-                    return result
+                result["success"] = True
+                result["message"] = f"File downloaded successfully to {file_path}"
+                result["file_path"] = file_path
+                return result
 
             except (
                 aiohttp.ClientConnectorError,
@@ -0,0 +1,372 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Minimal GraphQL document parsing for the GraphQL client.
+
+This is not a full GraphQL parser. It tokenizes a document and recognizes just
+enough of the structure of a single operation (its type, name, variable
+definitions and top-level fields) for the client to merge, deduplicate and cache
+requests without changing what is sent to the server.
+"""
+
+import re
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+__all__ = [
+    "Token",
+    "ParsedOperation",
+    "GraphQLSyntaxError",
+    "tokenize",
+    "parse_operation",
+    "collapse_query",
+    "is_read_only",
+    "join_tokens",
+    "rename_operation",
+]
+
+
+class GraphQLSyntaxError(ValueError):
+    """Raised when a GraphQL document cannot be tokenized."""
+
+
+# Token kinds
+PUNCTUATOR = "punct"
+NAME = "name"
+VARIABLE = "var"
+NUMBER = "number"
+STRING = "string"
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ignored>[\s,﻿]+|\#[^\n\r]*)
+    |(?P<block_string>\"\"\"(?:\\\"\"\"|[^"]|"(?!""))*\"\"\")
+    |(?P<string>"(?:\\.|[^"\\\n\r])*")
+    |(?P<spread>\.\.\.)
+    |(?P<var>\$[_A-Za-z][_0-9A-Za-z]*)
+    |(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    |(?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    |(?P<punct>[!&()\:=@\[\]{|}])
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True)
+class Token:
+    """A lexical token of a GraphQL document."""
+
+    kind: str
+    value: str
+
+
+@dataclass
+class ParsedOperation:
+    """
+    The structure of a single GraphQL operation.
+
+    Attributes:
+        operation_type: "query", "mutation" or "subscription"
+        name: The operation name, if any
+        tokens: All significant tokens of the document
+        selection_start: Index of the "{" token opening the operation's selection set
+        top_level_fields: Indices of the name tokens of the top-level fields, as
+            (alias_index, field_index) where alias_index is None for unaliased fields
+        has_fragments: Whether the document uses named fragments, or spreads
+            fragments directly into the operation's selection set
+        has_directives: Whether the document uses directives
+        operation_count: Number of operations and fragments defined in the document
+    """
+
+    operation_type: str
+    name: Optional[str]
+    tokens: List[Token]
+    selection_start: int
+    top_level_fields: List[Tuple[Optional[int], int]] = field(default_factory=list)
+    has_fragments: bool = False
+    has_directives: bool = False
+    operation_count: int = 1
+
+    @property
+    def is_mutation(self) -> bool:
+        """Whether the operation modifies data on the server."""
+        return self.operation_type != "query"
+
+    @property
+    def response_keys(self) -> List[str]:
+        """The keys of the top-level fields in the response data."""
+        return [
+            self.tokens[alias if alias is not None else name].value
+            for alias, name in self.top_level_fields
+        ]
+
+
+def tokenize(query: str) -> List[Token]:
+    """
+    Split a GraphQL document into significant tokens.
+
+    Whitespace, commas and comments are dropped.
+
+    Args:
+        query: The GraphQL document
+
+    Returns:
+        The list of tokens
+
+    Raises:
+        GraphQLSyntaxError: If the document contains an unexpected character
+    """
+    tokens = []
+    position = 0
+    length = len(query)
+    while position < length:
+        match = _TOKEN_PATTERN.match(query, position)
+        if not match:
+            raise GraphQLSyntaxError(
+                f"Unexpected character {query[position]!r} at position {position}"
+            )
+        kind = match.lastgroup
+        if kind == "block_string":
+            tokens.append(Token(STRING, match.group()))
+        elif kind == "spread":
+            tokens.append(Token(PUNCTUATOR, "..."))
+        elif kind != "ignored":
+            tokens.append(Token(kind, match.group()))
+        position = match.end()
+    return tokens
+
+
+def join_tokens(tokens: List[Token]) -> str:
+    """
+    Join tokens back into a GraphQL document with single spaces.
+
+    Args:
+        tokens: The tokens to join
+
+    Returns:
+        The GraphQL document
+    """
+    return " ".join(token.value for token in tokens)
+
+
+def collapse_query(query: str) -> str:
+    """
+    Normalize a GraphQL document so that formatting differences don't matter.
+
+    Falls back to collapsing whitespace if the document cannot be tokenized.
+
+    Args:
+        query: The GraphQL document
+
+    Returns:
+        The document with whitespace, commas and comments normalized
+    """
+    try:
+        return join_tokens(tokenize(query))
+    except GraphQLSyntaxError:
+        return " ".join(query.split())
+
+
+@lru_cache(maxsize=256)
+def is_read_only(query: str) -> bool:
+    """
+    Check whether a GraphQL document only contains a query operation.
+
+    Documents that cannot be parsed are treated as not read-only.
+
+    Args:
+        query: The GraphQL document
+
+    Returns:
+        bool: True if the document is a single query operation, False otherwise
+    """
+    operation = parse_operation(query)
+    if operation is None or operation.operation_type != "query":
+        return False
+    if operation.operation_count == 1:
+        return True
+
+    # Additional definitions are fine as long as none of them is another operation
+    depth = 0
+    for index, token in enumerate(operation.tokens):
+        if token.kind == PUNCTUATOR:
+            if token.value in ("(", "{", "["):
+                depth += 1
+            elif token.value in (")", "}", "]"):
+                depth -= 1
+        elif depth == 0 and index > 0 and token.kind == NAME:
+            if token.value in ("query", "mutation", "subscription"):
+                return False
+    return True
+
+
+def parse_operation(query: str) -> Optional[ParsedOperation]:
+    """
+    Parse the structure of a GraphQL document containing a single operation.
+
+    Args:
+        query: The GraphQL document
+
+    Returns:
+        The parsed operation, or None if the document cannot be recognized
+    """
+    try:
+        tokens = tokenize(query)
+    except GraphQLSyntaxError:
+        return None
+    if not tokens:
+        return None
+
+    # Operation header: [type [name] [(variable definitions)] [directives]] {
+    index = 0
+    operation_type = "query"
+    name = None
+    if tokens[0].kind == NAME:
+        if tokens[0].value not in ("query", "mutation", "subscription"):
+            return None
+        operation_type = tokens[0].value
+        index = 1
+        if index < len(tokens) and tokens[index].kind == NAME:
+            name = tokens[index].value
+            index += 1
+
+    has_directives = any(t.kind == PUNCTUATOR and t.value == "@" for t in tokens)
+
+    # Skip variable definitions (which may contain input object defaults) up to
+    # the "{" opening the selection set.
+    depth = 0
+    while index < len(tokens):
+        value = tokens[index].value
+        if tokens[index].kind == PUNCTUATOR:
+            if value == "{" and depth == 0:
+                break
+            if value in ("(", "[", "{"):
+                depth += 1
+            elif value in (")", "]", "}"):
+                depth -= 1
+        index += 1
+    if index >= len(tokens):
+        return None
+
+    operation = ParsedOperation(
+        operation_type=operation_type,
+        name=name,
+        tokens=tokens,
+        selection_start=index,
+        has_directives=has_directives,
+    )
+
+    # Walk the operation body. "{" opens a selection set ("s") unless it appears
+    # inside arguments, where it opens an input object ("o").
+    stack: List[str] = []
+    while index < len(tokens):
+        token = tokens[index]
+        if token.kind == PUNCTUATOR:
+            if token.value == "{":
+                stack.append("o" if "(" in stack else "s")
+            elif token.value in ("(", "["):
+                stack.append(token.value)
+            elif token.value in (")", "}", "]"):
+                if not stack:
+                    return None
+                stack.pop()
+                if not stack:
+                    # End of the operation; anything else means more definitions
+                    if index + 1 < len(tokens):
+                        operation.operation_count += 1
+                        if tokens[index + 1].value == "fragment":
+                            operation.has_fragments = True
+                    break
+            elif token.value == "...":
+                following = tokens[index + 1] if index + 1 < len(tokens) else None
+                # Named fragment spreads, and any spread directly in the operation's
+                # selection set, contribute fields that cannot be aliased here.
+                if stack == ["s"] or (
+                    following is not None
+                    and following.kind == NAME
+                    and following.value != "on"
+                ):
+                    operation.has_fragments = True
+        elif token.kind == NAME and stack == ["s"]:
+            # A top-level field, possibly preceded by an alias
+            following = tokens[index + 1] if index + 1 < len(tokens) else None
+            if following is not None and following.value == ":":
+                operation.top_level_fields.append((index, index + 2))
+                index += 2
+            else:
+                operation.top_level_fields.append((None, index))
+        index += 1
+
+    if stack:
+        return None
+    return operation
+
+
+def rename_operation(operation: ParsedOperation, prefix: str) -> Tuple[str, str]:
+    """
+    Render the variable definitions and top-level selections of an operation with
+    every variable renamed and every top-level field aliased with a prefix.
+
+    Args:
+        operation: The parsed operation
+        prefix: The prefix added to variable names and response keys
+
+    Returns:
+        A tuple of the variable definitions (without parentheses) and the
+        top-level selections (without braces)
+    """
+    tokens = operation.tokens
+    renamed: List[str] = []
+    aliases = {alias for alias, _ in operation.top_level_fields if alias is not None}
+    unaliased = {name for alias, name in operation.top_level_fields if alias is None}
+    for index, token in enumerate(tokens):
+        if token.kind == VARIABLE:
+            renamed.append(f"${prefix}{token.value[1:]}")
+        elif index in aliases:
+            renamed.append(f"{prefix}{token.value}")
+        elif index in unaliased:
+            renamed.append(f"{prefix}{token.value}: {token.value}")
+        else:
+            renamed.append(token.value)
+
+    # Variable definitions sit between the first "(" of the header and the
+    # selection set; the header has no other parentheses.
+    start = operation.selection_start
+    definitions = ""
+    header = [i for i in range(start) if tokens[i].value == "("]
+    if header:
+        closing = max(i for i in range(start) if tokens[i].value == ")")
+        definitions = " ".join(renamed[header[0] + 1 : closing])
+
+    end = _matching_brace(tokens, start)
+    selections = " ".join(renamed[start + 1 : end])
+    return definitions, selections
+
+
+def _matching_brace(tokens: List[Token], start: int) -> int:
+    """Get the index of the token closing the bracket opened at start."""
+    depth = 0
+    for index in range(start, len(tokens)):
+        value = tokens[index].value
+        if tokens[index].kind != PUNCTUATOR:
+            continue
+        if value in ("(", "{", "["):
+            depth += 1
+        elif value in (")", "}", "]"):
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(tokens) - 1
@@ -0,0 +1,460 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request limiting for the GraphQL client.
+
+This module provides the limiter shared by every request the GraphQLClient sends,
+synchronous or asynchronous. It combines two mechanisms:
+
+1. A token bucket that caps the sustained request rate (and allows short bursts).
+2. An AIMD (additive increase, multiplicative decrease) concurrency window that
+   grows while the server responds quickly and shrinks when it reports overload
+   (HTTP 429/503), requests time out, or the smoothed latency exceeds a target.
+
+Both mechanisms are thread-safe so the synchronous requests session and the
+aiohttp session can share a single limiter.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from cs_mcp_server.utils.metrics import LatencyHistogram
+
+# Logger for this module
+logger = logging.getLogger("RequestLimiter")
+
+__all__ = [
+    "TokenBucket",
+    "AdaptiveConcurrencyLimiter",
+    "RequestLimiter",
+    "RequestPermit",
+    "OVERLOAD_STATUS_CODES",
+]
+
+# HTTP status codes that indicate the server is overloaded
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    Tokens are added at ``rate`` tokens per second up to ``capacity``. Each request
+    consumes one token. When the bucket is empty, the request reserves a future token
+    and sleeps until it becomes available, so waiting callers are served in order.
+    A rate of ``None`` or ``0`` disables rate limiting.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Sustained number of requests per second (None or 0 = unlimited)
+            capacity: Maximum burst size in requests (defaults to max(1, rate))
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = (
+            float(capacity)
+            if capacity and capacity > 0
+            else max(1.0, float(self.rate or 1.0))
+        )
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled_count = 0
+
+    def _reserve(self) -> float:
+        """
+        Reserve a token and return how long the caller must wait before using it.
+
+        Returns:
+            The wait time in seconds (0 if a token was immediately available)
+        """
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._last_refill = now
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            self.throttled_count += 1
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Take a token, sleeping the current thread if the bucket is empty."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug("Rate limiting: sleeping for %.3fs", wait)
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Take a token, yielding to the event loop if the bucket is empty."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug("Rate limiting: sleeping for %.3fs", wait)
+            await asyncio.sleep(wait)
+
+
+def _in_event_loop_thread() -> bool:
+    """Return True if the current thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _Waiter:
+    """A caller queued for a concurrency slot, either a thread or a coroutine."""
+
+    __slots__ = ("granted", "_event", "_loop", "_future")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted = False
+        self._loop = loop
+        if loop is None:
+            self._event = threading.Event()
+            self._future = None
+        else:
+            self._event = None
+            self._future = loop.create_future()
+
+    def wake(self) -> None:
+        """Wake the waiter. Must be called with the limiter lock held."""
+        self.granted = True
+        if self._event is not None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._set_future)  # pyright: ignore
+
+    def _set_future(self) -> None:
+        if not self._future.done():  # pyright: ignore
+            self._future.set_result(None)  # pyright: ignore
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    An AIMD concurrency window shared by threads and coroutines.
+
+    The window starts at ``initial_limit`` and, for every successful response whose
+    smoothed latency stays below ``target_latency``, grows by ``1 / limit`` (roughly
+    one extra slot per round trip of the whole window). When the server answers with
+    429/503, a request times out, or the smoothed latency exceeds the target, the
+    window is multiplied by ``decrease_factor``. Decreases are applied at most once per
+    smoothed round trip so that a burst of failures from the same congested window
+    only shrinks it once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        target_latency: Optional[float] = 5.0,
+        decrease_factor: float = 0.5,
+        latency_smoothing: float = 0.2,
+    ):
+        """
+        Initialize the concurrency limiter.
+
+        Args:
+            initial_limit: Number of concurrent requests allowed at start
+            min_limit: Lower bound of the concurrency window
+            max_limit: Upper bound of the concurrency window
+            target_latency: Smoothed latency in seconds above which the window shrinks
+                (None disables latency-driven decreases)
+            decrease_factor: Multiplier applied to the window on overload (0 < f < 1)
+            latency_smoothing: Weight of the newest sample in the latency moving average
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.target_latency = target_latency if target_latency else None
+        self.decrease_factor = decrease_factor
+        self.latency_smoothing = latency_smoothing
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._smoothed_latency: Optional[float] = None
+        self._last_decrease = 0.0
+
+        # Counters for diagnostics
+        self.overload_count = 0
+        self.queued_count = 0
+        self.latency = LatencyHistogram()
+
+    @property
+    def limit(self) -> int:
+        """The current size of the concurrency window."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently holding a slot."""
+        return self._in_flight
+
+    def _try_acquire_locked(self) -> bool:
+        if self._in_flight < int(self._limit) and not self._waiters:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _wake_waiters_locked(self) -> None:
+        # Hand freed slots directly to queued callers in FIFO order
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            waiter.wake()
+
+    def acquire(self) -> None:
+        """
+        Acquire a slot, blocking the current thread until one is available.
+
+        When called from a thread that is running an event loop (for example a
+        synchronous tool invoked by the MCP server), the slot is taken immediately even
+        if the window is full: blocking there would stall the very coroutines that
+        have to release their slots.
+        """
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            if _in_event_loop_thread():
+                self._in_flight += 1
+                return
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+            self.queued_count += 1
+        waiter._event.wait()  # pyright: ignore
+
+    async def acquire_async(self) -> None:
+        """Acquire a slot, waiting on the event loop until one is available."""
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+            self.queued_count += 1
+        try:
+            await waiter._future  # pyright: ignore
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # The slot was handed to us just before cancellation; give it back.
+                    self._in_flight -= 1
+                    self._wake_waiters_locked()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Release a slot previously obtained with acquire or acquire_async."""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake_waiters_locked()
+
+    def on_response(self, latency: float, status: Optional[int] = None) -> None:
+        """
+        Feed a response observation into the AIMD controller.
+
+        Args:
+            latency: Time in seconds until the response headers were received
+            status: The HTTP status code of the response
+        """
+        self.latency.observe(latency)
+        with self._lock:
+            if self._smoothed_latency is None:
+                self._smoothed_latency = latency
+            else:
+                self._smoothed_latency += self.latency_smoothing * (
+                    latency - self._smoothed_latency
+                )
+
+            if status in OVERLOAD_STATUS_CODES:
+                self.overload_count += 1
+                self._decrease_locked("server overload (HTTP %s)" % status)
+            elif (
+                self.target_latency is not None
+                and self._smoothed_latency > self.target_latency
+            ):
+                self._decrease_locked(
+                    "smoothed latency %.3fs above target" % self._smoothed_latency
+                )
+            elif self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._wake_waiters_locked()
+
+    def on_timeout(self) -> None:
+        """Record a request that timed out as an overload signal."""
+        with self._lock:
+            self.overload_count += 1
+            self._decrease_locked("request timeout")
+
+    def _decrease_locked(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self._smoothed_latency or 0.0):
+            return
+        self._last_decrease = now
+        new_limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        if int(new_limit) != int(self._limit):
+            logger.info(
+                "Reducing concurrency limit from %d to %d: %s",
+                int(self._limit),
+                int(new_limit),
+                reason,
+            )
+        self._limit = new_limit
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the limiter state."""
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "queued_total": self.queued_count,
+                "overload_total": self.overload_count,
+                "smoothed_latency": self._smoothed_latency,
+                "latency": self.latency.stats(),
+            }
+
+
+class RequestPermit:
+    """
+    Handle returned while a request holds a limiter slot.
+
+    Call ``record`` as soon as response headers arrive so the limiter can learn the
+    latency of the request independently of how long the body takes to stream.
+    """
+
+    __slots__ = ("_limiter", "_start", "_recorded")
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter):
+        self._limiter = limiter
+        self._start = time.monotonic()
+        self._recorded = False
+
+    def record(self, status: Optional[int]) -> None:
+        """
+        Record the response status and latency of the request.
+
+        Args:
+            status: The HTTP status code of the response
+        """
+        if not self._recorded:
+            self._recorded = True
+            self._limiter.on_response(time.monotonic() - self._start, status)
+
+    def _record_exception(
+        self, exc: BaseException, timeout_exceptions: Tuple[type, ...]
+    ) -> None:
+        if not self._recorded and isinstance(exc, timeout_exceptions):
+            self._recorded = True
+            self._limiter.on_timeout()
+
+
+class RequestLimiter:
+    """
+    Combines a TokenBucket and an AdaptiveConcurrencyLimiter.
+
+    Usage:
+        with limiter.limit() as permit:
+            response = session.post(...)
+            permit.record(response.status_code)
+
+        async with limiter.limit_async() as permit:
+            async with session.post(...) as response:
+                permit.record(response.status)
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        initial_concurrency: int = 10,
+        min_concurrency: int = 1,
+        max_concurrency: int = 100,
+        target_latency: Optional[float] = 5.0,
+    ):
+        """
+        Initialize the request limiter.
+
+        Args:
+            rate: Sustained requests per second (None or 0 = unlimited)
+            burst: Maximum burst size for the token bucket
+            initial_concurrency: Starting size of the concurrency window
+            min_concurrency: Lower bound of the concurrency window
+            max_concurrency: Upper bound of the concurrency window
+            target_latency: Smoothed latency in seconds above which the window shrinks
+        """
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+            target_latency=target_latency,
+        )
+
+    @contextmanager
+    def limit(self, timeout_exceptions: Tuple[type, ...] = (TimeoutError,)):
+        """
+        Hold a rate token and a concurrency slot for a synchronous request.
+
+        Args:
+            timeout_exceptions: Exception types raised by the HTTP library on timeout
+        """
+        self.bucket.acquire()
+        self.concurrency.acquire()
+        permit = RequestPermit(self.concurrency)
+        try:
+            yield permit
+        except BaseException as e:
+            permit._record_exception(e, timeout_exceptions)
+            raise
+        finally:
+            self.concurrency.release()
+
+    @asynccontextmanager
+    async def limit_async(self):
+        """Hold a rate token and a concurrency slot for an asynchronous request."""
+        await self.bucket.acquire_async()
+        await self.concurrency.acquire_async()
+        permit = RequestPermit(self.concurrency)
+        try:
+            yield permit
+        except BaseException as e:
+            permit._record_exception(e, (TimeoutError,))
+            raise
+        finally:
+            self.concurrency.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the rate and concurrency limiter state."""
+        stats = self.concurrency.stats()
+        stats["rate"] = self.bucket.rate
+        stats["burst"] = self.bucket.capacity
+        stats["throttled_total"] = self.bucket.throttled_count
+        return stats
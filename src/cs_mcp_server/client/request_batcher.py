@@ -0,0 +1,283 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request coalescing for the GraphQL client.
+
+Queries submitted within a short window are merged into a single GraphQL
+operation: every top-level field is aliased and every variable renamed with a
+per-caller prefix (``b0_``, ``b1_``, ...). The merged response is then split
+back into one response per caller, so each caller sees exactly the result it
+would have received from its own request.
+
+Only plain queries are merged. Mutations, subscriptions, documents using named
+fragments or directives, and documents with several operations are sent as is.
+"""
+
+import asyncio
+import copy
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .graphql_parser import ParsedOperation, parse_operation, rename_operation
+
+# Logger for this module
+logger = logging.getLogger("RequestBatcher")
+
+# Default maximum number of queries merged into one request
+DEFAULT_MAX_BATCH_SIZE = 20
+
+SendFunction = Callable[[str, Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class _PendingQuery:
+    """A query waiting to be sent as part of a batch."""
+
+    query: str
+    variables: Optional[Dict[str, Any]]
+    operation: ParsedOperation
+    future: asyncio.Future
+
+
+class RequestBatcher:
+    """
+    Coalesces GraphQL queries submitted within a short window into one request.
+    """
+
+    def __init__(
+        self,
+        send: SendFunction,
+        window: float,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            send: Coroutine function sending a single GraphQL request
+            window: Time in seconds to wait for more queries after the first one
+            max_batch_size: Maximum number of queries merged into one request
+        """
+        self._send = send
+        self.window = window
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: List[_PendingQuery] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        self.batch_count = 0
+        self.batched_query_count = 0
+        self.fallback_count = 0
+
+    @staticmethod
+    def is_batchable(operation: Optional[ParsedOperation]) -> bool:
+        """
+        Check whether a parsed operation can be merged with others.
+
+        Args:
+            operation: The parsed operation, or None if it could not be parsed
+
+        Returns:
+            bool: True if the operation can be merged, False otherwise
+        """
+        return (
+            operation is not None
+            and operation.operation_type == "query"
+            and operation.operation_count == 1
+            and not operation.has_fragments
+            and not operation.has_directives
+            and bool(operation.top_level_fields)
+        )
+
+    async def submit(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Submit a query, sending it together with queries submitted around the same time.
+
+        Args:
+            query: The GraphQL query string
+            variables: Optional variables for the query
+
+        Returns:
+            The query result as a dictionary
+        """
+        operation = parse_operation(query)
+        if not self.is_batchable(operation):
+            return await self._send(query, variables)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_PendingQuery(query, variables, operation, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Send all pending queries as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        pending = [item for item in pending if not item.future.done()]
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[_PendingQuery]) -> None:
+        """Send a batch and resolve the futures of its callers."""
+        try:
+            if len(batch) == 1:
+                item = batch[0]
+                self._resolve(item, await self._send(item.query, item.variables))
+                return
+
+            query, variables = self._merge(batch)
+            self.batch_count += 1
+            self.batched_query_count += len(batch)
+            logger.debug("Sending %d queries as one batched request", len(batch))
+            result = await self._send(query, variables)
+
+            if self._is_rejected(result):
+                # The merged document failed as a whole (for example validation of
+                # one of the queries), so send each query on its own.
+                self.fallback_count += 1
+                logger.debug("Batched request rejected, sending queries individually")
+                await asyncio.gather(*(self._send_single(item) for item in batch))
+                return
+
+            for index, item in enumerate(batch):
+                self._resolve(item, self._split(result, index, item))
+        except Exception as e:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+
+    async def _send_single(self, item: _PendingQuery) -> None:
+        """Send one query of a rejected batch on its own."""
+        try:
+            self._resolve(item, await self._send(item.query, item.variables))
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+
+    @staticmethod
+    def _resolve(item: _PendingQuery, result: Dict[str, Any]) -> None:
+        """Deliver a result to a waiting caller unless it gave up."""
+        if not item.future.done():
+            item.future.set_result(result)
+
+    @staticmethod
+    def _merge(batch: List[_PendingQuery]):
+        """
+        Merge a batch of queries into one query.
+
+        Args:
+            batch: The queries to merge
+
+        Returns:
+            A tuple of the merged query string and its variables
+        """
+        definitions = []
+        selections = []
+        variables: Dict[str, Any] = {}
+        for index, item in enumerate(batch):
+            prefix = f"b{index}_"
+            item_definitions, item_selections = rename_operation(item.operation, prefix)
+            if item_definitions:
+                definitions.append(item_definitions)
+            selections.append(item_selections)
+            for name, value in (item.variables or {}).items():
+                variables[f"{prefix}{name}"] = value
+
+        header = f"query ({' '.join(definitions)})" if definitions else "query"
+        return f"{header} {{ {' '.join(selections)} }}", variables
+
+    @staticmethod
+    def _is_rejected(result: Dict[str, Any]) -> bool:
+        """Check whether the server rejected the merged document without executing it."""
+        return bool(result.get("errors")) and result.get("data") is None
+
+    @staticmethod
+    def _split(
+        result: Dict[str, Any], index: int, item: _PendingQuery
+    ) -> Dict[str, Any]:
+        """
+        Extract the response of one caller from a merged response.
+
+        Args:
+            result: The merged response
+            index: The position of the caller in the batch
+            item: The caller's query
+
+        Returns:
+            The response the caller would have received for its own request
+        """
+        if result.get("error"):
+            # Transport-level failure; every caller gets its own copy of the error
+            return copy.deepcopy(result)
+
+        prefix = f"b{index}_"
+        data = result.get("data") or {}
+        own: Dict[str, Any] = {
+            "data": {
+                key: data.get(f"{prefix}{key}") for key in item.operation.response_keys
+            }
+        }
+
+        errors = []
+        for error in result.get("errors") or []:
+            path = error.get("path")
+            if path:
+                if not (isinstance(path[0], str) and path[0].startswith(prefix)):
+                    continue
+                error = copy.deepcopy(error)
+                error["path"] = [path[0][len(prefix) :]] + list(path[1:])
+            else:
+                # Errors without a path can't be attributed, so every caller gets them
+                error = copy.deepcopy(error)
+            errors.append(error)
+
+        if errors:
+            own["errors"] = errors
+            own["_error_details"] = {
+                "timestamp": datetime.now().isoformat(),
+                "query": item.query,
+                "variables": item.variables,
+            }
+        for key, value in result.items():
+            if key not in ("data", "errors", "_error_details"):
+                own[key] = copy.deepcopy(value)
+        return own
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics.
+
+        Returns:
+            A dictionary with batching counters
+        """
+        return {
+            "window_ms": self.window * 1000,
+            "batches": self.batch_count,
+            "batched_queries": self.batched_query_count,
+            "fallbacks": self.fallback_count,
+        }
@@ -0,0 +1,510 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Response caching for read-only GraphQL queries.
+
+Responses are cached by normalized query text, variables and object store. Every
+entry is tagged with the object ids and paths it refers to: GUID-like or path-like
+variable values, and ``id`` and ``pathName`` fields found in the response. When a
+mutation is executed, the ids and paths in its variables and response are collected
+the same way and every entry sharing one of them is evicted.
+
+A query sent before a mutation may be answered with data the mutation has since
+changed. Invalidations are numbered, so the response of a query is only stored if no
+invalidation sharing one of its tags, nor a full clear, happened after it was looked
+up.
+
+The cache backend is pluggable: GraphQLClient accepts any ResponseCache
+implementation. InMemoryResponseCache is the default, an LRU cache bounded by the
+total size of the serialized responses.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from .graphql_parser import collapse_query, parse_operation
+
+# Logger for this module
+logger = logging.getLogger("ResponseCache")
+
+# Default memory budget of the in-memory cache (16 MB of serialized responses)
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Number of recent invalidations remembered by ResponseCachePolicy; a response looked
+# up before older ones is not stored
+MAX_TRACKED_INVALIDATIONS = 256
+
+# Response fields whose values identify the objects a response refers to
+_TAG_FIELDS = ("id", "pathName")
+
+_GUID_PATTERN = re.compile(
+    r"^\{?[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}\}?$"
+)
+
+CacheKey = Tuple[str, str, str]
+
+
+def _normalize_tag(value: Any) -> Optional[str]:
+    """
+    Normalize a value that may identify an object.
+
+    GUIDs are compared without braces and case-insensitively; paths without a
+    trailing slash.
+
+    Returns:
+        The normalized tag, or None if the value doesn't look like an id or path
+    """
+    if not isinstance(value, str):
+        return None
+    if _GUID_PATTERN.match(value):
+        return value.strip("{}").upper()
+    if value.startswith("/"):
+        return value.rstrip("/") or "/"
+    return None
+
+
+def _collect_tags(value: Any, tags: Set[str], from_response: bool) -> None:
+    """Recursively collect id and path tags from variables or a response."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if from_response and key in _TAG_FIELDS:
+                tag = _normalize_tag(item)
+                if tag:
+                    tags.add(tag)
+            _collect_tags(item, tags, from_response)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_tags(item, tags, from_response)
+    elif not from_response:
+        tag = _normalize_tag(value)
+        if tag:
+            tags.add(tag)
+
+
+def extract_tags(
+    variables: Optional[Dict[str, Any]], response: Optional[Dict[str, Any]] = None
+) -> FrozenSet[str]:
+    """
+    Collect the object ids and paths referenced by a request and its response.
+
+    Args:
+        variables: The request variables
+        response: The response data, if any
+
+    Returns:
+        The normalized ids and paths
+    """
+    tags: Set[str] = set()
+    _collect_tags(variables or {}, tags, from_response=False)
+    if response:
+        _collect_tags(response.get("data"), tags, from_response=True)
+    return frozenset(tags)
+
+
+def operation_name(query: str) -> Optional[str]:
+    """
+    Get the name used to look up the TTL of an operation.
+
+    This is the operation name if the query has one, otherwise the name of its
+    first top-level field.
+
+    Args:
+        query: The GraphQL query string
+
+    Returns:
+        The operation name, or None if the query cannot be parsed
+    """
+    operation = parse_operation(query)
+    if operation is None:
+        return None
+    if operation.name:
+        return operation.name
+    if operation.top_level_fields:
+        return operation.tokens[operation.top_level_fields[0][1]].value
+    return None
+
+
+class ResponseCache(ABC):
+    """Interface for response cache backends used by GraphQLClient."""
+
+    @abstractmethod
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            A copy of the cached response, or None if missing or expired
+        """
+
+    @abstractmethod
+    def set(
+        self,
+        key: CacheKey,
+        response: Dict[str, Any],
+        ttl: float,
+        tags: FrozenSet[str],
+    ) -> None:
+        """
+        Cache a response.
+
+        Args:
+            key: The cache key
+            response: The response to cache
+            ttl: Time to live in seconds
+            tags: Object ids and paths the response refers to
+        """
+
+    @abstractmethod
+    def invalidate(self, tags: Optional[Iterable[str]] = None) -> int:
+        """
+        Evict entries referring to any of the given ids or paths.
+
+        Args:
+            tags: The ids and paths to evict, or None to clear the whole cache
+
+        Returns:
+            The number of evicted entries
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            A dictionary of cache counters
+        """
+        return {}
+
+
+@dataclass
+class _CacheEntry:
+    """A serialized response with its expiry time and tags."""
+
+    payload: str
+    expires_at: float
+    tags: FrozenSet[str]
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    In-process LRU response cache bounded by the size of the serialized responses.
+
+    Responses are stored as JSON strings, which gives an accurate memory budget and
+    guarantees callers never share (and mutate) the same response object.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached responses in bytes
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry.payload
+        return json.loads(payload)
+
+    def set(
+        self,
+        key: CacheKey,
+        response: Dict[str, Any],
+        ttl: float,
+        tags: FrozenSet[str],
+    ) -> None:
+        try:
+            payload = json.dumps(response)
+        except (TypeError, ValueError):
+            return
+        if len(payload) > self.max_bytes:
+            return
+
+        entry = _CacheEntry(payload, time.monotonic() + ttl, tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags: Optional[Iterable[str]] = None) -> int:
+        with self._lock:
+            if tags is None:
+                keys = set(self._entries)
+            else:
+                keys = set()
+                for tag in tags:
+                    keys.update(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+        if keys:
+            logger.debug("Invalidated %d cached responses", len(keys))
+        return len(keys)
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and its tag index references. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class ResponseCachePolicy:
+    """
+    Decides which responses are cached, for how long, and what mutations evict.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        default_ttl: float,
+        operation_ttls: Optional[Dict[str, float]] = None,
+        object_store: str = "",
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            cache: The cache backend
+            default_ttl: TTL in seconds for operations without a specific TTL
+            operation_ttls: TTL in seconds per operation name (0 disables caching)
+            object_store: The object store included in every cache key
+        """
+        self.cache = cache
+        self.default_ttl = default_ttl
+        self.operation_ttls = dict(operation_ttls or {})
+        self.object_store = object_store
+        # Number of the last invalidation, with the tags of the recent ones (None for
+        # a full clear). The lock also makes the staleness check and the store of a
+        # response atomic with respect to invalidations.
+        self._generation = 0
+        self._invalidations: Deque[Tuple[int, Optional[FrozenSet[str]]]] = deque(
+            maxlen=MAX_TRACKED_INVALIDATIONS
+        )
+        self._lock = threading.Lock()
+        self.stale_responses = 0
+
+    @property
+    def generation(self) -> int:
+        """The number of invalidations so far, to capture when looking up a query."""
+        return self._generation
+
+    def key(
+        self, query: str, variables: Optional[Dict[str, Any]]
+    ) -> Optional[CacheKey]:
+        """
+        Build the cache key of a request.
+
+        Returns:
+            The cache key, or None if the variables cannot be serialized
+        """
+        try:
+            serialized = json.dumps(variables or {}, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return collapse_query(query), serialized, self.object_store
+
+    def ttl(self, query: str) -> float:
+        """
+        Get the TTL for a query.
+
+        Args:
+            query: The GraphQL query string
+
+        Returns:
+            The TTL in seconds, 0 if the query must not be cached
+        """
+        name = operation_name(query)
+        if name is not None and name in self.operation_ttls:
+            return self.operation_ttls[name]
+        return self.default_ttl
+
+    def lookup(
+        self, query: str, variables: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached response of a read-only query.
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        key = self.key(query, variables)
+        if key is None or self.ttl(query) <= 0:
+            return None
+        return self.cache.get(key)
+
+    def store(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]],
+        response: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache the successful response of a read-only query.
+
+        Args:
+            query: The GraphQL query string
+            variables: The query variables
+            response: The query response
+            generation: The generation captured when the query was looked up; the
+                response isn't cached if an invalidation affecting it happened since
+        """
+        if response.get("error") or response.get("errors"):
+            return
+        ttl = self.ttl(query)
+        key = self.key(query, variables)
+        if key is None or ttl <= 0:
+            return
+        tags = extract_tags(variables, response)
+        with self._lock:
+            if generation is not None and self._invalidated_since(generation, tags):
+                self.stale_responses += 1
+                logger.debug("Not caching a response older than an invalidation")
+                return
+            self.cache.set(key, response, ttl, tags)
+
+    def _invalidated_since(self, generation: int, tags: FrozenSet[str]) -> bool:
+        """
+        Tell whether an invalidation affecting the given tags happened after a
+        generation. Caller holds the lock.
+        """
+        if generation == self._generation:
+            return False
+        if not self._invalidations or self._invalidations[0][0] > generation + 1:
+            # The invalidations since then are no longer all known
+            return True
+        return any(
+            number > generation and (invalidated is None or invalidated & tags)
+            for number, invalidated in self._invalidations
+        )
+
+    def invalidate_for_mutation(
+        self,
+        variables: Optional[Dict[str, Any]],
+        response: Optional[Dict[str, Any]],
+    ) -> int:
+        """
+        Evict cached responses affected by a mutation.
+
+        If no id or path can be found in the mutation, the whole cache is cleared
+        since there is no way to tell what it changed.
+
+        Returns:
+            The number of evicted entries
+        """
+        tags = extract_tags(variables, response) or None
+        with self._lock:
+            self._generation += 1
+            self._invalidations.append((self._generation, tags))
+            return self.cache.invalidate(tags)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get response cache statistics.
+
+        Returns:
+            The counters of the cache backend, with the number of responses not
+            cached because an invalidation happened while they were requested
+        """
+        stats = dict(self.cache.stats())
+        stats["stale_responses"] = self.stale_responses
+        return stats
+
+
+def parse_operation_ttls(value: str) -> Dict[str, float]:
+    """
+    Parse per-operation TTLs from a string such as "getDocument=30,folder=120".
+
+    Args:
+        value: Comma separated operation=seconds pairs
+
+    Returns:
+        The TTL in seconds per operation name
+
+    Raises:
+        ValueError: If a pair is malformed
+    """
+    ttls = {}
+    for pair in value.split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+        name, separator, seconds = pair.partition("=")
+        if not separator or not name.strip():
+            raise ValueError(f"Invalid operation TTL: {pair!r}")
+        ttls[name.strip()] = float(seconds)
+    return ttls
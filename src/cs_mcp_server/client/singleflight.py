@@ -0,0 +1,173 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-flight request deduplication for the GraphQL client.
+
+When a read-only query is already in flight, identical calls (same query text and
+same variables) wait for the response of the first call instead of sending their
+own request. As soon as the response arrives, and before any caller resumes, each
+waiting caller gets its own deep copy of it while the first caller keeps the
+original, so callers can modify their result without affecting each other.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .graphql_parser import is_read_only
+
+# Logger for this module
+logger = logging.getLogger("SingleFlight")
+
+SendFunction = Callable[[str, Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+
+class SingleFlight:
+    """
+    Shares the response of an in-flight read-only query with identical calls.
+    """
+
+    def __init__(self, send: SendFunction):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            send: Coroutine function executing a GraphQL request
+        """
+        self._send = send
+        # Task of each in-flight request with the futures of the callers joining it
+        self._in_flight: Dict[
+            Tuple[str, str], Tuple[asyncio.Task, List[asyncio.Future]]
+        ] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(
+        query: str, variables: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Build the deduplication key for a request.
+
+        Returns:
+            The key, or None if the variables cannot be serialized
+        """
+        try:
+            return query, json.dumps(variables or {}, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+    async def execute(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a request, joining an identical read-only request already in flight.
+
+        Args:
+            query: The GraphQL query string
+            variables: Optional variables for the query
+
+        Returns:
+            The query result as a dictionary
+        """
+        key = self._key(query, variables) if is_read_only(query) else None
+        if key is None:
+            return await self._send(query, variables)
+
+        # Callers wait on their own future, so a cancelled caller doesn't cancel
+        # the shared task
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.hits += 1
+            logger.debug("Joining identical in-flight request")
+            flight[1].append(waiter)
+            return await waiter
+
+        self.misses += 1
+        task = asyncio.create_task(self._send(query, variables))
+        followers: List[asyncio.Future] = []
+        self._in_flight[key] = (task, followers)
+        task.add_done_callback(
+            lambda done: self._complete(key, done, waiter, followers)
+        )
+        return await waiter
+
+    def _complete(
+        self,
+        key: Tuple[str, str],
+        task: asyncio.Task,
+        leader: asyncio.Future,
+        followers: List[asyncio.Future],
+    ) -> None:
+        """
+        Hand the outcome of a request to its callers.
+
+        Args:
+            key: The deduplication key of the request
+            task: The completed request task
+            leader: Future of the caller that started the request
+            followers: Futures of the callers that joined it
+        """
+        # A later request with the same key may have replaced this one
+        flight = self._in_flight.get(key)
+        if flight is not None and flight[0] is task:
+            self._in_flight.pop(key, None)
+        waiters = [leader] + followers
+        if task.cancelled():
+            for waiter in waiters:
+                waiter.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+        result = task.result()
+        # The copies are made before any caller resumes, so no caller sees changes
+        # made by another one to its result
+        for waiter in followers:
+            if not waiter.done():
+                waiter.set_result(copy.deepcopy(result))
+        if not leader.done():
+            leader.set_result(result)
+
+    def forget(self) -> None:
+        """
+        Make later calls send their own request rather than join those in flight.
+
+        Used after a mutation, whose effects the responses of requests sent before
+        it may not show. The requests in flight still complete for their callers.
+        """
+        self._in_flight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics.
+
+        Returns:
+            A dictionary with hit and miss counters
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "in_flight": len(self._in_flight),
+        }
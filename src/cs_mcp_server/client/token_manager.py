@@ -0,0 +1,356 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Asynchronous token management for the GraphQL client.
+
+The synchronous token refresh in GraphQLClient uses the requests library, which
+blocks the event loop when called from async code. This module refreshes tokens
+with aiohttp instead and makes sure that:
+
+1. Only one refresh is in flight at a time. Concurrent callers that find the token
+   stale wait on the same refresh instead of each fetching their own token.
+2. A background task renews the token before it reaches the refresh threshold, so
+   requests normally never wait for a token round trip at all.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from .graphql_client import GraphQLClient
+
+# Logger for this module
+logger = logging.getLogger("TokenManager")
+
+# Fraction of the refresh interval used as a safety margin before the token expires
+SAFETY_MARGIN_RATIO = 0.1
+
+# Default total timeout in seconds for token requests
+DEFAULT_TOKEN_TIMEOUT = 300
+
+
+class TokenManager:
+    """
+    Refreshes the authentication token of a GraphQLClient without blocking the event loop.
+
+    A token is considered stale once it is older than ``token_refresh`` minus a safety
+    margin (10% of ``token_refresh``). The background renewal task fires one safety
+    margin earlier than that, so under normal operation the token is replaced before
+    any request sees it as stale.
+    """
+
+    def __init__(self, client: "GraphQLClient"):
+        """
+        Initialize the token manager.
+
+        Args:
+            client: The GraphQL client whose token is managed
+        """
+        self._client = client
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._renewal_task: Optional[asyncio.Task] = None
+        self.refresh_count = 0
+        self.failure_count = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the client uses token authentication with a refresh interval."""
+        return bool(
+            self._client.token and self._client.token_refresh and self._client.token_url
+        )
+
+    @property
+    def safety_margin(self) -> float:
+        """The safety margin in seconds applied before the refresh interval elapses."""
+        return (self._client.token_refresh or 0) * SAFETY_MARGIN_RATIO
+
+    def token_age(self) -> Optional[float]:
+        """
+        Get the age of the current token.
+
+        Returns:
+            The age in seconds, or None if no token has been fetched
+        """
+        if not self._client.token_fetched_time:
+            return None
+        return (datetime.now() - self._client.token_fetched_time).total_seconds()
+
+    def needs_refresh(self) -> bool:
+        """
+        Check whether the current token is stale and must be refreshed before use.
+
+        Returns:
+            bool: True if the token must be refreshed, False otherwise
+        """
+        age = self.token_age()
+        if not self.enabled or age is None:
+            return False
+        return int(age) > (self._client.token_refresh - self.safety_margin)
+
+    def seconds_until_renewal(self) -> float:
+        """
+        Get the time until the background task should renew the token.
+
+        Returns:
+            The number of seconds to wait, 0 if the renewal is already due
+        """
+        age = self.token_age()
+        if age is None:
+            return 0.0
+        renew_at = self._client.token_refresh - 2 * self.safety_margin
+        return max(0.0, renew_at - age)
+
+    async def ensure_fresh(self) -> bool:
+        """
+        Make sure the token is usable, refreshing it if it is stale.
+
+        Also starts the background renewal task the first time it is called from a
+        running event loop.
+
+        Returns:
+            bool: True if the token was refreshed, False otherwise
+        """
+        if not self.enabled:
+            return False
+        self._start_renewal()
+        if not self.needs_refresh():
+            return False
+        await self.refresh()
+        return True
+
+    async def refresh(self) -> None:
+        """
+        Refresh the token, joining a refresh that is already in flight.
+
+        The refresh runs as a shared task. Each caller waits on it through
+        asyncio.shield, so a caller being cancelled does not abort the refresh
+        for the others.
+
+        Raises:
+            Exception: If the token request fails
+        """
+        task = self._refresh_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh())
+            task.add_done_callback(self._on_refresh_done)
+            self._refresh_task = task
+        await asyncio.shield(task)
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        """Clear the shared refresh task and retrieve its exception."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled() and task.exception() is not None:
+            self.failure_count += 1
+
+    async def _refresh(self) -> None:
+        """Fetch a new token and apply it to the client in one step."""
+        xsrf_token = str(uuid.uuid4())
+        token = await self._fetch_token()
+        fetched_time = datetime.now()
+        if self._client.zen_exchange_url:
+            token = await self._exchange_iam_token(token)
+
+        # Assign everything at once, after all awaits, so concurrent requests never
+        # see a new XSRF token paired with the old bearer token.
+        self._client.xsrf_token = xsrf_token
+        self._client.token = token
+        self._client.token_fetched_time = fetched_time
+        self.refresh_count += 1
+        logger.info("Token refreshed asynchronously")
+
+    async def _request_json(
+        self,
+        method: str,
+        url: str,
+        ssl_enabled: Any,
+        **kwargs: Any,
+    ) -> Tuple[int, Any, str]:
+        """
+        Send a token request and decode its JSON response.
+
+        Args:
+            method: The HTTP method
+            url: The token endpoint
+            ssl_enabled: The SSL flag for the endpoint (False disables verification)
+            **kwargs: Additional arguments for the aiohttp request
+
+        Returns:
+            A tuple of status code, decoded JSON (None if not JSON), and response text
+        """
+        session = await self._client._ensure_session()
+        timeout = aiohttp.ClientTimeout(
+            total=self._client.timeout or DEFAULT_TOKEN_TIMEOUT
+        )
+        async with session.request(
+            method,
+            url,
+            timeout=timeout,
+            ssl=False if ssl_enabled is False else None,
+            **kwargs,
+        ) as response:
+            text = await response.text()
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = None
+            logger.debug(
+                "Token request details: URL=%s Response details: Headers=%s, Text=%s",
+                url,
+                response.headers,
+                text,
+            )
+            return response.status, data, text
+
+    async def _fetch_token(self) -> str:
+        """
+        Request a new token from the token endpoint.
+
+        Returns:
+            The new token
+
+        Raises:
+            Exception: If the request fails or the response doesn't contain a token
+        """
+        client = self._client
+        auth = (
+            aiohttp.BasicAuth(client.auth_user, client.auth_pass)
+            if (client.auth_user and client.auth_pass)
+            else None
+        )
+        status, data, text = await self._request_json(
+            "POST" if client.payload else "GET",
+            client.token_url,
+            client.token_ssl_enabled,
+            headers=client.headers,
+            data=client.payload or None,
+            auth=auth,
+        )
+        logger.info("GraphQL Connection sent token request to: %s", client.token_url)
+
+        if isinstance(data, dict):
+            if "token" in data:
+                return data["token"]
+            if "access_token" in data:
+                return data["access_token"]
+
+        logger.error("Request failed with status code: %s", status)
+        logger.error("Response Text: %s", text)
+        raise Exception(f"Token Failed to fetch with status code: {status}")
+
+    async def _exchange_iam_token(self, iam_token: str) -> str:
+        """
+        Exchange an IAM token for a Zen token.
+
+        Args:
+            iam_token: The IAM token returned by the token endpoint
+
+        Returns:
+            The Zen token
+
+        Raises:
+            Exception: If the exchange fails or the response doesn't contain a token
+        """
+        client = self._client
+        username = (
+            client.payload.get("username", "")
+            if isinstance(client.payload, dict)
+            else ""
+        )
+        headers: Dict[str, str] = {"username": username, "iam-token": iam_token}
+        status, data, text = await self._request_json(
+            "GET",
+            client.zen_exchange_url,
+            client.zen_exchange_ssl,
+            headers=headers,
+        )
+        logger.info(
+            "GraphQL Connection sent IAM token exchange request to: %s",
+            client.zen_exchange_url,
+        )
+
+        if isinstance(data, dict) and "accessToken" in data:
+            return data["accessToken"]
+
+        logger.error("Request failed with status code: %s", status)
+        logger.error("Response Text: %s", text)
+        raise Exception(f"Request failed with status code: {status}")
+
+    def _start_renewal(self) -> None:
+        """Start the background renewal task if it is not running yet."""
+        if self._renewal_task is None or self._renewal_task.done():
+            self._renewal_task = asyncio.create_task(self._renewal_loop())
+
+    async def _renewal_loop(self) -> None:
+        """Renew the token ahead of the refresh threshold until cancelled."""
+        failures = 0
+        while self.enabled:
+            delay = self.seconds_until_renewal()
+            if failures:
+                # Back off after a failed renewal, but stay within the safety margin
+                # so a request-triggered refresh can still take over in time.
+                delay = max(
+                    delay,
+                    min(
+                        self._client.retry_delay * (2 ** (failures - 1)),
+                        self.safety_margin,
+                    ),
+                )
+            await asyncio.sleep(delay)
+
+            # The token may have been refreshed by a request while sleeping
+            if self.seconds_until_renewal() > 0:
+                continue
+            try:
+                await self.refresh()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.warning("Background token renewal failed: %s", str(e))
+
+    async def close(self) -> None:
+        """Cancel the background renewal task and any refresh in flight."""
+        for task in (self._renewal_task, self._refresh_task):
+            if task is None or task.done():
+                continue
+            try:
+                task.cancel()
+            except RuntimeError:
+                # The loop that owns the task is already closed
+                continue
+        self._renewal_task = None
+        self._refresh_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get token refresh statistics.
+
+        Returns:
+            A dictionary with refresh counters and the current token age
+        """
+        return {
+            "enabled": self.enabled,
+            "refresh_total": self.refresh_count,
+            "failure_total": self.failure_count,
+            "refresh_in_flight": self._refresh_task is not None,
+            "token_age": self.token_age(),
+        }
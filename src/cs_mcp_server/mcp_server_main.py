@@ -23,16 +23,28 @@ It handles server initialization, tool registration, and graceful shutdown proce
 # Standard library imports
 import asyncio
 import atexit
+import contextlib
 import logging
 import os
+from contextlib import asynccontextmanager
 from enum import Enum
+from typing import AsyncIterator, Callable, Optional
 
 # Third-party imports
 from mcp.server.fastmcp import FastMCP
 
 # Use absolute imports
-from cs_mcp_server.cache import MetadataCache
+from cs_mcp_server.cache import MetadataCache, MetadataSnapshot
+from cs_mcp_server.cache.metadata_loader import DEFAULT_CLASS_BATCH_SIZE
+from cs_mcp_server.cache.snapshot import DEFAULT_MAX_AGE
+from cs_mcp_server.cache.warmup import warm_up_metadata
 from cs_mcp_server.client import GraphQLClient
+from cs_mcp_server.client.download import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    DEFAULT_DOWNLOAD_PART_SIZE,
+    DEFAULT_DOWNLOAD_PARTS,
+)
+from cs_mcp_server.client.response_cache import DEFAULT_MAX_BYTES, parse_operation_ttls
 from cs_mcp_server.tools.documents import register_document_tools
 from cs_mcp_server.tools.classes import register_class_tools
 from cs_mcp_server.tools.search import (
@@ -42,6 +54,7 @@ from cs_mcp_server.tools.mcp_manage_hold import register_legalhold
 from cs_mcp_server.tools.vector_search import register_vector_search_tool
 from cs_mcp_server.tools.folders import register_folder_tools
 from cs_mcp_server.tools.annotations import register_annotation_tools
+from cs_mcp_server.tools.stats import register_stats_resource
 
 # Configure logging with dynamic level from environment variable
 log_level_name = os.environ.get("LOG_LEVEL", "INFO").upper()
@@ -68,7 +81,9 @@ class ServerType(str, Enum):
     FULL = "full"
 
 
-def _initialize_mcp_server(server_name: str) -> FastMCP:
+def _initialize_mcp_server(
+    server_name: str, lifespan: Optional[Callable] = None
+) -> FastMCP:
     """
     Initialize the global MCP server instance.
 
@@ -77,13 +92,14 @@ def _initialize_mcp_server(server_name: str) -> FastMCP:
 
     Args:
         server_name: The name for the MCP server instance
+        lifespan: Optional async context manager factory run while the server is up
 
     Returns:
         FastMCP: The initialized MCP server instance
     """
     global mcp
     if mcp is None:
-        mcp = FastMCP(server_name)
+        mcp = FastMCP(server_name, lifespan=lifespan)
         logger.info("Initialized MCP server: %s", server_name)
     return mcp
 
@@ -156,6 +172,45 @@ def initialize_graphql_client():
     pool_connections = int(os.environ.get("POOL_CONNECTIONS", "100"))
     pool_maxsize = int(os.environ.get("POOL_MAXSIZE", "100"))
 
+    # Request limiter settings
+    max_requests_per_second = float(os.environ.get("MAX_REQUESTS_PER_SECOND", "0"))
+    request_burst = int(os.environ.get("REQUEST_BURST", "0"))
+    max_concurrent_requests = int(
+        os.environ.get("MAX_CONCURRENT_REQUESTS", str(pool_connections))
+    )
+    min_concurrent_requests = int(os.environ.get("MIN_CONCURRENT_REQUESTS", "1"))
+    initial_concurrent_requests = int(
+        os.environ.get("INITIAL_CONCURRENT_REQUESTS", "10")
+    )
+    target_latency = float(os.environ.get("TARGET_LATENCY", "5.0"))
+
+    max_concurrent_uploads = int(os.environ.get("MAX_CONCURRENT_UPLOADS", "4"))
+
+    # Download settings
+    download_parts = int(os.environ.get("DOWNLOAD_PARTS", str(DEFAULT_DOWNLOAD_PARTS)))
+    download_part_size = int(
+        os.environ.get("DOWNLOAD_PART_SIZE", str(DEFAULT_DOWNLOAD_PART_SIZE))
+    )
+    download_chunk_size = int(
+        os.environ.get("DOWNLOAD_CHUNK_SIZE", str(DEFAULT_DOWNLOAD_CHUNK_SIZE))
+    )
+
+    # Request batching settings
+    batch_window_ms = float(os.environ.get("BATCH_WINDOW_MS", "0"))
+    batch_max_size = int(os.environ.get("BATCH_MAX_SIZE", "20"))
+    deduplicate_requests = (
+        os.environ.get("DEDUPLICATE_REQUESTS", "true").lower() == "true"
+    )
+
+    # Response cache settings
+    response_cache_ttl = float(os.environ.get("RESPONSE_CACHE_TTL", "0"))
+    response_cache_max_bytes = int(
+        os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))
+    )
+    response_cache_operation_ttls = parse_operation_ttls(
+        os.environ.get("RESPONSE_CACHE_OPERATION_TTLS", "")
+    )
+
     # Validate required parameters
     if not graphql_url:
         raise ValueError("SERVER_URL environment variable is required")
@@ -184,6 +239,22 @@ def initialize_graphql_client():
         pool_connections=pool_connections,
         pool_maxsize=pool_maxsize,
         token_refresh=token_refresh,
+        max_requests_per_second=max_requests_per_second or None,
+        request_burst=request_burst or None,
+        max_concurrent_requests=max_concurrent_requests,
+        min_concurrent_requests=min_concurrent_requests,
+        initial_concurrent_requests=initial_concurrent_requests,
+        target_latency=target_latency or None,
+        download_parts=download_parts,
+        download_part_size=download_part_size,
+        download_chunk_size=download_chunk_size,
+        max_concurrent_uploads=max_concurrent_uploads,
+        batch_window_ms=batch_window_ms or None,
+        batch_max_size=batch_max_size,
+        deduplicate_requests=deduplicate_requests,
+        response_cache_ttl=response_cache_ttl or None,
+        response_cache_max_bytes=response_cache_max_bytes,
+        response_cache_operation_ttls=response_cache_operation_ttls or None,
         ZenIAM_iam_url=zeniam_iam_url,
         ZenIAM_iam_ssl_enabled=zeniam_iam_ssl_enabled,
         ZenIAM_iam_grant_type=zeniam_iam_grant_type,
@@ -197,6 +268,42 @@ def initialize_graphql_client():
     )
 
 
+def initialize_metadata_cache(graphql_client: GraphQLClient) -> MetadataCache:
+    """
+    Create the metadata cache, backed by an on-disk snapshot if METADATA_CACHE_PATH is set.
+
+    Args:
+        graphql_client: The initialized GraphQL client
+
+    Returns:
+        MetadataCache: The metadata cache instance
+    """
+    # Time after which cached metadata is refreshed in the background (0 = never)
+    ttl = float(os.environ.get("METADATA_CACHE_TTL", "0"))
+    # Budget of the property descriptions kept in memory (0 = unlimited)
+    max_classes = int(os.environ.get("METADATA_CACHE_MAX_CLASSES", "0"))
+    max_bytes = int(os.environ.get("METADATA_CACHE_MAX_BYTES", "0"))
+
+    snapshot = None
+    snapshot_path = os.environ.get("METADATA_CACHE_PATH", "")
+    if snapshot_path:
+        max_age = float(os.environ.get("METADATA_CACHE_MAX_AGE", str(DEFAULT_MAX_AGE)))
+        snapshot = MetadataSnapshot(
+            snapshot_path,
+            server_url=graphql_client.url,
+            object_store=graphql_client.object_store,
+            max_age=max_age,
+        )
+        logger.info("Metadata cache snapshot: %s", snapshot.path)
+
+    return MetadataCache(
+        snapshot=snapshot,
+        ttl=ttl or None,
+        max_classes=max_classes or None,
+        max_bytes=max_bytes or None,
+    )
+
+
 def register_server_tools(
     graphql_client: GraphQLClient,
     metadata_cache: MetadataCache,
@@ -245,6 +352,63 @@ def register_server_tools(
     else:
         raise ValueError(f"Unknown server type: {server_type}")
 
+    # Statistics of the caches and the client, for every server type
+    register_stats_resource(mcp, graphql_client, metadata_cache)
+
+
+def _metadata_lifespan(
+    graphql_client: GraphQLClient,
+    metadata_cache: MetadataCache,
+    server_type: ServerType,
+) -> Callable:
+    """
+    Create the server lifespan that warms up the metadata cache.
+
+    With METADATA_WARMUP enabled, the catalogs of all root classes are loaded in the
+    background as soon as the server starts, followed by the property descriptions of
+    the METADATA_PREFETCH_CLASSES most used classes, requested METADATA_BATCH_SIZE
+    classes per query.
+
+    Args:
+        graphql_client: The initialized GraphQL client
+        metadata_cache: The metadata cache instance
+        server_type: The type of server (ServerType enum)
+
+    Returns:
+        The lifespan for the FastMCP server
+    """
+    warmup = os.environ.get("METADATA_WARMUP", "false").lower() == "true"
+    prefetch_classes = int(os.environ.get("METADATA_PREFETCH_CLASSES", "0"))
+    batch_size = int(
+        os.environ.get("METADATA_BATCH_SIZE", str(DEFAULT_CLASS_BATCH_SIZE))
+    )
+    # Only the core tools use the metadata cache
+    uses_metadata = server_type in (ServerType.CORE, ServerType.FULL)
+
+    @asynccontextmanager
+    async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
+        warmup_task = None
+        if warmup and uses_metadata:
+            logger.info("Warming up the metadata cache in the background")
+            warmup_task = asyncio.create_task(
+                warm_up_metadata(
+                    graphql_client,
+                    metadata_cache,
+                    prefetch_classes,
+                    batch_size=batch_size,
+                )
+            )
+        try:
+            yield
+        finally:
+            if warmup_task is not None and not warmup_task.done():
+                warmup_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await warmup_task
+            metadata_cache.flush_usage()
+
+    return lifespan
+
 
 async def shutdown_client(graphql_client):
     """
@@ -267,17 +431,20 @@ def _run_server(server_type: ServerType) -> None:
     server_name = server_type.value
     logger.info("Starting %s MCP Server", server_name)
 
-    # Initialize the global mcp instance
-    _initialize_mcp_server(server_name)
-
     # Initialize GraphQL client
     graphql_client = initialize_graphql_client()
     logger.info("GraphQL client initialized successfully")
 
     # Create metadata cache
-    metadata_cache = MetadataCache()
+    metadata_cache = initialize_metadata_cache(graphql_client)
     logger.info("Metadata cache created successfully")
 
+    # Initialize the global mcp instance, warming up the metadata cache once it runs
+    _initialize_mcp_server(
+        server_name,
+        lifespan=_metadata_lifespan(graphql_client, metadata_cache, server_type),
+    )
+
     # Register tools for this server type
     register_server_tools(graphql_client, metadata_cache, server_type)
     logger.info("Tools registered for %s server", server_type.value)
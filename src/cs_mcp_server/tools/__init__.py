@@ -25,7 +25,7 @@ from .mcp_manage_hold import register_legalhold
 from .vector_search import register_vector_search_tool
 from .documents import register_document_tools
 from .folders import register_folder_tools
-
+from .stats import register_stats_resource
 
 # Define __all__ to specify what gets imported with "from tools import *"
 __all__ = [
@@ -35,4 +35,5 @@ __all__ = [
     "register_legalhold",
     "register_vector_search_tool",
     "register_folder_tools",
+    "register_stats_resource",
 ]
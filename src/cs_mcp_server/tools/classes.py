@@ -12,16 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import heapq
+import operator
 from functools import lru_cache
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
 
 from cs_mcp_server.cache.metadata import MetadataCache
 from cs_mcp_server.cache.metadata_loader import (
-    get_class_metadata_tool,
-    get_root_class_description_tool,
+    get_class_metadata_tool_async,
+    get_root_class_description_tool_async,
 )
 from cs_mcp_server.client.graphql_client import GraphQLClient
 from cs_mcp_server.utils.common import (
@@ -30,7 +32,8 @@ from cs_mcp_server.utils.common import (
     ClassDescriptionData,
     ToolError,
 )
-from cs_mcp_server.utils.scoring import tokenize, word_similarity
+from cs_mcp_server.utils.fuzzy import FuzzyTokenIndex
+from cs_mcp_server.utils.scoring import fuzzy_word_similarity, tokenize
 from cs_mcp_server.utils.constants import (
     EXACT_SYMBOLIC_NAME_MATCH_SCORE,
     EXACT_DISPLAY_NAME_MATCH_SCORE,
@@ -75,7 +78,11 @@ class ClassMatch(BaseModel):
     )
 
 
-def scoring(class_data: CacheClassDescriptionData, keywords: List[str]) -> float:
+def scoring(
+    class_data: CacheClassDescriptionData,
+    keywords: List[str],
+    fuzzy: Optional[FuzzyTokenIndex] = None,
+) -> float:
     """
     Advanced scoring method that uses tokenization and fuzzy matching to find the best class match.
 
@@ -87,22 +94,22 @@ def scoring(class_data: CacheClassDescriptionData, keywords: List[str]) -> float
 
     :param class_data: The class data to score
     :param keywords: The keywords to match against
+    :param fuzzy: Optional index of the class tokens, to match keywords with typos
     :return: A score indicating how well the class matches the keywords
     """
     match_score = 0
 
-    # Convert all text to lowercase for case-insensitive matching
-    symbolic_name = class_data.symbolic_name.lower()
-    display_name = class_data.display_name.lower()
-    descriptive_text = class_data.descriptive_text.lower()
-
-    # Tokenize class names and description
-    symbolic_tokens = tokenize(symbolic_name)
-    display_tokens = tokenize(display_name)
-    descriptive_tokens = tokenize(descriptive_text)
+    # Lowercased class names and description and their tokens, computed once per class
+    class_tokens = class_data.tokens
+    symbolic_name = class_tokens.symbolic_name
+    display_name = class_tokens.display_name
+    descriptive_text = class_tokens.descriptive_text
+    symbolic_tokens = class_tokens.symbolic_tokens
+    display_tokens = class_tokens.display_tokens
+    descriptive_tokens = class_tokens.descriptive_tokens
 
     # Combine all tokens for full-text search
-    all_tokens = symbolic_tokens + display_tokens + descriptive_tokens
+    all_tokens = class_tokens.all_tokens
 
     # Process each keyword
     for keyword in keywords:
@@ -129,7 +136,7 @@ def scoring(class_data: CacheClassDescriptionData, keywords: List[str]) -> float
         for k_token in keyword_tokens:
             # Check symbolic name tokens (highest priority)
             for token in symbolic_tokens:
-                similarity = word_similarity(k_token, token)
+                similarity = fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > HIGH_SIMILARITY_THRESHOLD:
                     match_score += HIGH_SIMILARITY_MULTIPLIER * similarity
                 elif similarity > MEDIUM_SIMILARITY_THRESHOLD:
@@ -137,7 +144,7 @@ def scoring(class_data: CacheClassDescriptionData, keywords: List[str]) -> float
 
             # Check display name tokens (medium priority)
             for token in display_tokens:
-                similarity = word_similarity(k_token, token)
+                similarity = fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > HIGH_SIMILARITY_THRESHOLD:
                     match_score += DISPLAY_HIGH_SIMILARITY_MULTIPLIER * similarity
                 elif similarity > MEDIUM_SIMILARITY_THRESHOLD:
@@ -145,7 +152,7 @@ def scoring(class_data: CacheClassDescriptionData, keywords: List[str]) -> float
 
             # Check descriptive text (lowest priority)
             for token in descriptive_tokens:
-                similarity = word_similarity(k_token, token)
+                similarity = fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > DESCRIPTION_HIGH_SIMILARITY_THRESHOLD:
                     match_score += DESCRIPTION_SIMILARITY_MULTIPLIER * similarity
 
@@ -158,7 +165,7 @@ def scoring(class_data: CacheClassDescriptionData, keywords: List[str]) -> float
     for keyword in keywords:
         keyword = keyword.lower()
         for token in all_tokens:
-            if word_similarity(keyword, token) > HIGH_SIMILARITY_THRESHOLD:
+            if fuzzy_word_similarity(keyword, token, fuzzy) > HIGH_SIMILARITY_THRESHOLD:
                 matched_keywords.add(keyword)
                 break
 
@@ -277,8 +284,32 @@ def improved_word_similarity(word1, word2):
     return 0.0
 
 
+def improved_fuzzy_word_similarity(
+    word, token, fuzzy: Optional[FuzzyTokenIndex] = None
+):
+    """
+    Calculate similarity between a word and a token with improved_word_similarity,
+    also matching a token the word may be a misspelling of if a fuzzy index is given.
+
+    Args:
+        word: The word to compare, usually from a keyword
+        token: The token to compare, from the class
+        fuzzy: Optional index of the class tokens
+
+    Returns:
+        Float between 0.0 and 1.0 representing similarity
+    """
+    similarity = improved_word_similarity(word, token)
+    if fuzzy is not None and similarity < 1.0:
+        similarity = max(similarity, fuzzy.similarity(word.lower(), token.lower()))
+    return similarity
+
+
 def optimized_scoring(
-    class_data: CacheClassDescriptionData, keywords: List[str]
+    class_data: CacheClassDescriptionData,
+    keywords: List[str],
+    fuzzy: Optional[FuzzyTokenIndex] = None,
+    property_scores: Optional[Dict[str, float]] = None,
 ) -> float:
     """
     An optimized version of the scoring function that balances accuracy and performance.
@@ -301,6 +332,9 @@ def optimized_scoring(
          Example: "title" matches "DocumentTitle" property
        - Property display name matches (score +1.5):
          Example: "author" matches "Author" display name
+       - System properties are not matched, since every class has them
+       - Scores from PropertyIndex.scores are used if given, instead of looping
+         over the property descriptions of the class
 
     4. Multi-keyword Handling: Gives bonuses for matching multiple keywords
        - Calculates percentage of keywords matched
@@ -317,9 +351,14 @@ def optimized_scoring(
     - Substring containment: 0.9 * (length_ratio) similarity
     - Prefix matching: 0.7 * (prefix_length / max_length) similarity
     - Non-matching words: 0.0 similarity
+    - With a fuzzy index, words a few typos apart: 0.8 * (1 - typos / max_length)
+      similarity
 
     :param class_data: The class data to score
     :param keywords: The keywords to match against
+    :param fuzzy: Optional index of the class tokens, to match keywords with typos
+    :param property_scores: Optional scores of the property matches by class name, from
+        the property index of the root class
     :return: A score indicating how well the class matches the keywords
     """
     # Early return for empty keywords
@@ -329,25 +368,23 @@ def optimized_scoring(
     match_score = 0.0
 
     # STEP 1: PREPARE TEXT FOR MATCHING
-    # Convert all text to lowercase for case-insensitive matching
-    symbolic_name = class_data.symbolic_name.lower()
-    display_name = class_data.display_name.lower()
-    descriptive_text = (
-        class_data.descriptive_text.lower() if class_data.descriptive_text else ""
-    )
-
-    # Tokenize class names and description using cached function for performance
-    # This breaks CamelCase and snake_case into individual words
-    symbolic_tokens = cached_tokenize(
-        symbolic_name
-    )  # e.g., "DocumentTitle" -> ["document", "title"]
-    display_tokens = cached_tokenize(
-        display_name
-    )  # e.g., "Document Title" -> ["document", "title"]
-    descriptive_tokens = cached_tokenize(descriptive_text)
+    # Lowercased class names and description and their tokens, computed once when
+    # the class entered the metadata cache. Tokenizing breaks CamelCase and
+    # snake_case into individual words
+    class_tokens = class_data.tokens
+    symbolic_name = class_tokens.symbolic_name
+    display_name = class_tokens.display_name
+    descriptive_text = class_tokens.descriptive_text
+    symbolic_tokens = (
+        class_tokens.symbolic_tokens
+    )  # "DocumentTitle" -> ("document", "title")
+    display_tokens = (
+        class_tokens.display_tokens
+    )  # "Document Title" -> ("document", "title")
+    descriptive_tokens = class_tokens.descriptive_tokens
 
     # Combine all tokens for full-text search later
-    all_tokens = symbolic_tokens + display_tokens + descriptive_tokens
+    all_tokens = class_tokens.all_tokens
 
     # STEP 2: PROCESS EACH KEYWORD FOR MATCHES
     for keyword in keywords:
@@ -378,7 +415,7 @@ def optimized_scoring(
             # Check symbolic name tokens (highest priority)
             for token in symbolic_tokens:
                 # Calculate similarity between tokens (0.0-1.0)
-                similarity = improved_word_similarity(k_token, token)
+                similarity = improved_fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > HIGH_SIMILARITY_THRESHOLD:
                     match_score += HIGH_SIMILARITY_MULTIPLIER * similarity
                 elif similarity > MEDIUM_SIMILARITY_THRESHOLD:
@@ -386,7 +423,7 @@ def optimized_scoring(
 
             # Check display name tokens (medium priority)
             for token in display_tokens:
-                similarity = improved_word_similarity(k_token, token)
+                similarity = improved_fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > HIGH_SIMILARITY_THRESHOLD:
                     match_score += DISPLAY_HIGH_SIMILARITY_MULTIPLIER * similarity
                 elif similarity > MEDIUM_SIMILARITY_THRESHOLD:
@@ -395,7 +432,7 @@ def optimized_scoring(
             # Check descriptive text (lowest priority)
             # Higher threshold for description to reduce false positives
             for token in descriptive_tokens:
-                similarity = improved_word_similarity(k_token, token)
+                similarity = improved_fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > DESCRIPTION_HIGH_SIMILARITY_THRESHOLD:
                     match_score += DESCRIPTION_SIMILARITY_MULTIPLIER * similarity
 
@@ -405,10 +442,15 @@ def optimized_scoring(
 
     # STEP 3: PROPERTY-BASED MATCHING
     # Consider class properties in scoring calculation
-    if hasattr(class_data, "properties") and class_data.property_descriptions:
+    if property_scores is not None:
+        match_score += property_scores.get(class_data.symbolic_name, 0.0)
+    elif class_data.property_descriptions:
         for keyword in keywords:
             keyword = keyword.lower()
             for prop in class_data.property_descriptions:
+                # System properties are shared by every class
+                if prop.is_system_owned:
+                    continue
                 # Check if keyword matches property symbolic name
                 if keyword in prop.symbolic_name.lower():
                     match_score += PROPERTY_SYMBOLIC_NAME_SCORE
@@ -423,7 +465,10 @@ def optimized_scoring(
         keyword = keyword.lower()
         # Check if any token in the class has high similarity with this keyword
         for token in all_tokens:
-            if improved_word_similarity(keyword, token) > HIGH_SIMILARITY_THRESHOLD:
+            if (
+                improved_fuzzy_word_similarity(keyword, token, fuzzy)
+                > HIGH_SIMILARITY_THRESHOLD
+            ):
                 matched_keywords.add(keyword)
                 break
 
@@ -477,7 +522,7 @@ def register_class_tools(
     @mcp.tool(
         name="list_all_classes",
     )
-    def list_all_classes_tool(
+    async def list_all_classes_tool(
         root_class: str,
     ) -> Union[List[ClassDescriptionData], ToolError]:
         """
@@ -500,8 +545,9 @@ def register_class_tools(
                 ],
             )
 
-        # First, ensure the root class cache is populated
-        root_class_result = get_root_class_description_tool(
+        # First, ensure the root class cache is populated, joining a load already in
+        # progress such as the startup warm-up
+        root_class_result = await get_root_class_description_tool_async(
             graphql_client=graphql_client,
             root_class_type=root_class,
             metadata_cache=metadata_cache,
@@ -511,10 +557,11 @@ def register_class_tools(
         if isinstance(root_class_result, ToolError):
             return root_class_result
 
-        # Get all classes for the specified root class
-        all_classes = metadata_cache.get_class_cache(root_class)
+        # Get all classes for the specified root class, sorted by symbolic name for
+        # consistency. The sorted list is built once per change of the classes
+        result = metadata_cache.get_class_list(root_class)
 
-        if not all_classes:
+        if not result:
             return ToolError(
                 message=f"No classes found for root class '{root_class}'",
                 suggestions=[
@@ -523,26 +570,12 @@ def register_class_tools(
                 ],
             )
 
-        # Convert all classes to ClassDescriptionData objects
-        result = []
-        for class_name, class_data in all_classes.items():
-            # Skip if class_data is not a CacheClassDescriptionData object
-            if not isinstance(class_data, CacheClassDescriptionData):
-                continue
-
-            # Use model_validate to convert CacheClassDescriptionData to ClassDescriptionData
-            class_desc_data = ClassDescriptionData.model_validate(class_data)
-            result.append(class_desc_data)
-
-        # Sort results by symbolic name for consistency
-        result.sort(key=lambda x: x.symbolic_name)
-
         return result
 
     @mcp.tool(
         name="determine_class",
     )
-    def determine_class(
+    async def determine_class(
         root_class: str, keywords: List[str]
     ) -> Union[List[ClassMatch], ToolError]:
         """
@@ -567,8 +600,9 @@ def register_class_tools(
                 ],
             )
 
-        # First, ensure the root class cache is populated
-        root_class_result = get_root_class_description_tool(
+        # First, ensure the root class cache is populated, joining a load already in
+        # progress such as the startup warm-up
+        root_class_result = await get_root_class_description_tool_async(
             graphql_client=graphql_client,
             root_class_type=root_class,
             metadata_cache=metadata_cache,
@@ -590,39 +624,46 @@ def register_class_tools(
                 ],
             )
 
-        # Look for matches in class names and descriptions
-        matches = []
-
-        for class_name, class_data in all_classes.items():
-            # Skip if class_data is not a ContentClassData object
-            if not isinstance(class_data, CacheClassDescriptionData):
-                continue
-
-            # Use the scoring method
-            match_score = scoring(class_data, keywords)
-
-            # If we have any matches, add to our list
-            if match_score > 0:
-                # Store class name, display name, description, and score
-                matches.append(
-                    (
-                        class_name,
-                        class_data.display_name,
-                        class_data.descriptive_text,
-                        match_score,
-                    )
-                )
-
-        # Sort matches by score (highest first)
-        matches.sort(key=lambda x: x[3], reverse=True)
-
-        # If we found matches, return up to MAX_CLASS_MATCHES top matches
+        # Look for matches in class names and descriptions, scoring only the classes
+        # the keyword index finds (or all classes for keywords too short to look up)
+        class_index = metadata_cache.get_class_index(root_class)
+        candidates = class_index.candidates(keywords, fuzzy=True)
+
+        # Matches in the property names of the classes whose properties are loaded,
+        # found through the property index; those classes are candidates too
+        property_scores = metadata_cache.get_property_index(root_class).scores(keywords)
+        if candidates is None:
+            class_names = all_classes.keys()
+        elif property_scores:
+            class_names = class_index.in_catalog_order({*candidates, *property_scores})
+        else:
+            class_names = candidates
+
+        def scored_classes():
+            for class_name in class_names:
+                class_data = all_classes.get(class_name)
+                # Skip if class_data is not a ContentClassData object
+                if not isinstance(class_data, CacheClassDescriptionData):
+                    continue
+
+                # Use the scoring method, tolerating typos in the keywords
+                match_score = scoring(
+                    class_data, keywords, class_index.fuzzy
+                ) + property_scores.get(class_name, 0.0)
+                if match_score > 0:
+                    yield class_name, match_score
+
+        # Keep the MAX_CLASS_MATCHES best matches in a bounded heap instead of sorting
+        # all of them; like a stable sort, earlier classes win ties
+        matches = heapq.nlargest(
+            MAX_CLASS_MATCHES, scored_classes(), key=operator.itemgetter(1)
+        )
+
+        # If we found matches, return the top matches
         if matches:
-            # Convert all available matches to ClassMatch objects
+            # Convert only the top matches to ClassMatch objects
             result = []
-            for class_name, display_name, descriptive_text, score in matches[
-                :MAX_CLASS_MATCHES
-            ]:
+            for class_name, score in matches:
                 # Get the class description data from the cache
                 cache_class_data = all_classes[class_name]
 
@@ -648,7 +689,7 @@ def register_class_tools(
     @mcp.tool(
         name="get_class_property_descriptions",
     )
-    def get_class_property_descriptions(
+    async def get_class_property_descriptions(
         class_symbolic_name: str,
     ) -> Union[List[CachePropertyDescription], ToolError]:
         """
@@ -658,7 +699,7 @@ def register_class_tools(
 
         :returns: A list of CachePropertyDescription objects for each property
         """
-        class_metadata = get_class_metadata_tool(
+        class_metadata = await get_class_metadata_tool_async(
             graphql_client=graphql_client,
             class_symbolic_name=class_symbolic_name,
             metadata_cache=metadata_cache,
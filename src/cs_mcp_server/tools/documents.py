@@ -20,7 +20,7 @@ from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
 from cs_mcp_server.cache.metadata import MetadataCache
-from cs_mcp_server.cache.metadata_loader import get_class_metadata_tool
+from cs_mcp_server.cache.metadata_loader import get_class_metadata_tool_async
 from cs_mcp_server.client.graphql_client import GraphQLClient
 from cs_mcp_server.utils import (
     Cardinality,
@@ -293,9 +293,9 @@ def register_document_tools(
 
             # Execute the GraphQL mutation
             if file_paths_dict:
-                # Use execute with file_paths for file upload
+                # Use execute_async with file_paths to stream the file upload
                 logger.info("Executing document creation with file upload")
-                response = graphql_client.execute(
+                response = await graphql_client.execute_async(
                     query=mutation, variables=variables, file_paths=file_paths_dict
                 )
             else:
@@ -368,8 +368,8 @@ def register_document_tools(
 
         classname = response["data"]["document"]["className"]
 
-        # Use get_class_metadata_tool to get the class properties
-        class_metadata = get_class_metadata_tool(
+        # Use get_class_metadata_tool_async to get the class properties
+        class_metadata = await get_class_metadata_tool_async(
             graphql_client=graphql_client,
             class_symbolic_name=classname,
             metadata_cache=metadata_cache,
@@ -681,9 +681,9 @@ def register_document_tools(
 
             # Execute the GraphQL mutation
             if file_paths_dict:
-                # Use execute with file_paths for file upload
+                # Use execute_async with file_paths to stream the file upload
                 logger.info("Executing document check-in with file upload")
-                response = graphql_client.execute(
+                response = await graphql_client.execute_async(
                     query=mutation,
                     variables=variables,
                     file_paths=file_paths_dict,
@@ -20,7 +20,7 @@ from typing import Any, List, Union, Optional
 from mcp.server.fastmcp import FastMCP
 from cs_mcp_server.cache.metadata import MetadataCache
 from cs_mcp_server.cache.metadata_loader import (
-    get_class_metadata_tool,
+    get_class_metadata_tool_async,
 )
 from cs_mcp_server.utils.common import (
     SearchParameters,
@@ -29,7 +29,9 @@ from cs_mcp_server.utils.common import (
 )
 from cs_mcp_server.client.graphql_client import GraphQLClient
 from cs_mcp_server.utils.model.core import DocumentMatch, DocumentFilingMatch
-from cs_mcp_server.utils.scoring import tokenize, word_similarity
+from cs_mcp_server.utils.batch_scoring import score_names, top_k
+from cs_mcp_server.utils.fuzzy import FuzzyTokenIndex
+from cs_mcp_server.utils.scoring import fuzzy_word_similarity, tokenize
 from cs_mcp_server.utils.constants import (
     DEFAULT_DOCUMENT_CLASS,
     EXACT_SYMBOLIC_NAME_MATCH_SCORE,
@@ -90,9 +92,16 @@ def format_value_by_type(value, data_type):
     return f"'{value}'"
 
 
-def score_name(name: str, keywords: list[str]) -> float:
+def score_name(
+    name: str, keywords: list[str], fuzzy: Optional[FuzzyTokenIndex] = None
+) -> float:
     """
     Common advanced scoring method that uses tokenization and fuzzy matching to find the best name based on keywords.
+
+    :param name: The lowercase name to score
+    :param keywords: The keywords to match against
+    :param fuzzy: Optional index of the name tokens, to match keywords with typos
+    :return: A score indicating how well the name matches the keywords
     """
     match_score = 0
     # Tokenize names
@@ -119,7 +128,7 @@ def score_name(name: str, keywords: list[str]) -> float:
         for k_token in keyword_tokens:
             # Check name tokens (highest priority)
             for token in name_tokens:
-                similarity = word_similarity(k_token, token)
+                similarity = fuzzy_word_similarity(k_token, token, fuzzy)
                 if similarity > HIGH_SIMILARITY_THRESHOLD:
                     match_score += HIGH_SIMILARITY_MULTIPLIER * similarity
                 elif similarity > MEDIUM_SIMILARITY_THRESHOLD:
@@ -130,7 +139,7 @@ def score_name(name: str, keywords: list[str]) -> float:
     for keyword in keywords:
         keyword = keyword.lower()
         for token in all_tokens:
-            if word_similarity(keyword, token) > HIGH_SIMILARITY_THRESHOLD:
+            if fuzzy_word_similarity(keyword, token, fuzzy) > HIGH_SIMILARITY_THRESHOLD:
                 matched_keywords.add(keyword)
                 break
 
@@ -142,24 +151,29 @@ def score_name(name: str, keywords: list[str]) -> float:
     return match_score
 
 
-def score_folder(fold: dict, keywords: list[str]) -> float:
+def score_folder(
+    fold: dict, keywords: list[str], fuzzy: Optional[FuzzyTokenIndex] = None
+) -> float:
     """
     Advanced scoring method that uses tokenization and fuzzy matching to find the best document match.
 
     :param fold: The folder to score. A dictionary returned from the graphql search.
     :param keywords: The keywords to match against
+    :param fuzzy: Optional index of the name tokens, to match keywords with typos
     :return: A score indicating how well the folder matches the keywords
     """
 
     # Convert all text to lowercase for case-insensitive matching
     name = fold["name"].lower()
 
-    match_score: float = score_name(name, keywords)
+    match_score: float = score_name(name, keywords, fuzzy)
 
     return match_score
 
 
-def score_document(doc: dict, keywords: List[str]) -> float:
+def score_document(
+    doc: dict, keywords: List[str], fuzzy: Optional[FuzzyTokenIndex] = None
+) -> float:
     """
     Advanced scoring method that uses tokenization and fuzzy matching to find the best document match.
 
@@ -170,12 +184,13 @@ def score_document(doc: dict, keywords: List[str]) -> float:
 
     :param doc: The document to score. A dictionary returned from the graphql search.
     :param keywords: The keywords to match against
+    :param fuzzy: Optional index of the name tokens, to match keywords with typos
     :return: A score indicating how well the document matches the keywords
     """
     # Convert all text to lowercase for case-insensitive matching
     name = doc["name"].lower()
 
-    match_score: float = score_name(name, keywords)
+    match_score: float = score_name(name, keywords, fuzzy)
 
     return match_score
 
@@ -188,7 +203,7 @@ def register_search_tools(
     @mcp.tool(
         name="get_searchable_property_descriptions",
     )
-    def get_searchable_property_descriptions(
+    async def get_searchable_property_descriptions(
         class_symbolic_name: str,
     ) -> Union[List[CachePropertyDescription], ToolError]:
         """
@@ -198,7 +213,7 @@ def register_search_tools(
 
         :returns: A list of CachePropertyDescription objects for properties that are searchable
         """
-        class_metadata = get_class_metadata_tool(
+        class_metadata = await get_class_metadata_tool_async(
             graphql_client=graphql_client,
             class_symbolic_name=class_symbolic_name,
             metadata_cache=metadata_cache,
@@ -240,7 +255,7 @@ def register_search_tools(
                     - value (str): The value of the property.
         """
         # First, get the class metadata from the cache
-        class_data = get_class_metadata_tool(
+        class_data = await get_class_metadata_tool_async(
             graphql_client, search_parameters.search_class, metadata_cache
         )
 
@@ -286,7 +301,7 @@ def register_search_tools(
                 return {"ERROR": "search_properties missing 'operator' key"}
 
             if not all([prop_name, prop_value, operator]):
-                print(f"Skipping invalid filter item: {item}")
+                logger.warning("Skipping invalid filter item: %s", item)
                 continue
 
             # Get the data type of the property
@@ -381,7 +396,7 @@ def register_search_tools(
         if not class_symbolic_name:
             class_symbolic_name = DEFAULT_DOCUMENT_CLASS
 
-        class_data = get_class_metadata_tool(
+        class_data = await get_class_metadata_tool_async(
             graphql_client,
             class_symbolic_name=class_symbolic_name,
             metadata_cache=metadata_cache,
@@ -460,26 +475,29 @@ def register_search_tools(
             )
         logger.debug(f"Search for documents returned {len(docs)} documents")
 
-        matches: list[Any] = []
-
-        for doc in docs:
-            match_score: float = score_document(doc, keywords)
-            logger.debug(
-                msg=f"document {doc['name']} matched with score of {match_score}"
-            )
-
-            if match_score > 0:
-                matches.append((doc, match_score))
-
-        # Sort matches by score (highest first)
-        matches.sort(key=lambda x: x[1], reverse=True)
+        # Score all returned documents at once, as score_document scores each of them
+        names = [doc["name"].lower() for doc in docs]
+        # Index the words of the returned names so keywords with typos still match.
+        # The index is used for this result set only, so it scans the words rather
+        # than building a tree
+        fuzzy = FuzzyTokenIndex(
+            (token for name in names for token in tokenize(name)), tree=False
+        )
+        scores = score_names(names, keywords, fuzzy)
+        if logger.isEnabledFor(logging.DEBUG):
+            for doc, match_score in zip(docs, scores):
+                logger.debug(
+                    msg=f"document {doc['name']} matched with score of {match_score}"
+                )
 
-        # if we found matches, return up to the maximum matches
+        # Best matches first, up to the maximum matches
         max_results = MAX_SEARCH_RESULTS
+        matches = [(docs[i], scores[i]) for i in top_k(scores, max_results)]
+
         if matches:
             doc_matches: list[DocumentMatch] = []
-            # Convert all available matches (up to max) to DocumentMatch objects
-            for doc, score in matches[:max_results]:
+            # Convert the best matches to DocumentMatch objects
+            for doc, score in matches:
                 doc_name = doc["name"]
                 logger.debug(
                     f"Document {doc_name} selected with matched score of {score}"
@@ -539,7 +557,7 @@ def register_search_tools(
         if not class_symbolic_name:
             class_symbolic_name = DEFAULT_DOCUMENT_CLASS
 
-        class_data = get_class_metadata_tool(
+        class_data = await get_class_metadata_tool_async(
             graphql_client,
             class_symbolic_name=class_symbolic_name,
             metadata_cache=metadata_cache,
@@ -620,7 +638,13 @@ def register_search_tools(
             )
 
             intermediate_matches: list[Any] = []
-            for interfold in intermediate_folds:
+            intermediate_scores = score_names(
+                [interfold["name"].lower() for interfold in intermediate_folds],
+                intermediate_keywords,
+            )
+            for interfold, interf_match_score in zip(
+                intermediate_folds, intermediate_scores
+            ):
                 interfold_path = interfold["pathName"]
 
                 # Skip if we have already come across this at a previous level.
@@ -630,9 +654,6 @@ def register_search_tools(
                     )
                     continue
 
-                interf_match_score: float = score_folder(
-                    interfold, intermediate_keywords
-                )
                 logger.debug(
                     f"Intermediate folder {interfold_path} match score is {interf_match_score}"
                 )
@@ -744,10 +765,10 @@ def register_search_tools(
         logger.debug(f"Search for document filings returned {len(filings)} filings")
 
         filing_matches: list[Any] = []
-        for filing in filings:
-            match_score: float = score_name(
-                filing["containmentName"].lower(), filings_keywords
-            )
+        filing_scores = score_names(
+            [filing["containmentName"].lower() for filing in filings], filings_keywords
+        )
+        for filing, match_score in zip(filings, filing_scores):
             logger.debug(f"Filing {filing['containmentName']} has score {match_score}")
             if match_score <= 0:
                 continue
@@ -776,15 +797,17 @@ def register_search_tools(
             )
             filing_matches.append((filing, filing_path, match_score))
 
-        # Sort matches by score (highest first)
-        filing_matches.sort(key=lambda x: x[2], reverse=True)
-
-        # if we found matches, return up to the maximum matches
+        # Best matches first, up to the maximum matches
         max_results = MAX_SEARCH_RESULTS
+        filing_matches = [
+            filing_matches[i]
+            for i in top_k([score for _, _, score in filing_matches], max_results)
+        ]
+
         if filing_matches:
             doc_filing_matches: list[DocumentFilingMatch] = []
-            # Convert all available matches (up to max) to DocumentFilingMatch objects
-            for doc_filing, filing_path, score in filing_matches[:max_results]:
+            # Convert the best matches to DocumentFilingMatch objects
+            for doc_filing, filing_path, score in filing_matches:
                 logger.debug(
                     msg=f"Document filing {filing_path} selected with matched score of {score}"
                 )
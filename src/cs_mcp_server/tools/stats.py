@@ -0,0 +1,59 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from typing import Any, Dict
+
+from mcp.server.fastmcp import FastMCP
+
+from cs_mcp_server.cache import MetadataCache
+from cs_mcp_server.client.graphql_client import GraphQLClient
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# URI of the server statistics resource
+STATS_RESOURCE_URI = "stats://server"
+
+
+def register_stats_resource(
+    mcp: FastMCP, graphql_client: GraphQLClient, metadata_cache: MetadataCache
+) -> None:
+
+    @mcp.resource(
+        STATS_RESOURCE_URI,
+        name="server_stats",
+        description="Cache, request and connection pool statistics of the server",
+        mime_type="application/json",
+    )
+    def server_stats() -> Dict[str, Any]:
+        """
+        Reports the runtime statistics of the server, to tune cache TTLs and budgets.
+
+        It is a resource rather than a tool, so it doesn't take part in the tool
+        choices of the model and is read by clients and operators on demand.
+
+        :returns: A JSON object with the following structure:
+                - metadata_cache: Size of each root class catalog and its keyword
+                  index, hit and miss counts of class and catalog lookups, load
+                  counters and latency histograms, background refreshes, the property
+                  descriptions kept in memory and the snapshot counters
+                - graphql_client: Request limiter with the request latency histogram,
+                  connection pool, token refresh, batching, deduplication and
+                  response cache counters
+        """
+        return {
+            "metadata_cache": metadata_cache.stats(),
+            "graphql_client": graphql_client.get_stats(),
+        }
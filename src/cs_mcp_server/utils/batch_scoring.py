@@ -0,0 +1,316 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Batch scoring of names against keywords.
+
+score_names gives every name the score the search tools' score_name gives it, but
+scores a whole result set at once: the names are split into tokens once, the
+distinct tokens form a vocabulary, and the similarity of each keyword token to each
+vocabulary token is computed once instead of once per name. top_k then selects the
+best names without sorting all of them.
+
+When NumPy is installed, the similarities are computed over the whole vocabulary
+with array operations and the names are scored as arrays of token ids; top_k uses a
+partial selection. The scores are added in the same order as score_name adds them,
+so both implementations return exactly the same scores, and the same names in the
+same order as a stable sort by descending score.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .constants import (
+    EXACT_SYMBOLIC_NAME_MATCH_SCORE,
+    HIGH_SIMILARITY_MULTIPLIER,
+    HIGH_SIMILARITY_THRESHOLD,
+    KEYWORD_COVERAGE_BONUS,
+    MEDIUM_SIMILARITY_MULTIPLIER,
+    MEDIUM_SIMILARITY_THRESHOLD,
+    PREFIX_SIMILARITY_MULTIPLIER,
+    SUBSTRING_SIMILARITY_MULTIPLIER,
+    SYMBOLIC_NAME_SUBSTRING_SCORE,
+)
+from .fuzzy import FuzzyTokenIndex
+from .scoring import fuzzy_word_similarity, tokenize
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Whether names are scored with NumPy
+VECTORIZED = np is not None
+
+
+def score_names(
+    names: Sequence[str],
+    keywords: Sequence[str],
+    fuzzy: Optional[FuzzyTokenIndex] = None,
+) -> List[float]:
+    """
+    Score names against keywords, as score_name scores each of them.
+
+    Args:
+        names: The lowercase names to score
+        keywords: The keywords to match against
+        fuzzy: Optional index of the name tokens, to match keywords with typos
+
+    Returns:
+        The score of each name, in the order of the names
+    """
+    if not names:
+        return []
+    vocabulary, token_ids = _tokenize_names(names)
+    if VECTORIZED:
+        return _score_names_vectorized(
+            names, keywords, vocabulary, token_ids, fuzzy
+        ).tolist()
+    return _score_names_scalar(names, keywords, vocabulary, token_ids, fuzzy)
+
+
+def top_k(scores: Sequence[float], k: int) -> List[int]:
+    """
+    Select the best positive scores.
+
+    Args:
+        scores: The scores
+        k: The largest number of scores to select
+
+    Returns:
+        The positions of at most k positive scores, highest first, earlier positions
+        first among equal scores
+    """
+    if k <= 0:
+        return []
+    if not VECTORIZED:
+        positive = (position for position, score in enumerate(scores) if score > 0)
+        return heapq.nlargest(k, positive, key=scores.__getitem__)
+
+    scores = np.asarray(scores, dtype=np.float64)
+    positions = np.flatnonzero(scores > 0)
+    if len(positions) > k:
+        values = scores[positions]
+        split = len(values) - k
+        kth_value = values[np.argpartition(values, split)[split]]
+        # Among scores equal to the k-th best, keep the earliest ones
+        above = positions[values > kth_value]
+        tied = positions[values == kth_value][: k - len(above)]
+        positions = np.concatenate((above, tied))
+    order = np.lexsort((positions, -scores[positions]))
+    return positions[order].tolist()
+
+
+def _tokenize_names(names: Sequence[str]) -> Tuple[List[str], List[List[int]]]:
+    """Split names into tokens, returning the distinct tokens and each name's token ids."""
+    token_positions: Dict[str, int] = {}
+    token_ids = [
+        [
+            token_positions.setdefault(token, len(token_positions))
+            for token in tokenize(name)
+        ]
+        for name in names
+    ]
+    return list(token_positions), token_ids
+
+
+def _keyword_tokens(keywords: Sequence[str]) -> List[Tuple[str, List[str]]]:
+    """Lowercase the keywords and split them into tokens."""
+    return [(keyword.lower(), tokenize(keyword.lower())) for keyword in keywords]
+
+
+def _contribution(similarity: float) -> float:
+    """Get the score a token similarity adds to a name."""
+    if similarity > HIGH_SIMILARITY_THRESHOLD:
+        return HIGH_SIMILARITY_MULTIPLIER * similarity
+    if similarity > MEDIUM_SIMILARITY_THRESHOLD:
+        return MEDIUM_SIMILARITY_MULTIPLIER * similarity
+    return 0.0
+
+
+def _score_names_scalar(
+    names: Sequence[str],
+    keywords: Sequence[str],
+    vocabulary: List[str],
+    token_ids: List[List[int]],
+    fuzzy: Optional[FuzzyTokenIndex],
+) -> List[float]:
+    """Score names one by one, with the token similarities computed once."""
+    prepared = [
+        (
+            keyword,
+            [
+                [
+                    _contribution(fuzzy_word_similarity(k_token, token, fuzzy))
+                    for token in vocabulary
+                ]
+                for k_token in keyword_tokens
+            ],
+        )
+        for keyword, keyword_tokens in _keyword_tokens(keywords)
+    ]
+    # Tokens matching each distinct keyword, for the coverage bonus
+    covered = [
+        [
+            fuzzy_word_similarity(keyword, token, fuzzy) > HIGH_SIMILARITY_THRESHOLD
+            for token in vocabulary
+        ]
+        for keyword in dict.fromkeys(keyword for keyword, _ in prepared)
+    ]
+
+    scores = []
+    for name, ids in zip(names, token_ids):
+        score = 0.0
+        for keyword, contributions in prepared:
+            if keyword == name:
+                score += EXACT_SYMBOLIC_NAME_MATCH_SCORE
+                continue
+            if keyword in name:
+                score += SYMBOLIC_NAME_SUBSTRING_SCORE
+            for token_contributions in contributions:
+                for token_id in ids:
+                    score += token_contributions[token_id]
+
+        if len(keywords) > 1:
+            matched = sum(
+                any(matches[token_id] for token_id in ids) for matches in covered
+            )
+            score += KEYWORD_COVERAGE_BONUS * (matched / len(keywords))
+        scores.append(score)
+    return scores
+
+
+def _score_names_vectorized(
+    names: Sequence[str],
+    keywords: Sequence[str],
+    vocabulary: List[str],
+    token_ids: List[List[int]],
+    fuzzy: Optional[FuzzyTokenIndex],
+):
+    """Score names as arrays of token ids, with the token similarities computed once."""
+    tokens = _TokenArray(vocabulary)
+    name_array = np.array(names, dtype=np.str_)
+
+    # Token ids of each name, padded with an id whose contribution is 0.0: adding
+    # 0.0 leaves a score unchanged, so padded names score as score_name scores them
+    padding = len(vocabulary)
+    width = max(map(len, token_ids))
+    ids = np.full((len(names), width), padding, dtype=np.intp)
+    for row, name_ids in enumerate(token_ids):
+        ids[row, : len(name_ids)] = name_ids
+
+    scores = np.zeros(len(names))
+    for keyword, keyword_tokens in _keyword_tokens(keywords):
+        exact = name_array == keyword
+        keyword_scores = scores + np.where(
+            np.strings.find(name_array, keyword) >= 0,
+            SYMBOLIC_NAME_SUBSTRING_SCORE,
+            0.0,
+        )
+        for k_token in keyword_tokens:
+            similarity = tokens.similarity(k_token, fuzzy)
+            contributions = np.append(
+                np.where(
+                    similarity > HIGH_SIMILARITY_THRESHOLD,
+                    HIGH_SIMILARITY_MULTIPLIER * similarity,
+                    np.where(
+                        similarity > MEDIUM_SIMILARITY_THRESHOLD,
+                        MEDIUM_SIMILARITY_MULTIPLIER * similarity,
+                        0.0,
+                    ),
+                ),
+                0.0,
+            )
+            # One token position at a time, in the order score_name adds them
+            for column in range(width):
+                keyword_scores += contributions[ids[:, column]]
+        scores = np.where(
+            exact, scores + EXACT_SYMBOLIC_NAME_MATCH_SCORE, keyword_scores
+        )
+
+    if len(keywords) > 1:
+        matched = np.zeros(len(names), dtype=np.int64)
+        for keyword in dict.fromkeys(keyword.lower() for keyword in keywords):
+            matches = np.append(
+                tokens.similarity(keyword, fuzzy) > HIGH_SIMILARITY_THRESHOLD, False
+            )
+            matched += matches[ids].any(axis=1)
+        scores = scores + KEYWORD_COVERAGE_BONUS * (matched / len(keywords))
+    return scores
+
+
+class _TokenArray:
+    """The vocabulary of a batch as arrays, to compare a word with every token at once."""
+
+    def __init__(self, vocabulary: List[str]):
+        """
+        Build the arrays.
+
+        Args:
+            vocabulary: The distinct tokens
+        """
+        self.vocabulary = vocabulary
+        self.positions = {token: position for position, token in enumerate(vocabulary)}
+        self.tokens = np.array(vocabulary, dtype=np.str_)
+        self.lengths = np.strings.str_len(self.tokens)
+        # Code points of each token, padded with zeros
+        width = max(self.tokens.dtype.itemsize // 4, 1)
+        self.codes = (
+            self.tokens.view(np.uint32).reshape(len(vocabulary), width)
+            if vocabulary
+            else np.zeros((0, width), dtype=np.uint32)
+        )
+
+    def similarity(self, word: str, fuzzy: Optional[FuzzyTokenIndex]):
+        """Compute fuzzy_word_similarity of a word with every token."""
+        length = len(word)
+        word_codes = np.array([ord(char) for char in word], dtype=np.uint32)
+
+        # Length of the common prefix, within the length of each token
+        width = min(length, self.codes.shape[1])
+        equal = (self.codes[:, :width] == word_codes[:width]) & (
+            np.arange(width) < self.lengths[:, None]
+        )
+        prefix = np.logical_and.accumulate(equal, axis=1).sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = np.where(
+                self.tokens == word,
+                1.0,
+                np.where(
+                    np.strings.find(self.tokens, word) >= 0,
+                    SUBSTRING_SIMILARITY_MULTIPLIER * (length / self.lengths),
+                    np.where(
+                        np.strings.find(np.str_(word), self.tokens) >= 0,
+                        SUBSTRING_SIMILARITY_MULTIPLIER * (self.lengths / length),
+                        np.where(
+                            prefix > 0,
+                            PREFIX_SIMILARITY_MULTIPLIER
+                            * (prefix / np.maximum(self.lengths, length)),
+                            0.0,
+                        ),
+                    ),
+                ),
+            )
+
+        if fuzzy is not None:
+            typo_similarity = np.zeros(len(self.vocabulary))
+            for token, token_similarity in fuzzy.similar_tokens(word).items():
+                position = self.positions.get(token)
+                if position is not None:
+                    typo_similarity[position] = token_similarity
+            similarity = np.where(
+                similarity < 1.0, np.maximum(similarity, typo_similarity), similarity
+            )
+        return similarity
@@ -15,11 +15,12 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Any, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .model.propertyBase import Cardinality, TypeID
+from .scoring import ClassTokens
 
 
 class ToolError(BaseModel):
@@ -146,6 +147,20 @@ class CacheClassDescriptionData(ClassDescriptionData):
         description="List of all properties of this class"
     )
 
+    # Tokens of the names and description, computed once when the class is loaded
+    # and kept by copies of it
+    _tokens: ClassTokens = PrivateAttr()
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._tokens = ClassTokens.of(
+            self.symbolic_name, self.display_name, self.descriptive_text
+        )
+
+    @property
+    def tokens(self) -> ClassTokens:
+        """The lowercased names and description of the class and their tokens."""
+        return self._tokens
+
 
 class CachePropertyDescriptionBooleanData(CachePropertyDescription):
     property_default_boolean: Optional[bool] = None
@@ -150,6 +150,9 @@ SUBSTRING_SIMILARITY_MULTIPLIER = 0.9
 PREFIX_SIMILARITY_MULTIPLIER = 0.7
 """Multiplier for prefix matching similarity."""
 
+TYPO_SIMILARITY_MULTIPLIER = 0.8
+"""Multiplier for the similarity of words a few typos apart (used in fuzzy.py)."""
+
 
 # ============================================================================
 # SEARCH AND RESULT LIMITS
@@ -0,0 +1,309 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Typo-tolerant word matching.
+
+Words are compared with the optimal string alignment (OSA) distance: the number of
+single character insertions, deletions, substitutions and transpositions of two
+adjacent characters turning one word into the other, so "invioce" is one edit away
+from "invoice". The number of edits tolerated grows with the length of the word
+looked up: none below MIN_TYPO_WORD_LENGTH characters, one below
+LONG_WORD_LENGTH characters, two from there on.
+
+FuzzyTokenIndex finds the tokens of a vocabulary within that distance of a word
+with a BK-tree, comparing the word with a small part of the vocabulary only. The
+OSA distance is not a metric, so the tree is organized by the Levenshtein distance,
+which is at most twice the OSA distance (a transposition is two Levenshtein edits);
+the tokens found within twice the distance are then checked with the OSA distance.
+
+Building the tree costs many distance computations, which only pay off over many
+lookups. An index used for a single result set scans the tokens instead: only tokens
+whose length is within the tolerated distance and that lack at most that many of the
+characters of the word (each missing character takes an edit), and the other way
+around, are compared, and each comparison stops as soon as the distance is known to
+be too large.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .constants import LRU_CACHE_SIZE, TYPO_SIMILARITY_MULTIPLIER
+
+# Words shorter than this must match exactly
+MIN_TYPO_WORD_LENGTH = 4
+
+# Words at least this long may have two typos
+LONG_WORD_LENGTH = 8
+
+
+def max_typo_distance(length: int) -> int:
+    """
+    Get the number of typos tolerated in a word.
+
+    Args:
+        length: The length of the word
+
+    Returns:
+        The largest OSA distance still considered a match
+    """
+    if length < MIN_TYPO_WORD_LENGTH:
+        return 0
+    if length < LONG_WORD_LENGTH:
+        return 1
+    return 2
+
+
+def levenshtein_distance(word1: str, word2: str) -> int:
+    """Count the insertions, deletions and substitutions turning one word into another."""
+    previous = list(range(len(word2) + 1))
+    for i, char1 in enumerate(word1, 1):
+        current = [i]
+        for j, char2 in enumerate(word2, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char1 != char2),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def osa_distance(word1: str, word2: str, limit: Optional[int] = None) -> int:
+    """
+    Count the insertions, deletions, substitutions and adjacent transpositions turning
+    one word into another, editing each substring at most once.
+
+    Args:
+        word1: First word
+        word2: Second word
+        limit: Optional largest distance of interest; a larger distance may be
+            reported as limit + 1 without being computed completely
+
+    Returns:
+        The distance of the words
+    """
+    before_previous: List[int] = []
+    previous = list(range(len(word2) + 1))
+    for i, char1 in enumerate(word1, 1):
+        current = [i]
+        for j, char2 in enumerate(word2, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char1 != char2),
+            )
+            if (
+                i > 1
+                and j > 1
+                and char1 == word2[j - 2]
+                and word1[i - 2] == char2
+                and char1 != char2
+            ):
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        # Every later distance builds on one of the last two rows
+        if limit is not None and min(current) > limit and min(previous) > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+def typo_similarity(word1: str, word2: str, distance: int) -> float:
+    """
+    Calculate the similarity (0-1) of two words a number of typos apart.
+
+    Args:
+        word1: First word
+        word2: Second word
+        distance: The OSA distance of the words
+
+    Returns:
+        The similarity, lower than that of identical words
+    """
+    return TYPO_SIMILARITY_MULTIPLIER * (1 - distance / max(len(word1), len(word2)))
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over words, organized by the Levenshtein distance.
+
+    Every child of a node is at the distance from the node's word given by its key,
+    so a search within a distance only descends into the children whose key differs
+    from the distance of the searched word by at most that distance.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        Build the tree.
+
+        Args:
+            words: The words to add
+        """
+        # A node is a word and its children by distance
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> bool:
+        """
+        Add a word to the tree.
+
+        Args:
+            word: The word to add
+
+        Returns:
+            True if the word was added, False if it already was in the tree
+        """
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return True
+        node = self._root
+        while True:
+            distance = levenshtein_distance(word, node[0])
+            if distance == 0:
+                return False
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self._size += 1
+                return True
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Find the words within a Levenshtein distance of a word.
+
+        Args:
+            word: The word to look up
+            max_distance: The largest distance of the words returned
+
+        Returns:
+            (word, distance) tuples of the words found
+        """
+        if self._root is None:
+            return []
+        found = []
+        nodes = [self._root]
+        while nodes:
+            node_word, children = nodes.pop()
+            distance = levenshtein_distance(word, node_word)
+            if distance <= max_distance:
+                found.append((node_word, distance))
+            for child_distance, child in children.items():
+                if abs(child_distance - distance) <= max_distance:
+                    nodes.append(child)
+        return found
+
+
+class FuzzyTokenIndex:
+    """
+    Finds the tokens of a vocabulary a word may be a misspelling of.
+
+    Lookups are cached, so scoring many candidates against the same keywords looks
+    each keyword up once.
+    """
+
+    def __init__(self, tokens: Iterable[str], tree: bool = True):
+        """
+        Build the index.
+
+        Args:
+            tokens: The vocabulary, lowercase
+            tree: Whether to look tokens up in a BK-tree, for an index kept for many
+                lookups. Otherwise the tokens of about the same length as the word
+                looked up are scanned, which is cheaper for a single result set.
+        """
+        # Shorter tokens are too far from any word long enough to have a typo
+        vocabulary = {
+            token for token in tokens if len(token) >= MIN_TYPO_WORD_LENGTH - 1
+        }
+        self._size = len(vocabulary)
+        self._tree: Optional[BKTree] = None
+        # Tokens with their characters by length, scanned when there is no tree
+        self._tokens_by_length: Dict[int, List[Tuple[str, FrozenSet[str]]]] = {}
+        if tree:
+            self._tree = BKTree(vocabulary)
+        else:
+            for token in vocabulary:
+                self._tokens_by_length.setdefault(len(token), []).append(
+                    (token, frozenset(token))
+                )
+        self._similar_tokens = lru_cache(maxsize=LRU_CACHE_SIZE)(
+            self._find_similar_tokens
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def similar_tokens(self, word: str) -> Dict[str, float]:
+        """
+        Find the tokens a word may be a misspelling of.
+
+        Args:
+            word: The lowercase word to look up
+
+        Returns:
+            The typo similarity of each token within the tolerated number of typos,
+            excluding the word itself. The dictionary is shared and must not be
+            modified.
+        """
+        return self._similar_tokens(word)
+
+    def similarity(self, word: str, token: str) -> float:
+        """
+        Get the typo similarity of a word and a token of the vocabulary.
+
+        Args:
+            word: The lowercase word looked up
+            token: The token
+
+        Returns:
+            The similarity, 0.0 if the token is not within the tolerated number of typos
+        """
+        return self._similar_tokens(word).get(token, 0.0)
+
+    def _find_similar_tokens(self, word: str) -> Dict[str, float]:
+        """Look up the tokens within the tolerated number of typos of a word."""
+        max_distance = max_typo_distance(len(word))
+        if max_distance == 0:
+            return {}
+        similar = {}
+        for token in self._candidates(word, max_distance):
+            distance = osa_distance(word, token, max_distance)
+            if 0 < distance <= max_distance:
+                similar[token] = typo_similarity(word, token, distance)
+        return similar
+
+    def _candidates(self, word: str, max_distance: int) -> Iterable[str]:
+        """Get the tokens that may be within an OSA distance of a word."""
+        if self._tree is not None:
+            return (token for token, _ in self._tree.search(word, 2 * max_distance))
+        # Each edit changes the length by at most one, and removes or adds at most
+        # one distinct character
+        characters = frozenset(word)
+        return (
+            token
+            for length in range(len(word) - max_distance, len(word) + max_distance + 1)
+            for token, token_characters in self._tokens_by_length.get(length, ())
+            if len(characters - token_characters) <= max_distance
+            and len(token_characters - characters) <= max_distance
+        )
@@ -0,0 +1,148 @@
+# Copyright contributors to the IBM Core Content Services MCP Server project
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runtime metrics reported by the server statistics.
+
+A LatencyHistogram counts durations in fixed buckets, so recording one is cheap and
+the memory it uses doesn't grow with traffic. Percentiles are estimated from the
+buckets: the reported value is the upper bound of the bucket holding the percentile,
+clamped to the largest duration recorded.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Upper bounds in seconds of the latency buckets; longer durations go to a last,
+# unbounded bucket
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Percentiles reported by LatencyHistogram.stats
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """Thread-safe histogram of durations in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Create an empty histogram.
+
+        Args:
+            buckets: Increasing upper bounds in seconds of the buckets
+        """
+        self.buckets = tuple(buckets)
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record a duration.
+
+        Args:
+            seconds: The duration in seconds
+        """
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._count += 1
+            self._sum += seconds
+            if self._min is None or seconds < self._min:
+                self._min = seconds
+            if self._max is None or seconds > self._max:
+                self._max = seconds
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Record the duration of the block, whether it completes or raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start)
+
+    @property
+    def count(self) -> int:
+        """The number of durations recorded."""
+        return self._count
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Estimate a percentile of the recorded durations.
+
+        Args:
+            percent: The percentile, between 0 and 100
+
+        Returns:
+            The estimated duration in seconds, or None if nothing was recorded
+        """
+        with self._lock:
+            return self._percentile_locked(percent)
+
+    def _percentile_locked(self, percent: float) -> Optional[float]:
+        if not self._count:
+            return None
+        rank = max(1, round(percent / 100 * self._count))
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                break
+        if bucket == len(self.buckets):
+            return self._max
+        return min(self.buckets[bucket], self._max)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the histogram.
+
+        Returns:
+            A dictionary with the count, sum, mean, minimum, maximum and estimated
+            percentiles of the durations in seconds, and the count of each bucket
+            keyed by its upper bound
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "count": self._count,
+                "sum": self._sum,
+                "mean": self._sum / self._count if self._count else None,
+                "min": self._min,
+                "max": self._max,
+            }
+            for percent in REPORTED_PERCENTILES:
+                stats[f"p{percent}"] = self._percentile_locked(percent)
+            bounds = [str(bound) for bound in self.buckets] + ["+inf"]
+            stats["buckets"] = dict(zip(bounds, self._counts))
+            return stats
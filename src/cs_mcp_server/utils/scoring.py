@@ -19,10 +19,15 @@ This module provides common scoring functionality used across different parts
 of the application for matching objects (classes, documents, etc.) against keywords.
 """
 
+import sys
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
 from .constants import (
     SUBSTRING_SIMILARITY_MULTIPLIER,
     PREFIX_SIMILARITY_MULTIPLIER,
 )
+from .fuzzy import FuzzyTokenIndex
 
 
 # Helper function for word tokenization
@@ -36,6 +41,71 @@ def tokenize(text):
     return [word.lower() for word in text.split() if word]
 
 
+def interned_tokens(text: str) -> Tuple[str, ...]:
+    """Tokenize text, interning the tokens so equal tokens of many texts share memory."""
+    return tuple(sys.intern(token) for token in tokenize(text))
+
+
+@dataclass(frozen=True)
+class ClassTokens:
+    """
+    The lowercased names and description of a class and their tokens, computed once
+    per class and shared by all scorers.
+
+    Attributes:
+        symbolic_name: The lowercased symbolic name
+        display_name: The lowercased display name
+        descriptive_text: The lowercased descriptive text
+        symbolic_tokens: The tokens of the symbolic name, in order
+        display_tokens: The tokens of the display name, in order
+        descriptive_tokens: The tokens of the descriptive text, in order
+        all_tokens: The tokens of all three, in order
+        token_set: The distinct tokens of all three
+    """
+
+    symbolic_name: str
+    display_name: str
+    descriptive_text: str
+    symbolic_tokens: Tuple[str, ...]
+    display_tokens: Tuple[str, ...]
+    descriptive_tokens: Tuple[str, ...]
+    all_tokens: Tuple[str, ...]
+    token_set: FrozenSet[str]
+
+    @classmethod
+    def of(
+        cls, symbolic_name: str, display_name: str, descriptive_text: Optional[str]
+    ) -> "ClassTokens":
+        """
+        Tokenize the names and description of a class.
+
+        Args:
+            symbolic_name: The symbolic name
+            display_name: The display name
+            descriptive_text: The descriptive text, if any
+
+        Returns:
+            The tokens, with all strings interned
+        """
+        symbolic_name = sys.intern(symbolic_name.lower())
+        display_name = sys.intern(display_name.lower())
+        descriptive_text = sys.intern((descriptive_text or "").lower())
+        symbolic_tokens = interned_tokens(symbolic_name)
+        display_tokens = interned_tokens(display_name)
+        descriptive_tokens = interned_tokens(descriptive_text)
+        all_tokens = symbolic_tokens + display_tokens + descriptive_tokens
+        return cls(
+            symbolic_name=symbolic_name,
+            display_name=display_name,
+            descriptive_text=descriptive_text,
+            symbolic_tokens=symbolic_tokens,
+            display_tokens=display_tokens,
+            descriptive_tokens=descriptive_tokens,
+            all_tokens=all_tokens,
+            token_set=frozenset(all_tokens),
+        )
+
+
 # Helper function for calculating word similarity (simple fuzzy matching)
 def word_similarity(word1, word2):
     """Calculate similarity between two words (0-1)"""
@@ -64,3 +134,16 @@ def word_similarity(word1, word2):
         )
 
     return 0.0
+
+
+def fuzzy_word_similarity(word, token, fuzzy: Optional[FuzzyTokenIndex] = None):
+    """
+    Calculate similarity between a word and a token (0-1), tolerating typos.
+
+    Without a fuzzy index this is word_similarity. With one, a token the word may be a
+    misspelling of is similar too, e.g. "invioce" and "invoice".
+    """
+    similarity = word_similarity(word, token)
+    if fuzzy is not None and similarity < 1.0:
+        similarity = max(similarity, fuzzy.similarity(word, token))
+    return similarity